@@ -0,0 +1,109 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Synthetic graph generators for benchmarking.
+
+Every generator takes a graph type, the approximate number of tasks to
+create, and a random seed, and returns a populated graph along with a list
+of the task names that should be updated to execute the entire graph.
+"""
+
+import random
+
+import graphcat
+
+
+def chain(graph_type, size, seed):
+    """A single chain of tasks, each depending on the previous one."""
+    graph = graph_type()
+    graph.set_task(0, graphcat.constant(0))
+    for index in range(1, size):
+        graph.set_task(index, graphcat.passthrough())
+        graph.add_links(index - 1, index)
+    return graph, [size - 1]
+
+
+def diamond(graph_type, size, seed):
+    """A chain of diamonds, where each diamond splits into two tasks and joins again."""
+    graph = graph_type()
+    graph.set_task(0, graphcat.constant(0))
+    top = 0
+    index = 1
+    while index + 3 <= size:
+        left, right, bottom = index, index + 1, index + 2
+        graph.set_task(left, graphcat.passthrough())
+        graph.set_task(right, graphcat.passthrough())
+        graph.set_task(bottom, graphcat.consume)
+        graph.add_links(top, [left, right])
+        graph.add_links(left, bottom)
+        graph.add_links(right, bottom)
+        top = bottom
+        index += 3
+    return graph, [top]
+
+
+def expressions(graph_type, size, seed):
+    """Constant sources feeding expression tasks, all gathered by a single sink."""
+    graph = graph_type()
+    graph.set_task("sink", graphcat.consume)
+    for index in range(max(1, (size - 1) // 2)):
+        graph.set_task(f"source-{index}", graphcat.constant(index))
+        graph.set_expression(f"expression-{index}", "inputs.getone(None) * 2 + 1")
+        graph.add_links(f"source-{index}", f"expression-{index}")
+        graph.add_links(f"expression-{index}", "sink")
+    return graph, ["sink"]
+
+
+def fan_in(graph_type, size, seed):
+    """Many independent sources gathered by a single sink."""
+    graph = graph_type()
+    graph.set_task("sink", graphcat.consume)
+    for index in range(size - 1):
+        graph.set_task(index, graphcat.constant(index))
+        graph.add_links(index, "sink")
+    return graph, ["sink"]
+
+
+def fan_out(graph_type, size, seed):
+    """A single source shared by many independent sinks."""
+    graph = graph_type()
+    graph.set_task("source", graphcat.constant(0))
+    for index in range(size - 1):
+        graph.set_task(index, graphcat.passthrough())
+        graph.add_links("source", index)
+    return graph, list(range(size - 1))
+
+
+def random_dag(graph_type, size, seed, parents=3):
+    """Random directed acyclic graph, where each task depends on up to `parents` earlier tasks."""
+    generator = random.Random(seed)
+    graph = graph_type()
+    dependents = set()
+    for index in range(size):
+        graph.set_task(index, graphcat.consume)
+        for parent in set(generator.randrange(index) for count in range(min(index, parents))):
+            graph.add_links(parent, index)
+            dependents.add(parent)
+    return graph, [index for index in range(size) if index not in dependents]
+
+
+generators = {
+    "chain": chain,
+    "diamond": diamond,
+    "expressions": expressions,
+    "fan-in": fan_in,
+    "fan-out": fan_out,
+    "random-dag": random_dag,
+}
+"""Maps generator names to generator functions."""
@@ -0,0 +1,80 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measure the overhead of graph instrumentation.
+
+Updates a graph of trivial tasks with no observers (uninstrumented mode), with
+a receiver connected to every signal that does nothing, and with a
+:class:`graphcat.common.PerformanceMonitor`, then reports the time per task
+execution for each graph type::
+
+    $ python benchmarks/instrumentation.py --tasks 1000 --repeat 20
+"""
+
+import argparse
+import time
+
+import graphcat
+
+
+def noop(sender, **kwargs):
+    pass
+
+
+def observe(graph):
+    for signal in [graph.on_changed, graph.on_cycle, graph.on_execute, graph.on_failed, graph.on_finished, graph.on_task_renamed, graph.on_update]:
+        signal.connect(noop)
+
+
+def fan_in(graph_type, tasks):
+    # A single task that consumes many inputs, which avoids deep recursion in dynamic graphs.
+    graph = graph_type()
+    graph.set_task("sink", graphcat.consume)
+    for index in range(tasks - 1):
+        graph.set_task(index, graphcat.constant(index))
+        graph.add_links(index, "sink")
+    return graph
+
+
+def measure(graph_type, mode, tasks, repeat):
+    graph = fan_in(graph_type, tasks)
+    if mode == "receivers":
+        observe(graph)
+    elif mode == "monitor":
+        monitor = graphcat.PerformanceMonitor(graph)
+
+    best = None
+    for iteration in range(repeat):
+        graph.mark_unfinished()
+        start = time.perf_counter()
+        graph.update("sink")
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--tasks", type=int, default=1000, help="Number of tasks in the graph.  Default: %(default)s")
+    parser.add_argument("--repeat", type=int, default=20, help="Number of updates to measure.  Default: %(default)s")
+    arguments = parser.parse_args()
+
+    print(f"{'graph':<16} {'uninstrumented':>16} {'receivers':>16} {'monitor':>16}")
+    for graph_type in [graphcat.StaticGraph, graphcat.DynamicGraph, graphcat.StreamingGraph]:
+        results = [measure(graph_type, mode, arguments.tasks, arguments.repeat) for mode in ["uninstrumented", "receivers", "monitor"]]
+        print(f"{graph_type.__name__:<16} " + " ".join(f"{result * 1e6:>13.2f} us" for result in results))
+
+
+if __name__ == "__main__":
+    main()
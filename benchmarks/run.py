@@ -0,0 +1,157 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark graph construction, invalidation and updates.
+
+Runs every combination of synthetic graph (see graphs.py), graph type and
+size, measuring:
+
+* construct - time to create the graph and its links.
+* update-cold - time to update every sink after construction.
+* update-warm - time to update every sink when the graph is already finished.
+* mark-unfinished - time to mark the entire graph unfinished.
+* output - time to retrieve the output of every sink from a finished graph.
+* extents - streaming graphs only: time per extent to iterate over the
+  output of a three-task array pipeline (requires numpy).
+
+Results are printed as a table and saved as JSON, so they can be compared
+between releases::
+
+    $ python benchmarks/run.py --sizes 10 100 1000 --output results.json
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+
+import graphcat
+import graphcat.optional
+
+import graphs
+
+numpy = graphcat.optional.module("numpy")
+
+graph_types = {
+    "static": graphcat.StaticGraph,
+    "dynamic": graphcat.DynamicGraph,
+    "streaming": graphcat.StreamingGraph,
+}
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def summarize(times, count=1):
+    times = [elapsed / count for elapsed in times]
+    return {"times": times, "best": min(times), "mean": statistics.mean(times), "median": statistics.median(times)}
+
+
+def benchmark_graph(generator, graph_type, size, repeat, seed):
+    results = {"construct": [], "update-cold": [], "update-warm": [], "mark-unfinished": [], "output": []}
+    for iteration in range(repeat):
+        elapsed, (graph, sinks) = timed(lambda: generator(graph_type, size, seed))
+        results["construct"].append(elapsed)
+        results["update-cold"].append(timed(lambda: [graph.update(sink) for sink in sinks])[0])
+        results["update-warm"].append(timed(lambda: [graph.update(sink) for sink in sinks])[0])
+        results["output"].append(timed(lambda: [graph.output(sink) for sink in sinks])[0])
+        results["mark-unfinished"].append(timed(graph.mark_unfinished)[0])
+    return {benchmark: summarize(times) for benchmark, times in results.items()}
+
+
+def benchmark_extents(size, tile, repeat):
+    graph = graphcat.StreamingGraph()
+    graph.set_task("array", graphcat.array(numpy.arange(size, dtype="float64")))
+    graph.set_task("scale", graphcat.evaluate("inputs.getone(None, extent) * 2"))
+    graph.set_task("sum", graphcat.evaluate("inputs.getone(None, extent).sum()"))
+    graph.set_links("array", "scale")
+    graph.set_links("scale", "sum")
+
+    extents = list(graphcat.ArrayExtent.tiles(size, tile))
+    times = []
+    for iteration in range(repeat):
+        graph.mark_unfinished()
+        times.append(timed(lambda: [output for extent, output in graph.iter_output("sum", extents)])[0])
+    return {"extents": summarize(times, len(extents))}
+
+
+def run(arguments):
+    results = []
+    for size in arguments.sizes:
+        for generator_name in arguments.graphs:
+            for type_name in arguments.types:
+                record = {"graph": generator_name, "type": type_name, "size": size}
+                try:
+                    benchmarks = benchmark_graph(graphs.generators[generator_name], graph_types[type_name], size, arguments.repeat, arguments.seed)
+                except RecursionError:
+                    results.append(dict(record, skipped="recursion limit exceeded"))
+                    continue
+                for benchmark, summary in benchmarks.items():
+                    results.append(dict(record, benchmark=benchmark, **summary))
+
+        if "streaming" in arguments.types:
+            record = {"graph": "array-pipeline", "type": "streaming", "size": size}
+            if numpy is None:
+                results.append(dict(record, skipped="numpy not available"))
+            else:
+                for benchmark, summary in benchmark_extents(size, arguments.tile, arguments.repeat).items():
+                    results.append(dict(record, benchmark=benchmark, tile=arguments.tile, **summary))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--graphs", nargs="+", choices=sorted(graphs.generators), default=sorted(graphs.generators), help="Synthetic graphs to benchmark.  Default: all")
+    parser.add_argument("--output", default="benchmark-results.json", help="Path for JSON results.  Default: %(default)s")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of times to repeat each benchmark.  Default: %(default)s")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed for random graphs.  Default: %(default)s")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000], help="Graph sizes (number of tasks).  Use up to 1000000 for the largest runs.  Default: %(default)s")
+    parser.add_argument("--tile", type=int, default=1024, help="Extent size for streaming throughput.  Default: %(default)s")
+    parser.add_argument("--types", nargs="+", choices=sorted(graph_types), default=sorted(graph_types), help="Graph types to benchmark.  Default: all")
+    arguments = parser.parse_args()
+
+    # Dynamic and streaming graphs update recursively, so give deep graphs room to run.
+    sys.setrecursionlimit(max(sys.getrecursionlimit(), 100000))
+    threading.stack_size(512 * 1024 * 1024)
+    results = []
+    thread = threading.Thread(target=lambda: results.extend(run(arguments)))
+    thread.start()
+    thread.join()
+
+    for result in results:
+        if "skipped" in result:
+            print(f"{result['graph']:<16} {result['type']:<10} {result['size']:>8} skipped: {result['skipped']}")
+        else:
+            print(f"{result['graph']:<16} {result['type']:<10} {result['size']:>8} {result['benchmark']:<16} {result['best'] * 1e3:>12.3f} ms")
+
+    metadata = {
+        "graphcat": graphcat.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "arguments": vars(arguments),
+    }
+    with open(arguments.output, "w") as stream:
+        json.dump({"metadata": metadata, "results": results}, stream, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -327,6 +327,37 @@ Feature: Dynamic Graphs
         When filtering the graph with graphcat.diagram.parameters then the remaining nodes should match ["A", "B", "D"]
 
 
+    Scenario: Grouped Performance Diagrams
+        Given the pygraphviz module is available
+        And an empty dynamic graph
+        And a performance monitor
+        When adding tasks ["in/a", "in/b", "out"] with functions [graphcat.delay(0.2), pull_and_delay(0.1), pull_and_delay(0.1)]
+        And adding links [("in/a", "in/b"), ("in/b", "out")]
+        And updating tasks ["out"]
+        Then the diagram grouped by graphcat.diagram.prefix() with performance overlay should label "group:in" with 0.3 seconds
+        And the diagram grouped by graphcat.diagram.prefix() with performance overlay should label "out" with 0.1 seconds
+
+
+    Scenario: Grouped Diagrams
+        Given the pygraphviz module is available
+        And an empty dynamic graph
+        When adding tasks ["in/a", "in/b", "proc/x", "proc/y", "out"] with functions [None, None, None, None, None]
+        And adding links [("in/a", "proc/x"), ("in/b", "proc/x"), ("in/b", "proc/y"), ("proc/x", "out"), ("proc/y", "out")]
+        Then the graph can be drawn as a diagram grouped by graphcat.diagram.prefix() with focus None and radius 1
+        And the diagram should contain nodes ["group:in", "group:proc", "out"] and 2 edges
+        And the graph can be drawn as a diagram grouped by None with focus "in/a" and radius 1
+        And the diagram should contain nodes ["in/a", "proc/x"] and 1 edges
+        And the graph can be drawn as a diagram grouped by None with focus "in/a" and radius 2
+        And the diagram should contain nodes ["in/a", "in/b", "out", "proc/x"] and 3 edges
+
+
+    Scenario: Diagram Groups
+        Given an empty dynamic graph
+        When adding tasks ["in/a", "in/b/c", "out", ("x", 1), 3]
+        When grouping the graph with graphcat.diagram.prefix() then the groups should match {"in/a": "in", "in/b/c": "in", "out": None, ("x", 1): ("x",), 3: None}
+        When grouping the graph with graphcat.diagram.prefix(depth=2) then the groups should match {"in/a": None, "in/b/c": "in/b", "out": None, ("x", 1): None, 3: None}
+
+
     Scenario: Notebook Display
         Given the pygraphviz module is available
         And the IPython module is available
@@ -419,6 +450,49 @@ Feature: Dynamic Graphs
         Then the performance monitor output should be {}
 
 
+    Scenario: Performance Monitor History
+        Given an empty dynamic graph
+        And a performance monitor with history 2
+        When adding tasks ["A"] with functions [graphcat.delay(0.1)]
+        And updating tasks ["A"]
+        And tasks ["A"] are marked unfinished
+        And updating tasks ["A"]
+        And tasks ["A"] are marked unfinished
+        And updating tasks ["A"]
+        Then the performance monitor output should be {"A": [0.1, 0.1]}
+        And the performance monitor statistics for task "A" should be 3 executions with maximum 0.1
+
+
+    Scenario: Nested Performance Monitor
+        Given an empty dynamic graph
+        And a performance monitor
+        When adding tasks ["A", "B", "C"] with functions [graphcat.delay(0.2), pull_and_delay(0.1), pull_and_delay(0.1)]
+        And adding links [("A", "B"), ("B", "C")]
+        And updating tasks ["C"]
+        Then the performance monitor output should be {"A": [0.2], "B": [0.3], "C": [0.4]}
+        And the performance monitor exclusive output should be {"A": [0.2], "B": [0.1], "C": [0.1]}
+        When tasks ["C"] are marked unfinished
+        And updating tasks ["C"]
+        Then the performance monitor statistics for task "C" should be 2 executions with maximum 0.4
+
+
+    Scenario: Performance Recordings
+        Given an empty dynamic graph
+        And a performance monitor
+        When adding tasks ["A", ("B", 1), "C"] with functions [graphcat.delay(0.01), pull_and_delay(0.01), pull_and_delay(0.01)]
+        And adding links [("A", (("B", 1), None)), (("B", 1), "C")]
+        And updating tasks ["C"]
+        And tasks ["A"] are marked unfinished
+        And updating tasks ["C"]
+        Then the performance monitor can be saved as "recording.json" and loaded
+        And the performance monitor can be saved as "recording.json.gz" and loaded
+
+
+    Scenario: Performance Comparison
+        Then comparing recordings {"A": [1, 1.1, 0.9, 1, 1.05, 0.95], "B": [1, 1.1, 0.9, 1, 1.05, 0.95], "C": [1]} and {"A": [2, 2.1, 1.9, 2, 2.05, 1.95], "B": [1, 1.1, 0.9, 1, 1.05, 0.95], "D": [1]} should report {"A": "slower", "B": "unchanged", "C": "removed", "D": "added"} with exit status 1
+        And comparing recordings {"A": [2, 2.1, 1.9, 2, 2.05, 1.95], ("B", 1): [1, 1.1]} and {"A": [1, 1.1, 0.9, 1, 1.05, 0.95], ("B", 1): [3, 3.1]} should report {"A": "faster", ("B", 1): "unchanged"} with exit status 0
+
+
     Scenario: Performance Monitor Diagram
         Given the pygraphviz module is available
         And an empty dynamic graph
@@ -430,6 +504,109 @@ Feature: Dynamic Graphs
         And the graph can be drawn as a diagram with performance overlay
 
 
+    Scenario: Critical Path
+        Given an empty dynamic graph
+        When adding tasks ["A", "B", "C", "D", "E"] with functions [graphcat.null, graphcat.null, graphcat.null, graphcat.null, graphcat.null]
+        And adding links [("A", "B"), ("A", "C"), ("B", "D"), ("C", "D"), ("E", "D")]
+        Then the critical path for task "D" with timings {"A": 3, "B": 1, "C": [4, 2], "D": 1, "E": 1} should be ["A", "C", "D"] with length 6 and speedup 8 / 6
+        And the critical path slack should be {"A": 0, "B": 1, "C": 0, "D": 0, "E": 4}
+        And the critical path for task "F" should raise ValueError
+
+
+    Scenario: Critical Path Performance Monitor
+        Given an empty dynamic graph
+        And a performance monitor
+        When adding tasks ["A", "B", "C"] with functions [graphcat.delay(0.2), pull_and_delay(0.1), graphcat.delay(0.1)]
+        And adding links [("A", "B"), ("B", "C")]
+        And updating tasks ["B", "C"]
+        Then the critical path for task "B" with timings context.performance_monitor should be ["A", "B"] with length 0.3 and speedup 1
+
+
+    Scenario: Critical Path Diagram
+        Given the pygraphviz module is available
+        And an empty dynamic graph
+        When adding tasks ["A", "B", "C"] with functions [graphcat.null, graphcat.null, graphcat.null]
+        And adding links [("A", "C"), ("B", "C")]
+        Then the critical path for task "C" with timings {"A": 1, "B": 2, "C": 1} should be ["B", "C"] with length 3 and speedup 4 / 3
+        And the graph can be drawn as a diagram with critical path
+
+
+    Scenario: Critical Path Performance Diagram
+        Given the pygraphviz module is available
+        And an empty dynamic graph
+        And a performance monitor
+        When adding tasks ["A", "B"] with functions [graphcat.delay(0.1), pull_and_delay(0.1)]
+        And adding links [("A", "B")]
+        And updating tasks ["B"]
+        Then the critical path for task "B" with timings context.performance_monitor should be ["A", "B"] with length 0.2 and speedup 1
+        And the diagram with performance overlay and critical path should label "B" with its time and slack
+
+
+    Scenario: Update Plan
+        Given an empty dynamic graph
+        When adding tasks ["A", "B", "C", "D"] with functions [graphcat.constant(1), graphcat.passthrough(None), graphcat.passthrough(None), graphcat.consume]
+        And adding links [("A", "B"), ("B", "C"), ("A", "D"), ("C", "D")]
+        Then the plan for task "D" should execute ["A", "B", "C", "D"] and skip []
+        And the plan for task "D" with timings {"A": 1, "B": 2, "C": 3, "D": 1} should estimate 7 total and 7 critical with [] unestimated
+        When updating tasks ["C"]
+        Then the plan for task "D" should execute ["D"] and skip ["A", "B", "C"]
+        And the plan for task "D" with timings {"A": 1, "B": 2, "C": 3} should estimate 0 total and 0 critical with ["D"] unestimated
+        When tasks ["B"] are marked unfinished
+        Then the plan for task "D" with timings {"A": 1, "B": 2, "C": 3, "D": 1} should estimate 6 total and 6 critical with [] unestimated
+        And the plan for task "D" should execute ["B", "C", "D"] and skip ["A"]
+
+
+    Scenario: Profiler
+        Given an empty dynamic graph
+        And a profiler for tasks ["B"]
+        When adding tasks ["A", "B", "C"] with functions [graphcat.delay(0.01), pull_and_delay(0.01), pull_and_delay(0.01)]
+        And adding links [("A", "B"), ("B", "C")]
+        And updating tasks ["C"]
+        Then the profiler should contain {"B": 1} profiles
+        And the profile for task "B" should include "graph.py:implementation" and exclude "common.py:__call__"
+        When tasks ["A"] are marked unfinished
+        And updating tasks ["C"]
+        Then the profiler should contain {"B": 2} profiles
+
+
+    Scenario: Profiler Predicate
+        Given an empty dynamic graph
+        And a profiler with predicate lambda name: name != "A"
+        When adding tasks ["A", "B", "C"] with functions [graphcat.delay(0.01), pull_and_delay(0.01), pull_and_delay(0.01)]
+        And adding links [("A", "B"), ("B", "C")]
+        And updating tasks ["C"]
+        Then the profiler should contain {"B": 1, "C": 1} profiles
+
+
+    Scenario: Metrics Collector
+        Given an empty dynamic graph
+        And a metrics collector
+        When adding tasks ["A", "B", "C"] with functions [graphcat.constant(1), graphcat.passthrough(None), graphcat.raise_exception(RuntimeError())]
+        And adding links [("A", "B")]
+        And updating tasks ["B"]
+        And updating tasks ["B"]
+        And tasks ["A"] are marked unfinished
+        And updating tasks ["B"]
+        And updating task "C" an exception should be raised
+        Then the metrics collector updates should be {"A": 2, "B": 3, "C": 1}
+        And the metrics collector executions should be {"A": 2, "B": 2, "C": 1}
+        And the metrics collector hits should be {"A": 0, "B": 1, "C": 0}
+        And the metrics collector failures should be {"C": 1}
+        And the metrics collector invalidations should be {"A": 1, "B": 1}
+        And the metrics collector output should contain ['graphcat_task_cache_hits_total{graph="graph",task="B"} 1', 'graphcat_task_execution_seconds_count{graph="graph",task="A"} 2', 'graphcat_invalidation_tasks_sum{graph="graph"} 2']
+
+
+    Scenario: Trace Recorder
+        Given an empty dynamic graph
+        And a trace recorder
+        When adding tasks ["A", "B", "C"] with functions [graphcat.constant(1), graphcat.passthrough(None), graphcat.raise_exception(RuntimeError())]
+        And adding links [("A", "B")]
+        And updating tasks ["B"]
+        And updating task "C" an exception should be raised
+        Then the trace should contain events [("i", "B"), ("B", "B"), ("i", "A"), ("B", "A"), ("E", "A"), ("E", "B"), ("i", "C"), ("B", "C"), ("E", "C")]
+        And the trace can be written as JSON
+
+
     Scenario: Suppress array Updates
         Given the numpy module is available
         And an empty dynamic graph
@@ -500,3 +677,33 @@ Feature: Dynamic Graphs
         And tasks ["C"] detect cycles
         And the outputs should be [None]
 
+
+
+    Scenario: Frozen Outputs
+        Given the numpy module is available
+        And an empty dynamic graph with frozen outputs
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(4)), graphcat.passthrough(), graphcat.constant({"key": [1, 2]})]
+        And adding links [("A", "B")]
+        And computing the task ["A", "B"] outputs
+        Then the numpy outputs should be [[0, 1, 2, 3], [0, 1, 2, 3]]
+        And modifying the outputs should raise an exception
+        When computing the task ["C"] outputs
+        Then the outputs should be [{"key": (1, 2)}]
+        And modifying the outputs should raise an exception
+
+
+    Scenario: Snapshot Expressions
+        Given an empty dynamic graph
+        When adding tasks ["A"] with functions [graphcat.constant(3)]
+        And adding an expression task "B" with expression "graph.output('A') * 2"
+        And computing the task ["B"] outputs
+        Then the outputs should be [6]
+        When saving and restoring the graph an exception should be raised
+        And saving and restoring the graph with functions {"B": graphcat.automatic_dependencies(graphcat.evaluate("graph.output('A') * 2"))}
+        Then the task ["A", "B"] state is finished
+        When computing the task ["B"] outputs
+        Then tasks [] are executed
+        And the outputs should be [6]
+        When the task "A" function is changed to graphcat.constant(4)
+        And computing the task ["B"] outputs
+        Then the outputs should be [8]
@@ -327,6 +327,19 @@ Feature: Static Graphs
         When filtering the graph with graphcat.diagram.parameters then the remaining nodes should match ["A", "B", "D"]
 
 
+    Scenario: Grouped Diagrams
+        Given the pygraphviz module is available
+        And an empty static graph
+        When adding tasks ["in/a", "in/b", "proc/x", "proc/y", "out"] with functions [None, None, None, None, None]
+        And adding links [("in/a", "proc/x"), ("in/b", "proc/x"), ("in/b", "proc/y"), ("proc/x", "out"), ("proc/y", "out")]
+        Then the graph can be drawn as a diagram grouped by graphcat.diagram.prefix() with focus None and radius 1
+        And the diagram should contain nodes ["group:in", "group:proc", "out"] and 2 edges
+        And the graph can be drawn as a diagram grouped by None with focus "in/a" and radius 1
+        And the diagram should contain nodes ["in/a", "proc/x"] and 1 edges
+        And the graph can be drawn as a diagram grouped by None with focus "in/a" and radius 2
+        And the diagram should contain nodes ["in/a", "in/b", "out", "proc/x"] and 3 edges
+
+
     Scenario: Notebook Display
         Given the pygraphviz module is available
         And the IPython module is available
@@ -403,6 +416,20 @@ Feature: Static Graphs
         Then the outputs should be [42, 10, 42]
 
 
+    Scenario: Update Plan
+        Given an empty static graph
+        When adding tasks ["A", "B", "C", "D"] with functions [graphcat.constant(1), graphcat.passthrough(None), graphcat.passthrough(None), graphcat.consume]
+        And adding links [("A", "B"), ("B", "C"), ("A", "D"), ("C", "D")]
+        Then the plan for task "D" should execute ["A", "B", "C", "D"] and skip []
+        And the plan for task "D" with timings {"A": 1, "B": 2, "C": 3, "D": 1} should estimate 7 total and 7 critical with [] unestimated
+        When updating tasks ["C"]
+        Then the plan for task "D" should execute ["D"] and skip ["A", "B", "C"]
+        And the plan for task "D" with timings {"A": 1, "B": 2, "C": 3} should estimate 0 total and 0 critical with ["D"] unestimated
+        When tasks ["B"] are marked unfinished
+        Then the plan for task "D" with timings {"A": 1, "B": 2, "C": 3, "D": 1} should estimate 6 total and 6 critical with [] unestimated
+        And the plan for task "D" should execute ["B", "C", "D"] and skip ["A"]
+
+
     Scenario: Performance Monitor
         Given an empty static graph
         And a performance monitor
@@ -498,3 +525,112 @@ Feature: Static Graphs
         And tasks ["C"] detect cycles
         And the outputs should be [None]
 
+
+
+    Scenario: Memory Monitor
+        Given the numpy module is available
+        And an empty static graph
+        And a memory monitor
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.zeros(100)), graphcat.array(numpy.zeros(50))]
+        And updating tasks ["A"]
+        Then the memory monitor output should be {"A": [800]}
+        And the memory monitor should report 800 resident and 800 peak bytes
+        When updating tasks ["B"]
+        Then the memory monitor output should be {"A": [800], "B": [400]}
+        And the memory monitor should report 1200 resident and 1200 peak bytes
+        When tasks ["A"] are marked unfinished
+        Then the memory monitor should report 400 resident and 1200 peak bytes
+        When the memory monitor is reset
+        Then the memory monitor output should be {}
+        And the memory monitor should report 400 resident and 400 peak bytes
+
+
+    Scenario: Memory Monitor Shared Outputs
+        Given the numpy module is available
+        And an empty static graph
+        And a memory monitor
+        When adding tasks ["A", "B", "C", "D"] with functions [graphcat.array(numpy.zeros(100)), graphcat.passthrough(), graphcat.passthrough(), graphcat.evaluate("inputs.getone(None)[:50]")]
+        And adding links [("A", "B"), ("B", "C"), ("C", "D")]
+        And updating tasks ["D"]
+        Then the memory monitor output should be {"A": [800], "B": [800], "C": [800], "D": [400]}
+        And the memory monitor should report 800 resident and 800 peak bytes
+        When tasks ["A"] are marked unfinished
+        Then the memory monitor should report 0 resident and 800 peak bytes
+
+
+    Scenario: Frozen Outputs
+        Given the numpy module is available
+        And an empty static graph with frozen outputs
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(4)), graphcat.passthrough(), graphcat.constant({"key": [1, 2]})]
+        And adding links [("A", "B")]
+        And computing the task ["A", "B"] outputs
+        Then the numpy outputs should be [[0, 1, 2, 3], [0, 1, 2, 3]]
+        And modifying the outputs should raise an exception
+        When computing the task ["C"] outputs
+        Then the outputs should be [{"key": (1, 2)}]
+        And modifying the outputs should raise an exception
+        And every output can be pickled without losing its read-only state
+
+
+    Scenario: Metrics Collector With Failures
+        Given an empty static graph
+        And a metrics collector
+        When adding tasks ["A", "B", "C"] with functions [graphcat.raise_exception(RuntimeError()), graphcat.consume, graphcat.constant(1)]
+        And adding links [("A", "B")]
+        And updating tasks ["C"]
+        And updating task "B" an exception should be raised
+        And updating tasks ["C"]
+        Then the metrics collector updates should be {"A": 1, "B": 1, "C": 2}
+        And the metrics collector executions should be {"A": 1, "C": 1}
+        And the metrics collector hits should be {"A": 0, "B": 0, "C": 1}
+        And the metrics collector failures should be {"A": 1}
+
+
+    Scenario: Shared Memory Outputs
+        Given the numpy module is available
+        And the graphcat.sharedmem module is available
+        And an empty static graph
+        When adding tasks ["A", "B"] with functions [graphcat.sharedmem.shared_outputs(graphcat.array(numpy.arange(10000.0)), threshold=0), graphcat.sharedmem.shared_outputs(graphcat.passthrough())]
+        And adding links [("A", "B")]
+        And computing the task ["A", "B"] outputs
+        Then every output is stored in shared memory
+        And every output can be pickled in 200 bytes or less
+        And every output can be pickled out-of-band
+        And every output can be summed by a worker process
+        And every output can be shared by a worker process
+        And the shared memory is released after tasks ["A"] are marked unfinished
+
+
+    Scenario: Snapshots
+        Given the numpy module is available
+        And an empty static graph
+        When adding tasks ["A", "B", "C", "D"] with functions [graphcat.array(numpy.arange(4)), graphcat.passthrough(), graphcat.constant({"foo": "bar"}), None]
+        And adding links [("A", "B")]
+        And updating tasks ["B", "C"]
+        And saving and restoring the graph
+        Then the graph should contain tasks ["A", "B", "C", "D"]
+        And the graph should contain links [("A", ("B", None))]
+        And the task ["A", "B", "C"] state is finished
+        And the task ["D"] state is unfinished
+        When computing the task ["A", "B"] outputs
+        Then tasks [] are executed
+        And the numpy outputs should be [[0, 1, 2, 3], [0, 1, 2, 3]]
+        When computing the task ["C", "D"] outputs
+        Then tasks ["D"] are executed
+        And the outputs should be [{"foo": "bar"}, None]
+
+
+    Scenario: Frozen Snapshots
+        Given the numpy module is available
+        And an empty static graph with frozen outputs
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(4)), graphcat.constant({"key": [1, 2]})]
+        And updating tasks ["A", "B"]
+        And saving and restoring the graph
+        Then the graph should freeze outputs
+        When computing the task ["B"] outputs
+        Then tasks [] are executed
+        And the outputs should be [{"key": (1, 2)}]
+        And modifying the outputs should raise an exception
+        When computing the task ["A"] outputs
+        Then the numpy outputs should be [[0, 1, 2, 3]]
+        And modifying the outputs should raise an exception
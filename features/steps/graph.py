@@ -12,13 +12,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
+import contextlib
+import gc
+import io
+import json
+import os
+import pickle
 import sys
+import tempfile
+import threading
+import time
 import unittest.mock
 
 from behave import *
 
 import graphcat
+import graphcat.analysis
+import graphcat.compare
 import graphcat.diagram
+import graphcat.metrics
 import graphcat.notebook
 
 try:
@@ -37,6 +50,11 @@ try:
 except:
     pass
 
+try:
+    import graphcat.sharedmem
+except:
+    pass
+
 import test
 
 
@@ -46,6 +64,7 @@ class EventRecorder(object):
         self.cycles = []
         self.exceptions = []
         self.executed = []
+        self.executed_extents = []
         self.failed = []
         self.finished = []
         self.inputs = []
@@ -69,6 +88,7 @@ class EventRecorder(object):
 
     def on_execute(self, graph, name, inputs, extent=None):
         self.executed.append(name)
+        self.executed_extents.append(extent)
         self.inputs.append(inputs)
 
     def on_failed(self, graph, name, exception):
@@ -86,6 +106,27 @@ class EventRecorder(object):
         self.updated.append(name)
 
 
+def pull_and_delay(seconds):
+    def implementation(graph, name, inputs, extent=None):
+        time.sleep(seconds)
+        return inputs.getone(None)
+    return implementation
+
+
+def incremental(fn):
+    fn.incremental = True
+    return fn
+
+
+def limit_extent(fn, max_extent):
+    fn.max_extent = max_extent
+    return fn
+
+
+def moving_sum(graph, name, inputs, extent=None):
+    return numpy.convolve(inputs.getone(None), [1, 1, 1], mode="same")
+
+
 #################################################################
 # Givens
 
@@ -105,11 +146,36 @@ def step_impl(context):
     context.graph = graphcat.StaticGraph()
 
 
+@given(u'an empty streaming graph with prefetching')
+def step_impl(context):
+    context.graph = graphcat.StreamingGraph(prefetch=True)
+
+
+@given(u'an empty streaming graph with maximum extent {max_extent} and a {kind} pool')
+def step_impl(context, max_extent, kind):
+    max_extent = eval(max_extent)
+    executor = concurrent.futures.ThreadPoolExecutor(2) if kind == "thread" else concurrent.futures.ProcessPoolExecutor(2)
+    context.add_cleanup(executor.shutdown)
+    context.graph = graphcat.StreamingGraph(max_extent=max_extent, executor=executor)
+
+
+@given(u'an empty streaming graph with maximum extent {max_extent}')
+def step_impl(context, max_extent):
+    max_extent = eval(max_extent)
+    context.graph = graphcat.StreamingGraph(max_extent=max_extent)
+
+
 @given(u'an empty streaming graph')
 def step_impl(context):
     context.graph = graphcat.StreamingGraph()
 
 
+@given(u'an empty {kind} graph with frozen outputs')
+def step_impl(context, kind):
+    graphs = {"dynamic": graphcat.DynamicGraph, "static": graphcat.StaticGraph, "streaming": graphcat.StreamingGraph}
+    context.graph = graphs[kind](freeze_outputs=True)
+
+
 @given(u'a log')
 def step_impl(context):
     context.log = unittest.mock.Mock()
@@ -125,11 +191,61 @@ def step_impl(context):
     context.logger = graphcat.Logger(context.graph, log_exceptions=False, log_inputs=False, log_outputs=False, log_extents=False, log=context.log)
 
 
+@given(u'a numpy file containing {values}')
+def step_impl(context, values):
+    values = eval(values)
+    context.directory = tempfile.TemporaryDirectory()
+    context.path = os.path.join(context.directory.name, "array.npy")
+    numpy.save(context.path, numpy.array(values))
+
+
+@given(u'a raw file containing {values} with dtype {dtype}')
+def step_impl(context, values, dtype):
+    values = eval(values)
+    dtype = eval(dtype)
+    context.directory = tempfile.TemporaryDirectory()
+    context.path = os.path.join(context.directory.name, "array.raw")
+    numpy.array(values, dtype=dtype).tofile(context.path)
+
+
+@given(u'a memory monitor')
+def step_impl(context):
+    context.memory_monitor = graphcat.MemoryMonitor(context.graph)
+
+
+@given(u'a metrics collector')
+def step_impl(context):
+    context.metrics_collector = graphcat.metrics.MetricsCollector(context.graph)
+
+
+@given(u'a trace recorder')
+def step_impl(context):
+    context.trace_recorder = graphcat.TraceRecorder(context.graph)
+
+
 @given(u'a performance monitor')
 def step_impl(context):
     context.performance_monitor = graphcat.PerformanceMonitor(context.graph)
 
 
+@given(u'a performance monitor with history {history}')
+def step_impl(context, history):
+    history = eval(history)
+    context.performance_monitor = graphcat.PerformanceMonitor(context.graph, history=history)
+
+
+@given(u'a profiler for tasks {names}')
+def step_impl(context, names):
+    names = eval(names)
+    context.profiler = graphcat.Profiler(context.graph, names=names)
+
+
+@given(u'a profiler with predicate {predicate}')
+def step_impl(context, predicate):
+    predicate = eval(predicate)
+    context.profiler = graphcat.Profiler(context.graph, predicate=predicate)
+
+
 #################################################################
 # Whens
 
@@ -282,6 +398,13 @@ def step_impl(context, name, function):
     context.graph.set_task(name, function)
 
 
+@when(u'tasks {names} are marked unfinished in extent {extent}')
+def step_impl(context, names, extent):
+    names = eval(names)
+    extent = eval(extent)
+    context.graph.mark_unfinished(names, extent=extent)
+
+
 @when(u'tasks {names} are marked unfinished')
 def step_impl(context, names):
     names = eval(names)
@@ -294,6 +417,11 @@ def step_impl(context):
     context.performance_monitor.reset()
 
 
+@when(u'the memory monitor is reset')
+def step_impl(context):
+    context.memory_monitor.reset()
+
+
 @when(u'filtering the graph with {hide} then the remaining nodes should match {names}')
 def step_impl(context, hide, names):
     hide = eval(hide)
@@ -303,6 +431,14 @@ def step_impl(context, hide, names):
     test.assert_equal(sorted(remaining), sorted(names))
 
 
+@when(u'grouping the graph with {group} then the groups should match {groups}')
+def step_impl(context, group, groups):
+    group = eval(group)
+    groups = eval(groups)
+
+    test.assert_equal(groups, {name: group(name) for name in context.graph.tasks()})
+
+
 @when(u'computing the task {names} outputs with extents {extents}')
 def step_impl(context, names, extents):
     names = eval(names)
@@ -311,6 +447,51 @@ def step_impl(context, names, extents):
     context.outputs = [context.graph.output(name, extent=extent) for name, extent in zip(names, extents)]
 
 
+@when(u'the graph is closed')
+def step_impl(context):
+    context.graph.close()
+
+
+@when(u'prefetching task {name} with extent {extent}')
+def step_impl(context, name, extent):
+    name = eval(name)
+    extent = eval(extent)
+    context.graph.prefetch(name, extent)
+
+
+@when(u'iterating over the task {name} outputs with extents {extents} in a pipeline an exception should be raised')
+def step_impl(context, name, extents):
+    name = eval(name)
+    extents = eval(extents)
+    context.events = EventRecorder(context.graph)
+    with test.assert_raises(RuntimeError):
+        list(context.graph.iter_output(name, extents, pipelined=True))
+
+
+@when(u'iterating over the task {name} outputs with extents {extents} in a pipeline')
+def step_impl(context, name, extents):
+    name = eval(name)
+    extents = eval(extents)
+    context.events = EventRecorder(context.graph)
+    context.extents = []
+    context.outputs = []
+    for extent, output in context.graph.iter_output(name, extents, pipelined=True):
+        context.extents.append(extent)
+        context.outputs.append(output)
+
+
+@when(u'iterating over the task {name} outputs with extents {extents}')
+def step_impl(context, name, extents):
+    name = eval(name)
+    extents = eval(extents)
+    context.events = EventRecorder(context.graph)
+    context.extents = []
+    context.outputs = []
+    for extent, output in context.graph.iter_output(name, extents):
+        context.extents.append(extent)
+        context.outputs.append(output)
+
+
 @when(u'computing the task {names} outputs')
 def step_impl(context, names):
     names = eval(names)
@@ -318,6 +499,29 @@ def step_impl(context, names):
     context.outputs = [context.graph.output(name) for name in names]
 
 
+@when(u'saving and restoring the graph')
+def step_impl(context):
+    context.directory = tempfile.TemporaryDirectory()
+    context.graph.save(context.directory.name)
+    context.graph = graphcat.graph.Graph.load(context.directory.name)
+
+
+@when(u'saving and restoring the graph with functions {fns}')
+def step_impl(context, fns):
+    fns = eval(fns)
+    context.directory = tempfile.TemporaryDirectory()
+    context.graph.save(context.directory.name)
+    context.graph = graphcat.graph.Graph.load(context.directory.name, fns=fns)
+
+
+@when(u'saving and restoring the graph an exception should be raised')
+def step_impl(context):
+    context.directory = tempfile.TemporaryDirectory()
+    context.graph.save(context.directory.name)
+    with test.assert_raises(ValueError):
+        graphcat.graph.Graph.load(context.directory.name)
+
+
 @when(u'the graph is converted to a diagram')
 def step_impl(context):
     context.agraph = graphcat.diagram.draw(context.graph)
@@ -344,6 +548,19 @@ def step_impl(context, outputs):
     test.assert_equal(outputs, context.outputs)
 
 
+@then(u'the extent {extent} should equal {expected}')
+def step_impl(context, extent, expected):
+    extent = eval(extent)
+    expected = eval(expected)
+    test.assert_equal(extent, expected)
+
+
+@then(u'the extents should be {extents}')
+def step_impl(context, extents):
+    extents = eval(extents)
+    test.assert_equal(extents, context.extents)
+
+
 @then(u'the numpy outputs should be {outputs}')
 def step_impl(context, outputs):
     outputs = eval(outputs)
@@ -351,6 +568,109 @@ def step_impl(context, outputs):
         numpy.testing.assert_allclose(a, b)
 
 
+@then(u'every output is memory-mapped')
+def step_impl(context):
+    for output in context.outputs:
+        test.assert_is_instance(output, numpy.memmap)
+
+
+@then(u'modifying the outputs should raise an exception')
+def step_impl(context):
+    for output in context.outputs:
+        with test.assert_raises(Exception):
+            if isinstance(output, numpy.ndarray):
+                output[...] = 0
+            else:
+                output["key"] = 0
+
+
+@then(u'the graph should freeze outputs')
+def step_impl(context):
+    test.assert_true(context.graph.freeze_outputs)
+
+
+@then(u'every output can be pickled without losing its read-only state')
+def step_impl(context):
+    for output in context.outputs:
+        copy = pickle.loads(pickle.dumps(output))
+        test.assert_equal(copy, output)
+        test.assert_is_instance(copy, type(output))
+        with test.assert_raises(TypeError):
+            copy["key"] = 0
+
+
+@then(u'every output is stored in shared memory')
+def step_impl(context):
+    for output in context.outputs:
+        test.assert_is_instance(output, graphcat.sharedmem.SharedArray)
+
+
+@then(u'every output can be pickled in {size} bytes or less')
+def step_impl(context, size):
+    size = eval(size)
+    for output in context.outputs:
+        test.assert_true(len(pickle.dumps(output)) <= size)
+        numpy.testing.assert_array_equal(pickle.loads(pickle.dumps(output)), output)
+
+
+@then(u'every output can be pickled out-of-band')
+def step_impl(context):
+    for output in context.outputs:
+        data, buffers = graphcat.sharedmem.dumps(numpy.array(output))
+        test.assert_equal(len(buffers), 1)
+        test.assert_true(len(data) <= 200)
+        numpy.testing.assert_array_equal(graphcat.sharedmem.loads(data, buffers), output)
+
+
+@then(u'every output can be shared by a worker process')
+def step_impl(context):
+    results = []
+    with concurrent.futures.ProcessPoolExecutor(1) as pool:
+        for output in context.outputs:
+            results.append(pool.submit(graphcat.sharedmem.share, output * 2, 0).result())
+    # The worker has exited, so the parent must own the blocks now.
+    blocks = []
+    for output, result in zip(context.outputs, results):
+        test.assert_is_instance(result, graphcat.sharedmem.SharedArray)
+        numpy.testing.assert_array_equal(result, output * 2)
+        test.assert_true(result._block.owner)
+        blocks.append(result._block.name)
+    del output, result, results
+    gc.collect()
+    for block in blocks:
+        with test.assert_raises(FileNotFoundError):
+            graphcat.sharedmem.shared_memory.SharedMemory(name=block)
+
+
+@then(u'every output can be summed by a worker process')
+def step_impl(context):
+    with concurrent.futures.ProcessPoolExecutor(1) as pool:
+        for output in context.outputs:
+            test.assert_equal(pool.submit(numpy.sum, output).result(), numpy.sum(output))
+
+
+@then(u'no prefetch threads should be running')
+def step_impl(context):
+    threads = [thread for thread in threading.enumerate() if thread.name.startswith("graphcat-prefetch")]
+    test.assert_equal(threads, [])
+
+
+@then(u'the shared memory is released after tasks {names} are marked unfinished')
+def step_impl(context, names):
+    names = eval(names)
+    blocks = [output._block.name for output in context.outputs]
+    expected = [numpy.array(output) for output in context.outputs]
+    for name in names:
+        context.graph.mark_unfinished(name)
+    # Arrays that are still in use remain valid after their blocks are unlinked.
+    for block in blocks:
+        with test.assert_raises(FileNotFoundError):
+            graphcat.sharedmem.shared_memory.SharedMemory(name=block)
+    for output, values in zip(context.outputs, expected):
+        numpy.testing.assert_array_equal(output, values)
+        test.assert_true(len(pickle.dumps(output)) > values.nbytes)
+
+
 @then(u'the task {names} state is failed')
 def step_impl(context, names):
     names = eval(names)
@@ -497,6 +817,19 @@ def step_impl(context, names):
     test.assert_equal(names, context.events.cycles)
 
 
+@then(u'tasks {names} are executed with extents {extents}')
+def step_impl(context, names, extents):
+    names = eval(names)
+    extents = eval(extents)
+    test.assert_equal(list(zip(names, extents)), list(zip(context.events.executed, context.events.executed_extents)))
+
+
+@then(u'tasks {names} are executed in any order')
+def step_impl(context, names):
+    names = eval(names)
+    test.assert_equal(sorted(names), sorted(context.events.executed))
+
+
 @then(u'tasks {names} are executed')
 def step_impl(context, names):
     names = eval(names)
@@ -524,6 +857,23 @@ def step_impl(context):
     agraph = graphcat.diagram.draw(context.graph)
 
 
+@then(u'the graph can be drawn as a diagram grouped by {group} with focus {focus} and radius {radius}')
+def step_impl(context, group, focus, radius):
+    group = eval(group)
+    focus = eval(focus)
+    radius = eval(radius)
+    agraph = graphcat.diagram.draw(context.graph, group=group, focus=focus, radius=radius)
+    context.agraph = agraph
+
+
+@then(u'the diagram should contain nodes {nodes} and {count} edges')
+def step_impl(context, nodes, count):
+    nodes = eval(nodes)
+    count = eval(count)
+    test.assert_equal(sorted(nodes), sorted(context.agraph.nodes()))
+    test.assert_equal(count, len(context.agraph.edges()))
+
+
 @then(u'displaying the graph in a notebook should produce a visualization')
 def step_impl(context):
     graphcat.notebook.display(context.graph)
@@ -534,12 +884,104 @@ def step_impl(context):
     graphcat.notebook.display(context.agraph)
 
 
+@then(u'the critical path for task {name} with timings {timings} should be {path} with length {length} and speedup {speedup}')
+def step_impl(context, name, timings, path, length, speedup):
+    name = eval(name)
+    timings = eval(timings)
+    path = eval(path)
+    length = eval(length)
+    speedup = eval(speedup)
+    context.analysis = graphcat.analysis.critical_path(context.graph, name, timings)
+    test.assert_equal(path, context.analysis.path)
+    test.assert_almost_equal(length, context.analysis.length, places=None, delta=0.01)
+    test.assert_almost_equal(speedup, context.analysis.speedup, places=None, delta=0.01)
+
+
+@then(u'the critical path slack should be {slack}')
+def step_impl(context, slack):
+    slack = eval(slack)
+    actual = context.analysis.slack
+    test.assert_dict_list_values_close({name: [slack[name]] for name in sorted(slack)}, {name: [actual[name]] for name in sorted(actual)}, places=None, delta=0.01)
+
+
+@then(u'the plan for task {name} with extent {extent} should execute {tasks} and skip {finished}')
+def step_impl(context, name, extent, tasks, finished):
+    name = eval(name)
+    extent = eval(extent)
+    tasks = eval(tasks)
+    finished = eval(finished)
+    plan = context.graph.plan(name, extent)
+    test.assert_equal(tasks, plan.tasks)
+    test.assert_equal(finished, plan.finished)
+
+
+@then(u'the plan for task {name} should execute {tasks} and skip {finished}')
+def step_impl(context, name, tasks, finished):
+    name = eval(name)
+    tasks = eval(tasks)
+    finished = eval(finished)
+    plan = context.graph.plan(name)
+    test.assert_equal(tasks, plan.tasks)
+    test.assert_equal(finished, plan.finished)
+    test.assert_equal(tasks, plan.unestimated)
+    test.assert_equal(None, plan.total)
+
+
+@then(u'the plan for task {name} with timings {timings} should estimate {total} total and {critical} critical with {unestimated} unestimated')
+def step_impl(context, name, timings, total, critical, unestimated):
+    name = eval(name)
+    timings = eval(timings)
+    total = eval(total)
+    critical = eval(critical)
+    unestimated = eval(unestimated)
+    plan = context.graph.plan(name, timings=timings)
+    test.assert_almost_equal(total, plan.total, places=None, delta=0.01)
+    test.assert_almost_equal(critical, plan.critical, places=None, delta=0.01)
+    test.assert_equal(unestimated, plan.unestimated)
+
+
+@then(u'the critical path for task {name} should raise {exception}')
+def step_impl(context, name, exception):
+    name = eval(name)
+    exception = eval(exception)
+    with test.assert_raises(exception):
+        graphcat.analysis.critical_path(context.graph, name, {})
+
+
+@then(u'the graph can be drawn as a diagram with critical path')
+def step_impl(context):
+    agraph = graphcat.diagram.draw(context.graph)
+    agraph = graphcat.diagram.critical_path(agraph, context.analysis)
+
+
 @then(u'the graph can be drawn as a diagram with performance overlay')
 def step_impl(context):
     agraph = graphcat.diagram.draw(context.graph)
     agraph = graphcat.diagram.performance(agraph, context.performance_monitor)
 
 
+@then(u'the diagram with performance overlay and critical path should label {node} with its time and slack')
+def step_impl(context, node):
+    node = eval(node)
+    agraph = graphcat.diagram.draw(context.graph)
+    agraph = graphcat.diagram.performance(agraph, context.performance_monitor)
+    agraph = graphcat.diagram.critical_path(agraph, context.analysis)
+    label = agraph.get_node(node).attr["xlabel"]
+    test.assert_equal(label.count("<font"), 3)
+    test.assert_true("slack" in label)
+
+
+@then(u'the diagram grouped by {group} with performance overlay should label {node} with {seconds} seconds')
+def step_impl(context, group, node, seconds):
+    group = eval(group)
+    node = eval(node)
+    seconds = eval(seconds)
+    agraph = graphcat.diagram.draw(context.graph, group=group)
+    agraph = graphcat.diagram.performance(agraph, context.performance_monitor, group=group)
+    label = agraph.get_node(node).attr["xlabel"]
+    test.assert_almost_equal(float(label.rsplit("'black'>", 1)[1].split("s<", 1)[0]), seconds, places=None, delta=0.05)
+
+
 @then(u'tasks {names} should have links {links}')
 def step_impl(context, names, links):
     names = eval(names)
@@ -562,3 +1004,126 @@ def step_impl(context, outputs):
     test.assert_dict_list_values_close(outputs, monitor.tasks, places=None, delta=0.01)
 
 
+@then(u'the profiler should contain {counts} profiles')
+def step_impl(context, counts):
+    counts = eval(counts)
+    profiles = context.profiler.profiles
+    test.assert_equal(counts, {name: len(value) for name, value in profiles.items()})
+    for name in counts:
+        test.assert_true(context.profiler.stats(name).total_calls > 0)
+
+
+@then(u'the profile for task {name} should include {function} and exclude {excluded}')
+def step_impl(context, name, function, excluded):
+    name = eval(name)
+    function = eval(function)
+    excluded = eval(excluded)
+    functions = {f"{os.path.basename(key[0])}:{key[2]}" for key in context.profiler.stats(name).stats}
+    test.assert_true(function in functions)
+    test.assert_true(excluded not in functions)
+
+
+@then(u'the metrics collector {counter} should be {counts}')
+def step_impl(context, counter, counts):
+    counts = eval(counts)
+    test.assert_equal(counts, context.metrics_collector.counters[counter])
+
+
+@then(u'the metrics collector output should contain {lines}')
+def step_impl(context, lines):
+    lines = eval(lines)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "metrics.prom")
+        context.metrics_collector.write(path)
+        with open(path) as stream:
+            output = stream.read().splitlines()
+        test.assert_equal(["metrics.prom"], os.listdir(directory))
+    for line in lines:
+        test.assert_true(line in output, msg=line)
+
+
+@then(u'the performance monitor can be saved as {filename} and loaded')
+def step_impl(context, filename):
+    filename = eval(filename)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, filename)
+        context.performance_monitor.save(path)
+        inclusive = graphcat.compare.load(path)
+        exclusive = graphcat.compare.load(path, exclusive=True)
+    test.assert_equal(context.performance_monitor.inclusive, inclusive)
+    test.assert_equal(context.performance_monitor.exclusive, exclusive)
+
+
+@then(u'comparing recordings {baseline} and {candidate} should report {statuses} with exit status {status}')
+def step_impl(context, baseline, candidate, statuses, status):
+    baseline = eval(baseline)
+    candidate = eval(candidate)
+    statuses = eval(statuses)
+    status = eval(status)
+    test.assert_equal(statuses, {result.name: result.status for result in graphcat.compare.compare(baseline, candidate)})
+
+    def write(path, times):
+        with open(path, "w") as stream:
+            tasks = [{"name": name, "inclusive": values, "exclusive": values} for name, values in times.items()]
+            json.dump({"format": "graphcat-performance", "version": 1, "tasks": tasks}, stream)
+
+    with tempfile.TemporaryDirectory() as directory:
+        write(os.path.join(directory, "baseline.json"), baseline)
+        write(os.path.join(directory, "candidate.json"), candidate)
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = graphcat.compare.main([os.path.join(directory, "baseline.json"), os.path.join(directory, "candidate.json")])
+    test.assert_equal(status, result)
+
+
+@then(u'the trace should contain events {events}')
+def step_impl(context, events):
+    events = eval(events)
+    trace = context.trace_recorder.trace()["traceEvents"]
+    test.assert_equal(events, [(event["ph"], event["name"]) for event in trace if event["ph"] != "M"])
+
+
+@then(u'the trace can be written as JSON')
+def step_impl(context):
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "trace.json")
+        context.trace_recorder.write(path)
+        with open(path) as stream:
+            trace = json.load(stream)
+    timestamps = [event["ts"] for event in trace["traceEvents"] if event["ph"] != "M"]
+    test.assert_equal(sorted(timestamps), timestamps)
+    test.assert_true(all(event["tid"] for event in trace["traceEvents"]))
+
+
+@then(u'the performance monitor exclusive output should be {outputs}')
+def step_impl(context, outputs):
+    outputs = eval(outputs)
+
+    monitor = context.performance_monitor
+    test.assert_dict_list_values_close(outputs, monitor.exclusive, places=None, delta=0.01)
+
+
+@then(u'the performance monitor statistics for task {name} should be {count} executions with maximum {maximum}')
+def step_impl(context, name, count, maximum):
+    name = eval(name)
+    count = eval(count)
+    maximum = eval(maximum)
+
+    statistics = context.performance_monitor.statistics()[name]
+    test.assert_equal(count, statistics.count)
+    test.assert_almost_equal(maximum, statistics.max, places=None, delta=0.01)
+    test.assert_true(statistics.p50 <= statistics.p95 <= statistics.max)
+    test.assert_almost_equal(statistics.total / count, statistics.mean)
+
+
+@then(u'the memory monitor output should be {outputs}')
+def step_impl(context, outputs):
+    outputs = eval(outputs)
+    test.assert_equal(outputs, context.memory_monitor.tasks)
+
+
+@then(u'the memory monitor should report {resident} resident and {peak} peak bytes')
+def step_impl(context, resident, peak):
+    resident = eval(resident)
+    peak = eval(peak)
+    test.assert_equal(resident, context.memory_monitor.resident)
+    test.assert_equal(peak, context.memory_monitor.peak)
@@ -327,6 +327,19 @@ Feature: Streaming Graphs
         When filtering the graph with graphcat.diagram.parameters then the remaining nodes should match ["A", "B", "D"]
 
 
+    Scenario: Grouped Diagrams
+        Given the pygraphviz module is available
+        And an empty streaming graph
+        When adding tasks ["in/a", "in/b", "proc/x", "proc/y", "out"] with functions [None, None, None, None, None]
+        And adding links [("in/a", "proc/x"), ("in/b", "proc/x"), ("in/b", "proc/y"), ("proc/x", "out"), ("proc/y", "out")]
+        Then the graph can be drawn as a diagram grouped by graphcat.diagram.prefix() with focus None and radius 1
+        And the diagram should contain nodes ["group:in", "group:proc", "out"] and 2 edges
+        And the graph can be drawn as a diagram grouped by None with focus "in/a" and radius 1
+        And the diagram should contain nodes ["in/a", "proc/x"] and 1 edges
+        And the graph can be drawn as a diagram grouped by None with focus "in/a" and radius 2
+        And the diagram should contain nodes ["in/a", "in/b", "out", "proc/x"] and 3 edges
+
+
     Scenario: Notebook Display
         Given the pygraphviz module is available
         And the IPython module is available
@@ -405,6 +418,43 @@ Feature: Streaming Graphs
         Then the outputs should be [42, 10, 42]
 
 
+    Scenario: Update Plan
+        Given an empty streaming graph
+        When adding tasks ["A", "B", "C", "D"] with functions [graphcat.constant(1), graphcat.passthrough(None), graphcat.passthrough(None), graphcat.consume]
+        And adding links [("A", "B"), ("B", "C"), ("A", "D"), ("C", "D")]
+        Then the plan for task "D" should execute ["A", "B", "C", "D"] and skip []
+        And the plan for task "D" with timings {"A": 1, "B": 2, "C": 3, "D": 1} should estimate 7 total and 7 critical with [] unestimated
+        When updating tasks ["C"]
+        Then the plan for task "D" should execute ["D"] and skip ["A", "B", "C"]
+        And the plan for task "D" with timings {"A": 1, "B": 2, "C": 3} should estimate 0 total and 0 critical with ["D"] unestimated
+        When tasks ["B"] are marked unfinished
+        Then the plan for task "D" with timings {"A": 1, "B": 2, "C": 3, "D": 1} should estimate 6 total and 6 critical with [] unestimated
+        And the plan for task "D" should execute ["B", "C", "D"] and skip ["A"]
+
+
+    Scenario: Update Plan Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(20)), graphcat.stencil(moving_sum, radius=1), graphcat.evaluate("inputs.getone(None, extent) * 2")]
+        And adding links [("A", "B"), ("B", "C")]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[0:8]]
+        Then the plan for task "B" with extent graphcat.ArrayExtent[0:8] should execute [] and skip ["A", "B"]
+        And the plan for task "B" with extent graphcat.ArrayExtent[4:8] should execute ["A", "B"] and skip []
+        And the plan for task "C" with extent graphcat.ArrayExtent[0:8] should execute ["C"] and skip ["A", "B"]
+
+
+    Scenario: Update Plan Explicit Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(20)), graphcat.evaluate("inputs.getone(None, extent) * 2"), graphcat.passthrough(None)]
+        And adding links [("A", "B"), ("B", "C")]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[0:10]]
+        Then the plan for task "B" with extent graphcat.ArrayExtent[0:10] should execute [] and skip ["A", "B"]
+        And the plan for task "B" with extent graphcat.ArrayExtent[10:20] should execute ["A", "B"] and skip []
+        When computing the task ["C"] outputs with extents [graphcat.ArrayExtent[0:10]]
+        Then the plan for task "C" with extent graphcat.ArrayExtent[0:10] should execute [] and skip ["A", "B", "C"]
+
+
     Scenario: Performance Monitor
         Given an empty streaming graph
         And a performance monitor
@@ -529,3 +579,350 @@ Feature: Streaming Graphs
         Then tasks ["A"] are executed
         When computing the task ["A"] outputs with extents [graphcat.ArrayExtent[0:4]]
         Then tasks [] are executed
+
+
+    Scenario: Memory Mapped Extents
+        Given the numpy module is available
+        And a numpy file containing [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+        And an empty streaming graph
+        When adding tasks ["A"] with functions [graphcat.memmap(context.path)]
+        And computing the task ["A"] outputs
+        Then the numpy outputs should be [[[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]]
+        And every output is memory-mapped
+        When computing the task ["A"] outputs with extents [graphcat.ArrayExtent[1:3, 2:]]
+        Then the numpy outputs should be [[[6, 7], [10, 11]]]
+        And every output is memory-mapped
+
+
+    Scenario: Memory Mapped Extents Ignore Data Type
+        Given the numpy module is available
+        And a numpy file containing [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]
+        And an empty streaming graph
+        When adding tasks ["A"] with functions [graphcat.memmap(context.path, dtype="int16")]
+        And computing the task ["A"] outputs with extents [graphcat.ArrayExtent[1:3, 2:]]
+        Then the numpy outputs should be [[[6, 7], [10, 11]]]
+        And every output is memory-mapped
+
+
+    Scenario: Raw Memory Mapped Extents
+        Given the numpy module is available
+        And a raw file containing [0, 1, 2, 3, 4, 5, 6, 7] with dtype "int16"
+        And an empty streaming graph
+        When adding tasks ["A"] with functions [graphcat.memmap(context.path, dtype="int16", shape=(2, 4))]
+        And computing the task ["A"] outputs with extents [graphcat.ArrayExtent[:, 1::2]]
+        Then the numpy outputs should be [[[1, 3], [5, 7]]]
+        And every output is memory-mapped
+
+
+    Scenario: Frozen Outputs
+        Given the numpy module is available
+        And an empty streaming graph with frozen outputs
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(4)), graphcat.passthrough(), graphcat.constant({"key": [1, 2]})]
+        And adding links [("A", "B")]
+        And computing the task ["A", "B"] outputs
+        Then the numpy outputs should be [[0, 1, 2, 3], [0, 1, 2, 3]]
+        And modifying the outputs should raise an exception
+        When computing the task ["C"] outputs
+        Then the outputs should be [{"key": (1, 2)}]
+        And modifying the outputs should raise an exception
+
+
+    Scenario: Iterating Over Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.evaluate("inputs.getone(None, extent) * 2")]
+        And adding links [("A", "B")]
+        And iterating over the task "B" outputs with extents graphcat.ArrayExtent.tiles(10, 4)
+        Then tasks ["B", "A", "B", "A", "B", "A"] are executed
+        And the extents should be [slice(0, 4), slice(4, 8), slice(8, 10)]
+        And the numpy outputs should be [[0, 2, 4, 6], [8, 10, 12, 14], [16, 18]]
+
+
+    Scenario: Tiled Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A"] with functions [graphcat.array(numpy.arange(12).reshape(3, 4))]
+        And iterating over the task "A" outputs with extents graphcat.ArrayExtent.tiles((3, 4), (2, 3))
+        Then the extents should be [(slice(0, 2), slice(0, 3)), (slice(0, 2), slice(3, 4)), (slice(2, 3), slice(0, 3)), (slice(2, 3), slice(3, 4))]
+        And the numpy outputs should be [[[0, 1, 2], [4, 5, 6]], [[3], [7]], [[8, 9, 10]], [[11]]]
+
+
+    Scenario: Pipelined Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B", "C", "D"] with functions [graphcat.array(numpy.arange(10)), graphcat.constant(3), graphcat.evaluate("inputs.getone('array', extent) * inputs.getone('scale')"), graphcat.passthrough()]
+        And adding links [("A", ("C", "array")), ("B", ("C", "scale")), ("C", ("D", None))]
+        And iterating over the task "D" outputs with extents graphcat.ArrayExtent.tiles(10, 4) in a pipeline
+        Then tasks ["A", "A", "A", "B", "B", "B", "C", "C", "C", "D", "D", "D"] are executed in any order
+        And the extents should be [slice(0, 4), slice(4, 8), slice(8, 10)]
+        And the numpy outputs should be [[0, 3, 6, 9], [12, 15, 18, 21], [24, 27]]
+        And the task ["A", "B", "C", "D"] state is unfinished
+
+
+    Scenario: Memory Monitor Pipelined Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        And a memory monitor
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.zeros(10)), graphcat.evaluate("inputs.getone(None, extent) + 1")]
+        And adding links [("A", "B")]
+        And iterating over the task "B" outputs with extents graphcat.ArrayExtent.tiles(10, 5) in a pipeline
+        Then the memory monitor output should be {"A": [40, 40], "B": [40, 40]}
+        And the memory monitor should report 0 resident and 0 peak bytes
+
+
+    Scenario: Failing Pipelined Extents
+        Given an empty streaming graph
+        When adding tasks ["A", "B", "C"] with functions [graphcat.constant(1), graphcat.raise_exception(RuntimeError()), graphcat.passthrough()]
+        And adding links [("A", "B"), ("B", "C")]
+        And iterating over the task "C" outputs with extents range(10) in a pipeline an exception should be raised
+        Then the task ["A", "B", "C"] state is unfinished
+
+
+    Scenario: Stencil Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.stencil(moving_sum, radius=1)]
+        And adding links [("A", "B")]
+        And iterating over the task "B" outputs with extents graphcat.ArrayExtent.tiles(10, 4)
+        Then tasks ["B", "A", "B", "A", "B", "A"] are executed with extents [slice(0, 4), slice(0, 5), slice(4, 8), slice(3, 9), slice(8, 10), slice(7, 11)]
+        And the numpy outputs should be [[1, 3, 6, 9], [12, 15, 18, 21], [24, 17]]
+
+
+    Scenario: Pipelined Stencil Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.stencil(moving_sum, radius=1)]
+        And adding links [("A", "B")]
+        And iterating over the task "B" outputs with extents graphcat.ArrayExtent.tiles(10, 4) in a pipeline
+        Then the extents should be [slice(0, 4), slice(4, 8), slice(8, 10)]
+        And the numpy outputs should be [[1, 3, 6, 9], [12, 15, 18, 21], [24, 17]]
+
+
+    Scenario: Streaming Reductions
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.reduce_sum(shape=10, chunks=4)]
+        And adding links [("A", "B")]
+        And computing the task ["B"] outputs
+        Then tasks ["B", "A", "A", "A"] are executed with extents [None, slice(0, 4), slice(4, 8), slice(8, 10)]
+        And the outputs should be [45]
+        When adding tasks ["C", "D", "E", "F"] with functions [graphcat.reduce_mean(shape=10, chunks=3), graphcat.reduce_min(shape=10, chunks=3), graphcat.reduce_max(shape=10, chunks=3, workers=2), graphcat.reduce_count(shape=10, chunks=3, workers=2)]
+        And adding links [("A", "C"), ("A", "D"), ("A", "E"), ("A", "F")]
+        And computing the task ["C", "D", "E", "F"] outputs
+        Then the outputs should be [4.5, 0, 9, 10]
+
+
+    Scenario: Multidimensional Streaming Reductions
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(100).reshape(10, 10)), graphcat.reduce_sum(shape=(10, 10), chunks=4), graphcat.reduce_count(shape=(10, 10), chunks=(3, 10), workers=2)]
+        And adding links [("A", "B"), ("A", "C")]
+        And computing the task ["B"] outputs
+        Then tasks ["B", "A", "A", "A", "A", "A", "A", "A", "A", "A"] are executed
+        And the outputs should be [4950]
+        When computing the task ["C"] outputs
+        Then the outputs should be [100]
+
+
+    Scenario: Streaming Histogram
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(10)), graphcat.reduce_histogram(shape=10, chunks=3, bins=2, range=(0, 10), workers=3), graphcat.evaluate("inputs.getone(None)[0]")]
+        And adding links [("A", "B"), ("B", "C")]
+        And computing the task ["C"] outputs
+        Then the numpy outputs should be [[5, 5]]
+
+
+    Scenario: Split Extents
+        Given the numpy module is available
+        And an empty streaming graph with maximum extent 4
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.evaluate("inputs.getone(None, extent) * 2")]
+        And adding links [("A", "B")]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[0:10]]
+        Then tasks ["B", "A", "A", "A"] are executed with extents [slice(0, 10), slice(0, 4), slice(4, 8), slice(8, 10)]
+        And the numpy outputs should be [[0, 2, 4, 6, 8, 10, 12, 14, 16, 18]]
+        When computing the task ["B"] outputs with extents [graphcat.ArrayExtent[1:3]]
+        Then tasks ["B", "A"] are executed with extents [slice(1, 3), slice(1, 3)]
+        And the numpy outputs should be [[2, 4]]
+
+
+    Scenario: Split Extents Past The End
+        Given the numpy module is available
+        And an empty streaming graph with maximum extent 4
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(10)), graphcat.evaluate("inputs.getone(None, extent) * 2"), graphcat.array(numpy.arange(12).reshape(3, 4))]
+        And adding links [("A", "B")]
+        And computing the task ["B", "B", "C"] outputs with extents [graphcat.ArrayExtent[0:20], graphcat.ArrayExtent[6:20], graphcat.ArrayExtent[0:10, 1:10]]
+        Then the numpy outputs should be [[0, 2, 4, 6, 8, 10, 12, 14, 16, 18], [12, 14, 16, 18], [[1, 2, 3], [5, 6, 7], [9, 10, 11]]]
+
+
+    Scenario: Split Task Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(12).reshape(3, 4)), limit_extent(graphcat.evaluate("inputs.getone(None, extent)"), (2, 4))]
+        And adding links [("A", "B")]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[0:3, 1:4]]
+        Then tasks ["B", "A", "A"] are executed
+        And the numpy outputs should be [[[1, 2, 3], [5, 6, 7], [9, 10, 11]]]
+
+
+    Scenario: Concurrent Split Extents
+        Given the numpy module is available
+        And an empty streaming graph with maximum extent 4 and a thread pool
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.stencil(moving_sum, radius=1)]
+        And adding links [("A", "B")]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[0:10]]
+        Then tasks ["B"] are executed with extents [slice(0, 10)]
+        And the numpy outputs should be [[1, 3, 6, 9, 12, 15, 18, 21, 24, 17]]
+        And the task ["A"] state is unfinished
+        And the task ["B"] state is finished
+
+
+    Scenario: Process Pool Split Extents
+        Given the numpy module is available
+        And an empty streaming graph with maximum extent (2, 2) and a process pool
+        When adding tasks ["A"] with functions [graphcat.array(numpy.arange(12).reshape(3, 4))]
+        And computing the task ["A"] outputs with extents [graphcat.ArrayExtent[0:3, 0:4]]
+        Then the numpy outputs should be [[[0, 1, 2, 3], [4, 5, 6, 7], [8, 9, 10, 11]]]
+
+
+    Scenario: Prefetching Strided Extents
+        Given the numpy module is available
+        And an empty streaming graph with prefetching
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.stencil(moving_sum, radius=1)]
+        And adding links [("A", "B")]
+        And computing the task ["B", "B"] outputs with extents [graphcat.ArrayExtent[0:2], graphcat.ArrayExtent[2:4]]
+        Then tasks ["B", "A", "B", "A"] are executed
+        When computing the task ["B"] outputs with extents [graphcat.ArrayExtent[4:6]]
+        Then tasks [] are executed
+        And the numpy outputs should be [[12, 15]]
+        And the task ["B"] state is finished
+        When computing the task ["B"] outputs with extents [graphcat.ArrayExtent[8:10]]
+        Then tasks ["B", "A"] are executed
+        And the numpy outputs should be [[24, 17]]
+
+
+    Scenario: Prefetching Cleanup
+        Given the numpy module is available
+        And an empty streaming graph with prefetching
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.stencil(moving_sum, radius=1)]
+        And adding links [("A", "B")]
+        And computing the task ["B", "B"] outputs with extents [graphcat.ArrayExtent[0:2], graphcat.ArrayExtent[2:4]]
+        And tasks ["A"] are marked unfinished
+        And computing the task ["B", "B"] outputs with extents [graphcat.ArrayExtent[4:6], graphcat.ArrayExtent[6:8]]
+        Then tasks ["B", "A", "B", "A"] are executed
+        When renaming tasks ["B"] as ["C"]
+        And computing the task ["C"] outputs with extents [graphcat.ArrayExtent[8:10]]
+        Then tasks ["C", "A"] are executed
+        When the graph is closed
+        Then no prefetch threads should be running
+        When computing the task ["C", "C", "C"] outputs with extents [graphcat.ArrayExtent[0:2], graphcat.ArrayExtent[2:4], graphcat.ArrayExtent[4:6]]
+        Then tasks ["C", "A", "C", "A"] are executed
+        When the graph is closed
+        Then no prefetch threads should be running
+
+
+    Scenario: Prefetching Hints
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(10)), graphcat.stencil(moving_sum, radius=1)]
+        And adding links [("A", "B")]
+        And prefetching task "B" with extent graphcat.ArrayExtent[3:5]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[3:5]]
+        Then tasks [] are executed
+        And the numpy outputs should be [[9, 12]]
+        When prefetching task "B" with extent graphcat.ArrayExtent[5:7]
+        And the task "A" function is changed to graphcat.array(numpy.ones(10))
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[5:7]]
+        Then tasks ["B", "A"] are executed
+        And the numpy outputs should be [[3, 3]]
+
+
+    Scenario: Equivalent Extents
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A"] with functions [graphcat.array(numpy.arange(10))]
+        And computing the task ["A"] outputs with extents [slice(None, 4)]
+        Then tasks ["A"] are executed
+        When computing the task ["A", "A", "A"] outputs with extents [slice(0, 4, 1), (slice(0, 4),), graphcat.ArrayExtent[:4]]
+        Then tasks [] are executed
+        And the numpy outputs should be [[0, 1, 2, 3], [0, 1, 2, 3], [0, 1, 2, 3]]
+
+
+    Scenario: Array Extent Operations
+        Then the extent graphcat.ArrayExtent[0:4] should equal graphcat.ArrayExtent[:4:1]
+        And the extent graphcat.ArrayExtent[..., -2:].normalize((3, 5)) should equal graphcat.ArrayExtent[0:3, 3:5]
+        And the extent graphcat.ArrayExtent[::-1].normalize(4) should equal graphcat.ArrayExtent[3::-1]
+        And the extent graphcat.ArrayExtent[0:4, 2].union(graphcat.ArrayExtent[6:8, 2]) should equal graphcat.ArrayExtent[0:8, 2]
+        And the extent graphcat.ArrayExtent[0:4, 1:3].intersection(graphcat.ArrayExtent[2:8]) should equal graphcat.ArrayExtent[2:4, 1:3]
+        And the extent graphcat.ArrayExtent[0:4].intersection(graphcat.ArrayExtent[4:8]) should equal None
+        And the extent {graphcat.ArrayExtent[0:4]: "A"}[graphcat.ArrayExtent[slice(None, 4)]] should equal "A"
+        And the extent graphcat.ArrayExtent[:4] should equal slice(0, 4)
+        And the extent graphcat.ArrayExtent[2:8].start should equal 2
+        And the extent graphcat.ArrayExtent[2:8].stop should equal 8
+        And the extent graphcat.ArrayExtent[2:8:2].step should equal 2
+
+
+    Scenario: Array Extents With Lists
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A"] with functions [graphcat.array([1, 2, 3, 4, 5])]
+        And computing the task ["A", "A"] outputs with extents [graphcat.ArrayExtent[1:3], graphcat.ArrayExtent[4]]
+        Then the outputs should be [[2, 3], 5]
+
+
+    Scenario: Incremental Sliding Windows
+        Given the numpy module is available
+        And an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(20)), incremental(graphcat.stencil(moving_sum, radius=1))]
+        And adding links [("A", "B")]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[0:8]]
+        Then tasks ["B", "A"] are executed with extents [slice(0, 8), slice(0, 9)]
+        When computing the task ["B"] outputs with extents [graphcat.ArrayExtent[2:10]]
+        Then tasks ["B", "A"] are executed with extents [slice(2, 10), slice(7, 11)]
+        And the numpy outputs should be [[6, 9, 12, 15, 18, 21, 24, 27]]
+        When computing the task ["B"] outputs with extents [graphcat.ArrayExtent[1:9]]
+        Then tasks ["B", "A"] are executed with extents [slice(1, 9), slice(0, 3)]
+        And the numpy outputs should be [[3, 6, 9, 12, 15, 18, 21, 24]]
+        When computing the task ["B"] outputs with extents [graphcat.ArrayExtent[12:16]]
+        Then tasks ["B", "A"] are executed with extents [slice(12, 16), slice(11, 17)]
+        And the numpy outputs should be [[36, 39, 42, 45]]
+
+
+    Scenario: Dirty Region Invalidation
+        Given the numpy module is available
+        And an empty streaming graph
+        And a metrics collector
+        When adding tasks ["A", "B", "C"] with functions [graphcat.array(numpy.arange(20)), graphcat.stencil(moving_sum, radius=1), graphcat.evaluate("inputs.getone(None, extent) * 2")]
+        And adding links [("A", "B"), ("B", "C")]
+        And computing the task ["C"] outputs with extents [graphcat.ArrayExtent[0:8]]
+        Then the numpy outputs should be [[2, 6, 12, 18, 24, 30, 36, 42]]
+        When tasks ["A"] are marked unfinished in extent graphcat.ArrayExtent[10:12]
+        Then the task ["A", "B", "C"] state is finished
+        When tasks ["A"] are marked unfinished in extent graphcat.ArrayExtent[8:9]
+        Then the task ["A", "B", "C"] state is unfinished
+        And the metrics collector invalidations should be {"A": 1, "B": 1, "C": 1}
+        When computing the task ["C"] outputs with extents [graphcat.ArrayExtent[0:8]]
+        Then tasks ["C", "B", "A"] are executed
+        When tasks ["A"] are marked unfinished in extent None
+        Then the task ["A", "B", "C"] state is unfinished
+
+
+    Scenario: Dirty Region Invalidation With Unmapped Regions
+        Given the numpy module is available
+        And an empty streaming graph
+        And a metrics collector
+        When adding tasks ["A", "B"] with functions [graphcat.array(numpy.arange(20)), graphcat.stencil(moving_sum, radius=1)]
+        And adding links [("A", "B")]
+        And computing the task ["B"] outputs with extents [graphcat.ArrayExtent[0:8]]
+        And tasks ["A"] are marked unfinished in extent graphcat.ArrayExtent[3]
+        Then the task ["A", "B"] state is unfinished
+        And the metrics collector invalidations should be {"A": 1, "B": 1}
+
+
+    Scenario: Dirty Region Invalidation With Other Extents
+        Given an empty streaming graph
+        When adding tasks ["A", "B"] with functions [graphcat.constant(1), graphcat.passthrough()]
+        And adding links [("A", "B")]
+        And computing the task ["B"] outputs with extents ["2023-01"]
+        When tasks ["A"] are marked unfinished in extent "2023-02"
+        Then the task ["A", "B"] state is unfinished
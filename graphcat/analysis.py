@@ -0,0 +1,122 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Functionality for analyzing the performance of computational graphs."""
+
+import collections
+
+import networkx
+
+
+CriticalPath = collections.namedtuple("CriticalPath", ["path", "length", "slack", "work", "speedup"])
+CriticalPath.__doc__ = """Results returned by :func:`critical_path`.
+
+path
+    List of task names on the critical path, ordered from the most upstream
+    task to the target.
+length
+    Total time in seconds for the tasks on the critical path, which is the
+    minimum possible time to update the target, no matter how many tasks
+    execute in parallel.
+slack
+    :class:`dict` mapping every task that the target depends on to the time
+    in seconds that it could be delayed without delaying the target.  Tasks
+    on the critical path have zero slack.
+work
+    Total time in seconds for every task that the target depends on, which
+    is the time to update the target serially.
+speedup
+    Best possible parallel speedup, `work` divided by `length`.
+"""
+
+
+def _durations(timings):
+    # Accept a PerformanceMonitor, or a dict mapping task names to times.
+    if hasattr(timings, "statistics"):
+        return {name: statistics.mean for name, statistics in timings.statistics(exclusive=True).items()}
+    return {name: times[-1] if isinstance(times, (list, tuple)) else times for name, times in timings.items()}
+
+
+def critical_path(graph, name, timings):
+    """Find the tasks that limit the time required to update a task.
+
+    Given execution times for each task, computes the critical path - the
+    longest chain of dependencies leading to task `name` - along with the
+    slack for every task and the best possible speedup from executing
+    independent tasks in parallel.  Improving the performance of tasks on the
+    critical path is the only way to reduce the end-to-end time to update
+    `name`.
+
+    Parameters
+    ----------
+    graph: :class:`graphcat.graph.Graph`, required
+        The graph to be analyzed.
+    name: hashable object, required
+        Name of the target task.
+    timings: :class:`graphcat.common.PerformanceMonitor` or :class:`dict`, required
+        Execution times for each task.  If a performance monitor is
+        supplied, the mean exclusive time for each task is used, so that
+        nested task executions in dynamic and streaming graphs aren't counted
+        twice.  Otherwise, `timings` must map task names to times in seconds,
+        or lists of times, in which case the most recent time is used.  Tasks
+        without timings are assumed to take zero time.
+
+    Returns
+    -------
+    analysis: :class:`CriticalPath`
+        The critical path, slack, and speedup for task `name`.
+
+    Raises
+    ------
+    :class:`ValueError`
+        If task `name` doesn't exist, or if it depends on a cycle.
+    """
+    graph._require_task_present(name)
+    durations = _durations(timings)
+
+    # Edges point from tasks to their dependencies.
+    subgraph = graph._graph.subgraph(networkx.descendants(graph._graph, name) | {name})
+    try:
+        order = list(networkx.topological_sort(subgraph))
+    except networkx.NetworkXUnfeasible:
+        raise ValueError(f"Task {name!r} depends on a cycle.")
+
+    duration = {task: durations.get(task, 0.0) for task in order}
+
+    # Earliest finish time for each task, working from upstream tasks to the target.
+    finish = {}
+    for task in reversed(order):
+        finish[task] = duration[task] + max((finish[dependency] for dependency in subgraph.successors(task)), default=0.0)
+
+    # Latest finish time for each task that doesn't delay the target, working from the target upstream.
+    latest = {name: finish[name]}
+    for task in order:
+        for dependency in subgraph.successors(task):
+            latest[dependency] = min(latest.get(dependency, finish[name]), latest[task] - duration[task])
+
+    path = [name]
+    while True:
+        dependencies = list(subgraph.successors(path[-1]))
+        if not dependencies:
+            break
+        path.append(max(dependencies, key=lambda dependency: finish[dependency]))
+    path.reverse()
+
+    length = finish[name]
+    work = sum(duration.values())
+    slack = {task: max(0.0, latest[task] - finish[task]) for task in order}
+    speedup = work / length if length > 0 else 1.0
+
+    return CriticalPath(path=path, length=length, slack=slack, work=work, speedup=speedup)
@@ -16,10 +16,23 @@
 """
 
 import collections
+import collections.abc
+import cProfile
+import concurrent.futures
 import enum
 import functools
+import gzip
+import itertools
+import json
 import logging
+import operator
+import os
+import pstats
+import random
+import sys
+import threading
 import time
+import types
 import warnings
 
 import networkx
@@ -50,14 +63,14 @@ class Array(object):
         self._value = value
 
     def __call__(self, graph, name, inputs, extent=None):
-        return self._value[extent] if extent is not None else self._value
+        return _index(self._value, extent) if extent is not None else self._value
 
     def __eq__(self, other):
-        return type(self) is type(other) and numpy.all(self._value == other._value)
+        return type(self) is type(other) and numpy.array_equal(self._value, other._value)
 
 
-class ArrayExtent(object):
-    """Helper for creating :class:`Array` compatible streaming extents.
+class ArrayExtent(tuple):
+    """Canonical, hashable streaming extent compatible with :class:`Array`.
 
     To generate extents, use any numpy-compatible
     `indexing notation <https://numpy.org/doc/stable/reference/arrays.indexing.html>`_::
@@ -67,10 +80,277 @@ class ArrayExtent(object):
         extent = ArrayExtent[:, 0]
         ...
 
-    These extents are compatible with :class:`Array`.
+    Extents are tuples that can be used directly to index NumPy arrays, so
+    they're compatible with :class:`Array` and any other task function that
+    applies its extent with ``value[extent]``.  Unlike plain slices, extents
+    are stored in a canonical form, so equivalent extents such as
+    ``ArrayExtent[0:10]`` and ``ArrayExtent[:10:1]`` compare equal and have
+    the same hash.  Use :meth:`normalize` to resolve negative and missing
+    bounds against an array shape.
+
+    Note
+    ----
+    Earlier versions of Graphcat returned the slice or tuple passed to
+    ``ArrayExtent[...]`` unchanged.  For compatibility, one-dimensional
+    extents compare equal to the slice or integer they contain, provide the
+    :attr:`start`, :attr:`stop`, and :attr:`step` attributes of a slice, and
+    are unwrapped by :class:`Array` and :class:`MemoryMap`, so they can still
+    be used with Python sequences such as lists.  Task functions that index
+    sequences other than NumPy arrays should use ``value[extent[0]]``.
+
+    Only slices, integers, and ``...`` are supported; indexing with any
+    other type of object (for example, lists of indices) returns the object
+    unchanged.
     """
+    def __new__(cls, key):
+        if isinstance(key, list) and not all(isinstance(item, slice) for item in key):
+            raise TypeError(f"Unsupported extent {key!r}.")
+        items = key if isinstance(key, (tuple, list)) else (key,)
+        return super().__new__(cls, (cls._canonical_item(item) for item in items))
+
     def __class_getitem__(cls, key):
-        return key
+        try:
+            return cls(key)
+        except TypeError:
+            return key
+
+    def __eq__(self, other):
+        # One-dimensional extents compare equal to the slice or index they contain.
+        if isinstance(other, slice) or (isinstance(other, int) and not isinstance(other, bool)):
+            return len(self) == 1 and self[0] == self._canonical_item(other)
+        return super().__eq__(other)
+
+    def __hash__(self):
+        return hash(tuple((item.start, item.stop, item.step) if isinstance(item, slice) else item for item in self))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        def format(item):
+            if item is Ellipsis:
+                return "..."
+            if isinstance(item, slice):
+                text = f"{'' if item.start is None else item.start}:{'' if item.stop is None else item.stop}"
+                return text if item.step is None else f"{text}:{item.step}"
+            return repr(item)
+        return f"ArrayExtent[{', '.join(format(item) for item in self)}]"
+
+    @staticmethod
+    def _canonical_item(item):
+        if item is Ellipsis:
+            return item
+        if isinstance(item, slice):
+            start, stop, step = (None if bound is None else operator.index(bound) for bound in (item.start, item.stop, item.step))
+            if step == 0:
+                raise ValueError("Extent slice step cannot be zero.")
+            if step is None or step > 0:
+                start = 0 if start is None else start
+            return slice(start, stop, None if step == 1 else step)
+        if isinstance(item, bool):
+            raise TypeError(f"Unsupported extent item {item!r}.")
+        return operator.index(item)
+
+    def _bounds(self, other):
+        # Pad both extents to the same length, and check that they only contain unit-stride slices and integers.
+        count = max(len(self), len(other))
+        a = tuple(self) + (slice(0, None),) * (count - len(self))
+        b = tuple(other) + (slice(0, None),) * (count - len(other))
+        for x, y in zip(a, b):
+            if isinstance(x, slice) != isinstance(y, slice) or x is Ellipsis or y is Ellipsis:
+                raise ValueError(f"Can't combine extents {self!r} and {other!r}.")
+            if isinstance(x, slice) and (x.step is not None or y.step is not None or x.start < 0 or y.start < 0 or (x.stop or 0) < 0 or (y.stop or 0) < 0):
+                raise ValueError(f"Can't combine extents {self!r} and {other!r}; normalize them first.")
+        return zip(a, b)
+
+    def _slice(self):
+        if len(self) != 1 or not isinstance(self[0], slice):
+            raise AttributeError(f"{self!r} isn't a one-dimensional slice extent.")
+        return self[0]
+
+    @classmethod
+    def canonical(cls, extent):
+        """Convert an extent to canonical form, if possible.
+
+        Parameters
+        ----------
+        extent: hashable object, required
+            Any streaming extent.
+
+        Returns
+        -------
+        extent: :class:`ArrayExtent` or hashable object
+            An :class:`ArrayExtent` if `extent` is a slice, or a tuple or list
+            of slices, integers, and ``...``.  Otherwise, `extent` is returned
+            unchanged.
+        """
+        if isinstance(extent, cls) or not isinstance(extent, (slice, tuple, list)):
+            return extent
+        try:
+            return cls(extent)
+        except TypeError:
+            return extent
+
+    def intersection(self, other):
+        """Return the region shared by two extents.
+
+        Both extents must contain only unit-stride slices and integers, with
+        non-negative bounds; use :meth:`normalize` first if necessary.
+
+        Parameters
+        ----------
+        other: :class:`ArrayExtent`, required
+            Extent to intersect with this one.
+
+        Returns
+        -------
+        intersection: :class:`ArrayExtent` or :any:`None`
+            The extent shared by both extents, or :any:`None` if they don't
+            overlap.
+        """
+        result = []
+        for x, y in self._bounds(ArrayExtent(other)):
+            if isinstance(x, slice):
+                start = max(x.start, y.start)
+                stop = x.stop if y.stop is None else y.stop if x.stop is None else min(x.stop, y.stop)
+                if stop is not None and stop <= start:
+                    return None
+                result.append(slice(start, stop))
+            elif x != y:
+                return None
+            else:
+                result.append(x)
+        return ArrayExtent(tuple(result))
+
+    def normalize(self, shape):
+        """Resolve an extent against the shape of an array.
+
+        ``...`` is expanded, negative indices and bounds are converted to
+        non-negative values, bounds are clipped to the array, and trailing
+        dimensions are made explicit.  Extents that select the same elements
+        from an array with the given shape normalize to the same value.
+
+        Parameters
+        ----------
+        shape: :class:`int` or :class:`tuple` of :class:`int`, required
+            Shape of the array to which the extent will be applied.
+
+        Returns
+        -------
+        extent: :class:`ArrayExtent`
+            Normalized extent, with one item per dimension in `shape`.
+
+        Raises
+        ------
+        :class:`IndexError`
+            If the extent has too many items or an integer index is out of bounds.
+        """
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        items = list(self)
+        if Ellipsis in items:
+            index = items.index(Ellipsis)
+            items[index:index+1] = [slice(None)] * (len(shape) - len(items) + 1)
+        if len(items) > len(shape):
+            raise IndexError(f"Extent {self!r} has too many items for shape {shape}.")
+        items += [slice(None)] * (len(shape) - len(items))
+
+        result = []
+        for item, length in zip(items, shape):
+            if isinstance(item, slice):
+                start, stop, step = item.indices(length)
+                if step > 0:
+                    stop = max(start, stop)
+                elif stop < 0:
+                    stop = None
+                result.append(slice(start, stop, step))
+            else:
+                if not -length <= item < length:
+                    raise IndexError(f"Index {item} is out of bounds for axis with size {length}.")
+                result.append(item % length)
+        return ArrayExtent(tuple(result))
+
+    @property
+    def start(self):
+        """Start of a one-dimensional slice extent, for compatibility with :class:`slice`."""
+        return self._slice().start
+
+    @property
+    def step(self):
+        """Step of a one-dimensional slice extent, for compatibility with :class:`slice`."""
+        return self._slice().step
+
+    @property
+    def stop(self):
+        """Stop of a one-dimensional slice extent, for compatibility with :class:`slice`."""
+        return self._slice().stop
+
+    @staticmethod
+    def tiles(shape, size):
+        """Generate extents that divide an array into fixed-size tiles.
+
+        Use this with :meth:`graphcat.streaming.StreamingGraph.iter_output` to
+        process an array one chunk at a time::
+
+            for extent, chunk in graph.iter_output("image", ArrayExtent.tiles((4096, 4096), (512, 512))):
+                ...
+
+        Parameters
+        ----------
+        shape: :class:`int` or :class:`tuple` of :class:`int`, required
+            Shape of the array to be divided.
+        size: :class:`int` or :class:`tuple` of :class:`int`, required
+            Size of each tile, which must have the same number of dimensions
+            as `shape`.  An integer size is used for every dimension.  Tiles
+            along the upper edges of the array are truncated to fit.
+
+        Returns
+        -------
+        extents: generator of :class:`ArrayExtent`
+            Tile extents, in row-major (C) order.
+        """
+        shape = (shape,) if isinstance(shape, int) else tuple(shape)
+        size = (size,) * len(shape) if isinstance(size, int) else tuple(size)
+        if len(shape) != len(size):
+            raise ValueError(f"Tile size {size} doesn't match array shape {shape}.")
+        if any(count < 1 for count in size):
+            raise ValueError(f"Tile size {size} must be positive.")
+
+        starts = [range(0, length, count) for length, count in zip(shape, size)]
+        for corner in itertools.product(*starts):
+            yield ArrayExtent(tuple(slice(start, min(start + count, length)) for start, count, length in zip(corner, size, shape)))
+
+    def union(self, other):
+        """Return the smallest extent that contains two extents.
+
+        Both extents must contain only unit-stride slices and integers, with
+        non-negative bounds; use :meth:`normalize` first if necessary.
+
+        Parameters
+        ----------
+        other: :class:`ArrayExtent`, required
+            Extent to combine with this one.
+
+        Returns
+        -------
+        union: :class:`ArrayExtent`
+            Bounding extent containing both extents.
+
+        Raises
+        ------
+        :class:`ValueError`
+            If the extents can't be combined, such as when they contain
+            different integer indices.
+        """
+        result = []
+        for x, y in self._bounds(ArrayExtent(other)):
+            if isinstance(x, slice):
+                result.append(slice(min(x.start, y.start), None if x.stop is None or y.stop is None else max(x.stop, y.stop)))
+            elif x != y:
+                raise ValueError(f"Can't combine extents {self!r} and {other!r}.")
+            else:
+                result.append(x)
+        return ArrayExtent(tuple(result))
 
 
 class Constant(object):
@@ -124,6 +404,36 @@ class DeprecationWarning(Warning):
     pass
 
 
+class FrozenDict(collections.abc.Mapping):
+    """Read-only mapping used by :func:`freeze` to freeze dicts.
+
+    Unlike :class:`types.MappingProxyType`, instances can be pickled, so
+    frozen outputs can be saved in snapshots and sent to worker processes.
+
+    Parameters
+    ----------
+    items: mapping or iterable of key-value pairs, optional
+        Contents of the mapping.
+    """
+    def __init__(self, items=()):
+        self._items = dict(items)
+
+    def __getitem__(self, key):
+        return self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __reduce__(self):
+        return (type(self), (self._items,))
+
+    def __repr__(self):
+        return f"FrozenDict({self._items!r})"
+
+
 class Input(enum.Enum):
     """Enumerates special :class:`graphcat.graph.Graph` named inputs."""
     IMPLICIT = 1
@@ -204,6 +514,183 @@ class Logger(object):
         self._log.info(message)
 
 
+class MemoryMap(object):
+    """Task function callable that returns a memory-mapped array.
+
+    The underlying file is opened lazily the first time the task executes, and
+    streaming extents are applied to the resulting :class:`numpy.memmap`
+    without copying, so only the pages touched by a consumer are ever read from
+    disk.
+
+    Parameters
+    ----------
+    path: :class:`str`, required
+        Path to the file to be mapped.  Files with a ``.npy`` extension are
+        opened using :func:`numpy.load`, which reads `dtype` and `shape` from
+        the file header, so `dtype`, `shape`, and `offset` are ignored.
+    dtype: :class:`numpy.dtype` convertable object, optional
+        Data type of the array elements.  Required for raw (non ``.npy``) files.
+    shape: :class:`tuple`, optional
+        Shape of the array.  If :any:`None` (the default), raw files are mapped
+        as one-dimensional arrays.
+    offset: :class:`int`, optional
+        Offset in bytes from the beginning of a raw file to the array data.
+    mode: :class:`str`, optional
+        File access mode.  Defaults to ``"r"`` (read-only).  Use ``"c"`` for
+        copy-on-write access.
+
+    See Also
+    --------
+    :func:`memmap` - factory function for :class:`MemoryMap` instances.
+    """
+    def __init__(self, path, dtype=None, shape=None, offset=0, mode="r"):
+        self._npy = str(path).endswith(".npy")
+        if dtype is None and not self._npy:
+            raise ValueError("dtype is required for raw memory-mapped files.")
+        self._path = path
+        self._dtype = dtype
+        self._shape = shape
+        self._offset = offset
+        self._mode = mode
+        self._array = None
+
+    def __call__(self, graph, name, inputs, extent=None):
+        if self._array is None:
+            if self._npy:
+                self._array = numpy.load(self._path, mmap_mode=self._mode)
+            else:
+                self._array = numpy.memmap(self._path, dtype=self._dtype, mode=self._mode, shape=self._shape, offset=self._offset)
+        return _index(self._array, extent) if extent is not None else self._array
+
+    def __eq__(self, other):
+        return type(self) is type(other) and (self._path, self._dtype, self._shape, self._offset, self._mode) == (other._path, other._dtype, other._shape, other._offset, other._mode)
+
+    def __getstate__(self):
+        # Never pickle the mapping itself, which would copy the entire array.
+        state = dict(self.__dict__)
+        state["_array"] = None
+        return state
+
+
+class MemoryMonitor(object):
+    """Tracks the memory used by graph task outputs.
+
+    Every time a task finishes executing, the size of its output is estimated
+    using :func:`sizeof` and recorded.  The monitor also keeps track of the
+    total size of the outputs currently stored by the graph, and the peak
+    total since the monitor was created / reset.  Objects and array buffers
+    that are shared by more than one output are only counted once, and
+    outputs that aren't stored by the graph (such as the results of
+    :meth:`graphcat.streaming.StreamingGraph.iter_output` pipelines) don't
+    contribute to the total.
+
+    Parameters
+    ----------
+    graph: :class:`graphcat.graph.Graph`, required
+        Graph whose output sizes will be monitored.
+    """
+    def __init__(self, graph):
+        self._lock = threading.Lock()
+        self._resident = {}
+        self._holders = {}
+        self._total = 0
+        for name, output in graph._graph.nodes(data="output"):
+            if output is not None:
+                self._store(name, _buffers(output))
+        self.reset()
+        graph.on_changed.connect(self._on_changed)
+        graph.on_failed.connect(self._on_failed)
+        graph.on_finished.connect(self._on_finished)
+
+
+    def _discard(self, name):
+        # Shared buffers are counted once, using the largest size reported by any task that holds them.
+        for key in self._resident.pop(name, {}):
+            holders = self._holders[key]
+            before = max(holders.values())
+            del holders[name]
+            if not holders:
+                del self._holders[key]
+            self._total -= before - max(holders.values(), default=0)
+
+
+    def _on_changed(self, graph):
+        with self._lock:
+            for name in list(self._resident):
+                if name not in graph._graph or graph._graph.nodes[name]["output"] is None:
+                    self._discard(name)
+
+
+    def _on_failed(self, graph, name, exception):
+        with self._lock:
+            self._discard(name)
+
+
+    def _on_finished(self, graph, name, output):
+        buffers = _buffers(output)
+        stored = name in graph._graph and graph._graph.nodes[name]["output"] is output
+        with self._lock:
+            self._tasks[name].append(sum(buffers.values()))
+            if stored:
+                self._discard(name)
+                self._store(name, buffers)
+                self._peak = max(self._peak, self._total)
+
+
+    def _store(self, name, buffers):
+        self._resident[name] = buffers
+        for key, size in buffers.items():
+            holders = self._holders.setdefault(key, {})
+            before = max(holders.values(), default=0)
+            holders[name] = size
+            self._total += max(before, size) - before
+
+
+    @property
+    def peak(self):
+        """Largest total output size since this object was created / reset.
+
+        Returns
+        -------
+        peak: :class:`int`
+            Peak size of all task outputs stored by the graph, in bytes.
+        """
+        return self._peak
+
+
+    def reset(self):
+        """Clear output size data, and reset the peak to the current resident size."""
+        with self._lock:
+            self._tasks = collections.defaultdict(list)
+            self._peak = self._total
+
+
+    @property
+    def resident(self):
+        """Total size of the task outputs currently stored by the graph.
+
+        Returns
+        -------
+        resident: :class:`int`
+            Size of all task outputs, in bytes.
+        """
+        return self._total
+
+
+    @property
+    def tasks(self):
+        """Graph task output sizes since this object was created / reset.
+
+        Returns
+        -------
+        tasks: :class:`dict` containing :class:`list` values.
+            Maps the name of every task that has been executed to a list
+            containing output sizes in bytes.
+        """
+        with self._lock:
+            return {name: list(sizes) for name, sizes in self._tasks.items()}
+
+
 class Passthrough(object):
     """Task function callable that always returns an upstream input.
 
@@ -231,12 +718,37 @@ class Passthrough(object):
 class PerformanceMonitor(object):
     """Tracks the performance of graph tasks as they're executed.
 
+    Execution times are measured using :func:`time.perf_counter_ns`.  Tasks
+    in :class:`graphcat.dynamic.DynamicGraph` and
+    :class:`graphcat.streaming.StreamingGraph` often execute while another
+    task is executing, when the outer task requests its inputs.  The monitor
+    keeps a separate stack of timers for each thread, so it can report both
+    the inclusive time for each task (including any nested tasks), and the
+    exclusive time (excluding nested tasks).
+
+    Per-task statistics returned by :meth:`statistics` are accumulated
+    incrementally, with percentiles estimated from a fixed-size random
+    sample, so they use bounded memory no matter how many times a task
+    executes.
+
     Parameters
     ----------
     graph: :class:`graphcat.graph.Graph`, required
         Graph whose performance will be monitored.
+    history: :class:`int`, optional
+        Maximum number of recent execution times to keep for each task in
+        :attr:`tasks`, :attr:`inclusive`, and :attr:`exclusive`.  Defaults
+        to 1024.  Use :any:`None` to keep every execution time, which uses
+        memory proportional to the number of executions.
+    samples: :class:`int`, optional
+        Number of execution times sampled for each task to estimate
+        percentiles.  Defaults to 1024.
     """
-    def __init__(self, graph):
+    def __init__(self, graph, history=1024, samples=1024):
+        self._history = history
+        self._samples = samples
+        self._lock = threading.Lock()
+        self._random = random.Random()
         self.reset()
         graph.on_execute.connect(self._on_execute)
         graph.on_failed.connect(self._on_failed)
@@ -244,33 +756,281 @@ class PerformanceMonitor(object):
 
 
     def _on_execute(self, graph, name, inputs, extent=None):
-        self._start = time.time()
+        self._stack.push(name)
 
 
     def _on_failed(self, graph, name, exception):
-        self._tasks[name].append(time.time() - self._start) # pragma: no cover
+        self._stop(name)
 
 
     def _on_finished(self, graph, name, output):
-        self._tasks[name].append(time.time() - self._start)
+        self._stop(name)
+
+
+    def _stop(self, name):
+        times = self._stack.pop(name)
+        if times is None:
+            return
+        inclusive, exclusive, _ = times
+        with self._lock:
+            self._inclusive[name].add(inclusive, self._random)
+            self._exclusive[name].add(exclusive, self._random)
+
+
+    @property
+    def exclusive(self):
+        """Graph task exclusive execution times since this object was created / reset.
+
+        Exclusive times don't include the time spent executing nested tasks.
+
+        Returns
+        -------
+        tasks: :class:`dict` containing :class:`list` values.
+            Maps the name of every task that has been executed to a list
+            containing execution times in seconds.
+        """
+        with self._lock:
+            return {name: timings.times() for name, timings in self._exclusive.items()}
+
+
+    @property
+    def inclusive(self):
+        """Graph task inclusive execution times since this object was created / reset.
+
+        Inclusive times include the time spent executing nested tasks.
+
+        Returns
+        -------
+        tasks: :class:`dict` containing :class:`list` values.
+            Maps the name of every task that has been executed to a list
+            containing execution times in seconds.
+        """
+        with self._lock:
+            return {name: timings.times() for name, timings in self._inclusive.items()}
 
 
     def reset(self):
         """Clear performance data."""
-        self._tasks = collections.defaultdict(list)
+        def timings():
+            return _Timings(self._history, self._samples)
+
+        with self._lock:
+            self._inclusive = collections.defaultdict(timings)
+            self._exclusive = collections.defaultdict(timings)
+        self._stack = _ExecutionStack()
+
+
+    def save(self, path):
+        """Save recorded execution times for later comparison.
+
+        Times are saved in a compact JSON format that can be compared with
+        other recordings using :mod:`graphcat.compare`.  If `path` ends with
+        ``.gz``, the file is compressed.  Task names are saved as JSON values,
+        so names should be strings, numbers, or tuples of them.
+
+        Parameters
+        ----------
+        path: :class:`str`, required
+            Path of the file to be written.
+        """
+        inclusive = self.inclusive
+        exclusive = self.exclusive
+        tasks = [{"name": _encode_name(name), "inclusive": inclusive[name], "exclusive": exclusive[name]} for name in inclusive]
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "wt") as stream:
+            json.dump({"format": "graphcat-performance", "version": 1, "tasks": tasks}, stream, separators=(",", ":"))
+
+
+    def statistics(self, exclusive=False):
+        """Summarize the execution times for each task.
+
+        Parameters
+        ----------
+        exclusive: :class:`bool`, optional
+            If :any:`True`, summarize exclusive times instead of inclusive
+            times.  Defaults to :any:`False`.
+
+        Returns
+        -------
+        statistics: :class:`dict` containing :class:`TaskStatistics` values.
+            Maps the name of every task that has been executed to its
+            statistics, with times in seconds.
+        """
+        with self._lock:
+            timings = self._exclusive if exclusive else self._inclusive
+            return {name: timing.statistics() for name, timing in timings.items()}
 
 
     @property
     def tasks(self):
         """Graph task execution times since this object was created / reset.
 
+        This is equivalent to :attr:`inclusive`.
+
         Returns
         -------
         tasks: :class:`dict` containing :class:`list` values.
             Maps the name of every task that has been updated to an array
             containing execution times.
         """
-        return dict(self._tasks)
+        return self.inclusive
+
+
+Plan = collections.namedtuple("Plan", ["tasks", "finished", "unestimated", "total", "critical"])
+Plan.__doc__ = """Description of the work required to update a task, returned by :meth:`graphcat.graph.Graph.plan`.
+
+tasks
+    List of the tasks that would execute, in execution order.
+finished
+    List of the tasks that are already finished, and wouldn't execute.
+unestimated
+    List of the tasks that would execute, but have no recorded timings.
+total
+    Estimated time in seconds to execute every task serially, or
+    :any:`None` if no timings were supplied.
+critical
+    Estimated time in seconds for the longest chain of dependent tasks,
+    which is the minimum time to update the task if independent tasks execute
+    in parallel, or :any:`None` if no timings were supplied.
+"""
+
+
+class Profiler(object):
+    """Captures function-level profiles of selected graph tasks as they're executed.
+
+    Each execution of a selected task is profiled using :mod:`cProfile`, and
+    the result is kept as a :class:`pstats.Stats` object.  Tasks that aren't
+    selected run without profiling overhead.  Like
+    :class:`PerformanceMonitor`, the profiler keeps a separate stack for each
+    thread, and profiling is suspended while nested tasks execute, so each
+    profile only contains the work done by its own task.
+
+    Python only allows one active profiler at a time; if a task can't be
+    profiled because some other profiler is active, that execution is
+    skipped.
+
+    Parameters
+    ----------
+    graph: :class:`graphcat.graph.Graph`, required
+        Graph whose tasks will be profiled.
+    names: hashable object, or list|set of hashable objects, optional
+        Names of the tasks to be profiled.
+    predicate: callable, optional
+        Function with signature fn(name) that returns :any:`True` for tasks
+        that should be profiled.  If neither `names` nor `predicate` are
+        specified, every task is profiled.
+    history: :class:`int`, optional
+        Maximum number of profiles to keep for each task.  If :any:`None` (the
+        default), every profile is kept.
+    """
+    def __init__(self, graph, names=None, predicate=None, history=None):
+        if names is not None and not isinstance(names, (list, set)):
+            names = [names]
+        self._names = None if names is None else set(names)
+        self._predicate = predicate
+        self._history = history
+        self._lock = threading.Lock()
+        self.reset()
+        graph.on_execute.connect(self._on_execute)
+        graph.on_failed.connect(self._on_failed)
+        graph.on_finished.connect(self._on_finished)
+
+
+    def _on_execute(self, graph, name, inputs, extent=None):
+        parent = self._stack.top()
+        if parent is not None:
+            parent.disable()
+
+        profile = None
+        if self._selected(name):
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError: # pragma: no cover
+                profile = None
+        self._stack.push(name, profile)
+
+
+    def _on_failed(self, graph, name, exception):
+        self._stop(name)
+
+
+    def _on_finished(self, graph, name, output):
+        self._stop(name)
+
+
+    def _selected(self, name):
+        if self._names is None and self._predicate is None:
+            return True
+        if self._names is not None and name in self._names:
+            return True
+        return self._predicate is not None and bool(self._predicate(name))
+
+
+    def _stop(self, name):
+        times = self._stack.pop(name)
+        if times is None:
+            return
+        _, _, profile = times
+        if profile is not None:
+            profile.disable()
+            with self._lock:
+                self._profiles[name].append(pstats.Stats(profile))
+
+        parent = self._stack.top()
+        if parent is not None:
+            try:
+                parent.enable()
+            except ValueError: # pragma: no cover
+                pass
+
+
+    @property
+    def profiles(self):
+        """Profiles captured since this object was created / reset.
+
+        Returns
+        -------
+        profiles: :class:`dict` containing :class:`list` values.
+            Maps the name of every profiled task to a list containing one
+            :class:`pstats.Stats` object for each execution.
+        """
+        with self._lock:
+            return {name: list(profiles) for name, profiles in self._profiles.items()}
+
+
+    def reset(self):
+        """Discard captured profiles."""
+        with self._lock:
+            self._profiles = collections.defaultdict(lambda: collections.deque(maxlen=self._history))
+        self._stack = _ExecutionStack()
+
+
+    def stats(self, name):
+        """Combine every captured profile for a task.
+
+        Parameters
+        ----------
+        name: hashable object, required
+            Name of a profiled task.
+
+        Returns
+        -------
+        stats: :class:`pstats.Stats`
+            Combined profile for every execution of the task, which can be
+            printed with :meth:`pstats.Stats.print_stats`, or saved with
+            :meth:`pstats.Stats.dump_stats`.
+
+        Raises
+        ------
+        :class:`KeyError`
+            If the task hasn't been profiled.
+        """
+        with self._lock:
+            profiles = list(self._profiles.get(name, []))
+        if not profiles:
+            raise KeyError(name)
+        return pstats.Stats().add(*profiles)
 
 
 class RaiseException(object):
@@ -297,6 +1057,154 @@ class RaiseException(object):
         return type(self) is type(other) and self._exception == other._exception
 
 
+class Reduce(object):
+    """Task function callable that reduces a streaming input in bounded memory.
+
+    The input is requested one chunk at a time using
+    :meth:`graphcat.streaming.NamedInputs.getone` with extents generated by
+    :meth:`ArrayExtent.tiles`, so only one chunk - plus a handful of partial
+    results - is held in memory at once.  Each chunk is passed to `partial`,
+    partial results are merged in order using `combine`, and the final result
+    is passed to `finalize` to produce the task output.
+
+    The extent requested from the reducer itself is ignored, since the output
+    summarizes the entire input.
+
+    Parameters
+    ----------
+    partial: callable, required
+        Called with each input chunk, returns a partial result.
+    combine: callable, required
+        Called with two partial results, returns their combination.
+    shape: :class:`int` or :class:`tuple` of :class:`int`, required
+        Shape of the input array.
+    chunks: :class:`int` or :class:`tuple` of :class:`int`, required
+        Shape of each chunk requested from the input.  An integer is used
+        for every dimension.
+    input: hashable object, optional
+        Name of the input to be reduced.  Defaults to :any:`None`.
+    finalize: callable, optional
+        Called with the combined result, returns the task output.  If
+        :any:`None` (the default), the combined result is returned unchanged.
+    workers: :class:`int`, optional
+        If specified, partial results are computed in parallel using a pool of
+        `workers` threads, while chunks are still requested one-at-a-time from
+        the calling thread.  Defaults to :any:`None`, which computes partial
+        results sequentially.
+
+    See Also
+    --------
+    :func:`reduce` - factory function for :class:`Reduce` instances.
+    """
+    def __init__(self, partial, combine, shape, chunks, input=None, finalize=None, workers=None):
+        self._partial = partial
+        self._combine = combine
+        self._shape = shape
+        self._chunks = chunks
+        self._input = input
+        self._finalize = finalize
+        self._workers = workers
+
+    def __call__(self, graph, name, inputs, extent=None):
+        chunks = (inputs.getone(self._input, tile) for tile in ArrayExtent.tiles(self._shape, self._chunks))
+
+        results = []
+        def combine(value):
+            results[:] = [self._combine(results[0], value)] if results else [value]
+
+        if self._workers is None:
+            for chunk in chunks:
+                combine(self._partial(chunk))
+        else:
+            # Limit the number of outstanding chunks, so memory use stays bounded.
+            pending = collections.deque()
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self._workers) as executor:
+                for chunk in chunks:
+                    pending.append(executor.submit(self._partial, chunk))
+                    while len(pending) > self._workers:
+                        combine(pending.popleft().result())
+                while pending:
+                    combine(pending.popleft().result())
+
+        if not results:
+            raise ValueError("Can't reduce an empty input.")
+        return self._finalize(results[0]) if self._finalize is not None else results[0]
+
+    def __eq__(self, other):
+        return type(self) is type(other) and (self._partial, self._combine, self._shape, self._chunks, self._input, self._finalize, self._workers) == (other._partial, other._combine, other._shape, other._chunks, other._input, other._finalize, other._workers)
+
+
+class Stencil(object):
+    """Task function callable that implements the streaming extent mapping protocol for neighborhood operations.
+
+    Neighborhood operations such as convolutions need input values from
+    outside the region they're computing.  :class:`Stencil` wraps a task
+    function so that its inputs are requested with every slice of the extent
+    grown by `radius`, and crops the wrapped function's output back to the
+    requested extent.  Similarly, dirty regions passed to
+    :meth:`graphcat.streaming.StreamingGraph.mark_unfinished` grow by
+    `radius` as they pass through the task.  The wrapped function must
+    return an output with the same shape as its inputs.
+
+    Parameters
+    ----------
+    fn: callable, required
+        The task function to be wrapped.
+    radius: :class:`int` or :class:`tuple` of :class:`int`, required
+        Number of additional elements required on either side of the
+        extent.  Use a tuple to specify a different radius for each axis.
+    input: hashable object, optional
+        Name of the input that requires additional elements.  If :any:`None`
+        (the default), every input is expanded.
+
+    See Also
+    --------
+    :func:`stencil` - factory function for :class:`Stencil` instances.
+    :class:`graphcat.streaming.StreamingGraph` - for a description of the extent mapping protocol.
+    """
+    def __init__(self, fn, radius, input=None):
+        self._fn = fn
+        self._radius = radius
+        self._input = input
+
+    def __call__(self, graph, name, inputs, extent=None):
+        return self._fn(graph=graph, name=name, inputs=inputs, extent=extent)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._fn == other._fn and self._radius == other._radius and self._input == other._input
+
+    def _slices(self, extent):
+        slices = extent if isinstance(extent, tuple) else (extent,)
+        radii = self._radius if isinstance(self._radius, tuple) else (self._radius,) * len(slices)
+        for index in slices:
+            if not isinstance(index, slice) or index.step not in (None, 1) or (index.start or 0) < 0 or (index.stop is not None and index.stop < 0):
+                raise ValueError(f"Stencil extents must contain non-negative slices, not {extent!r}.")
+        return slices, radii
+
+    def crop(self, output, extent):
+        slices, radii = self._slices(extent)
+        cropped = []
+        for index, radius in zip(slices, radii):
+            start = index.start or 0
+            offset = start - max(0, start - radius)
+            cropped.append(slice(offset, None if index.stop is None else offset + max(0, index.stop - start)))
+        return output[tuple(cropped) if isinstance(extent, tuple) else cropped[0]]
+
+    def map_dirty(self, extent, input):
+        # Changes to an input affect outputs within the same radius that the outputs depend on.
+        return self.map_extent(extent, input)
+
+    def map_extent(self, extent, input):
+        if self._input is not None and input != self._input:
+            return extent
+        slices, radii = self._slices(extent)
+        expanded = []
+        for index, radius in zip(slices, radii):
+            start = index.start or 0
+            expanded.append(slice(max(0, start - radius), None if index.stop is None else index.stop + radius))
+        return type(extent)(expanded) if isinstance(extent, tuple) else expanded[0]
+
+
 class TaskState(enum.Enum):
     """Enumerates :class:`graphcat.graph.Graph` task states.
 
@@ -315,6 +1223,133 @@ class TaskState(enum.Enum):
     """The task executed successfully during the last update."""
 
 
+TaskStatistics = collections.namedtuple("TaskStatistics", ["count", "total", "mean", "p50", "p95", "max"])
+TaskStatistics.__doc__ = """Summary of task execution times returned by :meth:`PerformanceMonitor.statistics`.
+
+Times are in seconds.  Percentiles are estimated from a random sample of
+execution times when a task has executed many times.
+"""
+
+
+class TraceRecorder(object):
+    """Records graph execution as a timeline that can be viewed in Perfetto or Chrome.
+
+    Create a :class:`TraceRecorder` to record every task execution as a
+    span, with the process and thread that executed it::
+
+        recorder = graphcat.TraceRecorder(graph)
+        graph.update("C")
+        recorder.write("trace.json")
+
+    Then open the file using https://ui.perfetto.dev or ``chrome://tracing``.
+    Spans are nested whenever a task executes while another task is
+    executing - for example, when a :class:`graphcat.dynamic.DynamicGraph`
+    task requests its inputs from inside its task function - and task
+    updates are recorded as instant events.
+
+    Events are stored as compact tuples with :func:`time.perf_counter_ns`
+    timestamps, and are only converted to the Chrome trace event format when
+    the trace is written, to minimize overhead while recording.
+
+    Parameters
+    ----------
+    graph: :class:`graphcat.graph.Graph`, required
+        Graph whose execution will be recorded.
+    updates: :class:`bool`, optional
+        If :any:`True` (the default), record an instant event each time a task
+        is updated.  Use :any:`False` to reduce the size of the trace.
+    """
+    def __init__(self, graph, updates=True):
+        self.reset()
+        if updates:
+            graph.on_update.connect(self._on_update)
+        graph.on_execute.connect(self._on_execute)
+        graph.on_failed.connect(self._on_failed)
+        graph.on_finished.connect(self._on_finished)
+
+
+    def _on_execute(self, graph, name, inputs, extent=None):
+        self._events.append(("B", name, os.getpid(), threading.get_ident(), time.perf_counter_ns(), extent))
+
+
+    def _on_failed(self, graph, name, exception):
+        self._events.append(("E", name, os.getpid(), threading.get_ident(), time.perf_counter_ns(), exception))
+
+
+    def _on_finished(self, graph, name, output):
+        self._events.append(("E", name, os.getpid(), threading.get_ident(), time.perf_counter_ns(), None))
+
+
+    def _on_update(self, graph, name):
+        self._events.append(("i", name, os.getpid(), threading.get_ident(), time.perf_counter_ns(), None))
+
+
+    def reset(self):
+        """Discard recorded events."""
+        self._events = []
+        self._origin = time.perf_counter_ns()
+        self._threads = {thread.ident: thread.name for thread in threading.enumerate()}
+
+
+    def trace(self):
+        """Return recorded events in Chrome trace event format.
+
+        Returns
+        -------
+        trace: :class:`dict`
+            Trace events, suitable for serialization as JSON.
+        """
+        threads = dict(self._threads)
+        threads.update({thread.ident: thread.name for thread in threading.enumerate()})
+
+        events = []
+        stacks = {}
+        for phase, name, pid, tid, timestamp, detail in list(self._events):
+            if (pid, tid) not in stacks:
+                stacks[(pid, tid)] = []
+                events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": threads.get(tid, str(tid))}})
+
+            # Tasks can finish without executing (e.g. prefetched streaming outputs), so record those as instants.
+            stack = stacks[(pid, tid)]
+            if phase == "B":
+                stack.append(name)
+            elif phase == "E":
+                if stack and stack[-1] == name:
+                    stack.pop()
+                else:
+                    phase = "I"
+
+            event = {"name": str(name), "ph": phase, "pid": pid, "tid": tid, "ts": (timestamp - self._origin) / 1000}
+            if phase == "i":
+                event.update(cat="update", s="t")
+            elif phase == "I":
+                event.update(ph="i", cat="finished", s="t")
+            else:
+                event.update(cat="execute")
+            if phase == "B" and detail is not None:
+                event["args"] = {"extent": repr(detail)}
+            if phase == "E" and detail is not None:
+                event["args"] = {"exception": repr(detail)}
+            events.append(event)
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+    def write(self, path):
+        """Write recorded events to a Chrome trace event JSON file.
+
+        Parameters
+        ----------
+        path: :class:`str` or file-like object, required
+            Path of the file to be written, or an open text stream.
+        """
+        if hasattr(path, "write"):
+            json.dump(self.trace(), path)
+        else:
+            with open(path, "w") as stream:
+                json.dump(self.trace(), stream)
+
+
 class UpdatedTasks(object):
     """Maintains a list of graph tasks that have been updated.
 
@@ -512,6 +1547,83 @@ def evaluate(code, symbols=None):
     return implementation
 
 
+def freeze(value):
+    """Return a read-only version of a task output.
+
+    NumPy arrays are returned as read-only views that share memory with the
+    original array, dicts are converted to read-only :class:`FrozenDict`
+    mappings, lists are converted to tuples, and sets to frozensets.  The
+    contents of containers are frozen recursively.  Other objects are returned
+    unchanged.
+
+    See Also
+    --------
+    :attr:`graphcat.graph.Graph.freeze_outputs` - automatically freezes task outputs.
+
+    Parameters
+    ----------
+    value: any Python object, required
+        The value to be frozen.
+
+    Returns
+    -------
+    frozen: any Python object
+        Read-only version of `value`.
+    """
+    if numpy is not None and isinstance(value, numpy.ndarray):
+        if value.flags.writeable:
+            value = value.view()
+            value.flags.writeable = False
+        return value
+    if isinstance(value, (dict, FrozenDict, types.MappingProxyType)):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)._make(freeze(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+@graphcat.require.loaded_module("numpy")
+def memmap(path, dtype=None, shape=None, offset=0, mode="r"):
+    """Factory for task functions that return memory-mapped arrays when executed.
+
+    This makes it possible to stream arrays that are much larger than
+    available memory through a :class:`graphcat.streaming.StreamingGraph`::
+
+        graph.add_task("raster", graphcat.memmap("raster.npy"))
+        tile = graph.output("raster", graphcat.ArrayExtent[0:512, 0:512])
+
+    Note
+    ----
+    This callable is designed to be compatible with :class:`ArrayExtent` extents
+    when used in a :class:`graphcat.streaming.StreamingGraph`.
+
+    Parameters
+    ----------
+    path: :class:`str`, required
+        Path to a ``.npy`` file, or a raw binary file.
+    dtype: :class:`numpy.dtype` convertable object, optional
+        Data type of the array elements.  Required for raw files, ignored for
+        ``.npy`` files.
+    shape: :class:`tuple`, optional
+        Shape of the array in a raw file.
+    offset: :class:`int`, optional
+        Offset in bytes to the array data in a raw file.
+    mode: :class:`str`, optional
+        File access mode, ``"r"`` (read-only, the default) or ``"c"`` (copy-on-write).
+
+    Returns
+    -------
+    fn: :class:`MemoryMap`
+        Task function that will return a :class:`numpy.memmap` view of the
+        requested extent when executed.
+    """
+    return MemoryMap(path, dtype=dtype, shape=shape, offset=offset, mode=mode)
+
+
 def null(graph, name, inputs, extent=None):
     """Task function that does nothing.
 
@@ -557,3 +1669,302 @@ def raise_exception(exception):
     """
     return RaiseException(exception)
 
+
+def reduce(partial, combine, shape, chunks, input=None, finalize=None, workers=None):
+    """Factory for task functions that reduce a streaming input in bounded memory.
+
+    For example, to compute the sum of the squares of a large array, 4096
+    elements at a time::
+
+        graph.set_task("sum", graphcat.common.reduce(lambda chunk: numpy.sum(chunk * chunk), operator.add, shape=len(data), chunks=4096))
+
+    Parameters
+    ----------
+    partial: callable, required
+        Called with each input chunk, returns a partial result.
+    combine: callable, required
+        Called with two partial results, returns their combination.
+    shape: :class:`int` or :class:`tuple` of :class:`int`, required
+        Shape of the input array.
+    chunks: :class:`int` or :class:`tuple` of :class:`int`, required
+        Shape of each chunk requested from the input.  An integer is used
+        for every dimension.
+    input: hashable object, optional
+        Name of the input to be reduced.  Defaults to :any:`None`.
+    finalize: callable, optional
+        Called with the combined result, returns the task output.
+    workers: :class:`int`, optional
+        Number of threads used to compute partial results in parallel.
+        Defaults to :any:`None`, which computes them sequentially.
+
+    Returns
+    -------
+    fn: :class:`Reduce`
+        Task function that reduces the input named `input`.
+    """
+    return Reduce(partial, combine, shape, chunks, input, finalize, workers)
+
+
+@graphcat.require.loaded_module("numpy")
+def reduce_count(shape, chunks, input=None, workers=None):
+    """Factory for task functions that count the elements in a streaming input.
+
+    See :func:`reduce` for a description of the parameters.
+    """
+    return Reduce(_count_partial, operator.add, shape, chunks, input, None, workers)
+
+
+@graphcat.require.loaded_module("numpy")
+def reduce_histogram(shape, chunks, bins=10, range=None, input=None, workers=None):
+    """Factory for task functions that compute the histogram of a streaming input.
+
+    Because the histogram is accumulated one chunk at a time, the bin edges
+    must be known in advance: either specify `range` along with the number of
+    bins, or pass a sequence of bin edges as `bins`.  See :func:`reduce` for a
+    description of the other parameters.
+
+    Returns
+    -------
+    fn: :class:`Reduce`
+        Task function that returns a (counts, edges) tuple, the same as
+        :func:`numpy.histogram`.
+    """
+    if numpy.ndim(bins) == 0 and range is None:
+        raise ValueError("Streaming histograms require a range or explicit bin edges.")
+    partial = _HistogramPartial(bins, range)
+    return Reduce(partial, operator.add, shape, chunks, input, partial.finalize, workers)
+
+
+@graphcat.require.loaded_module("numpy")
+def reduce_max(shape, chunks, input=None, workers=None):
+    """Factory for task functions that compute the maximum of a streaming input.
+
+    See :func:`reduce` for a description of the parameters.
+    """
+    return Reduce(numpy.max, numpy.maximum, shape, chunks, input, None, workers)
+
+
+@graphcat.require.loaded_module("numpy")
+def reduce_mean(shape, chunks, input=None, workers=None):
+    """Factory for task functions that compute the mean of a streaming input.
+
+    See :func:`reduce` for a description of the parameters.
+    """
+    return Reduce(_mean_partial, _mean_combine, shape, chunks, input, _mean_finalize, workers)
+
+
+@graphcat.require.loaded_module("numpy")
+def reduce_min(shape, chunks, input=None, workers=None):
+    """Factory for task functions that compute the minimum of a streaming input.
+
+    See :func:`reduce` for a description of the parameters.
+    """
+    return Reduce(numpy.min, numpy.minimum, shape, chunks, input, None, workers)
+
+
+@graphcat.require.loaded_module("numpy")
+def reduce_sum(shape, chunks, input=None, workers=None):
+    """Factory for task functions that compute the sum of a streaming input.
+
+    See :func:`reduce` for a description of the parameters.
+    """
+    return Reduce(numpy.sum, operator.add, shape, chunks, input, None, workers)
+
+
+def sizeof(value):
+    """Estimate the memory used by a Python object, in bytes.
+
+    NumPy arrays report their :attr:`numpy.ndarray.nbytes`, while other
+    objects are measured using :func:`sys.getsizeof`, recursing into the
+    contents of containers and the attributes of class instances.  Objects that
+    are referenced more than once are only counted once, as are arrays that
+    are views of the same underlying buffer.
+
+    Parameters
+    ----------
+    value: any Python object, required
+        The object to be measured.
+
+    Returns
+    -------
+    size: :class:`int`
+        Estimated size of `value` in bytes.
+    """
+    return sum(_buffers(value).values())
+
+
+def stencil(fn, radius, input=None):
+    """Factory for task functions that compute neighborhood operations on streaming extents.
+
+    For example, a three-element moving sum only needs one additional input
+    element on either side of the requested extent::
+
+        def moving_sum(graph, name, inputs, extent):
+            return numpy.convolve(inputs.getone(None), [1, 1, 1], mode="same")
+
+        graph.set_task("sum", graphcat.common.stencil(moving_sum, radius=1))
+
+    Parameters
+    ----------
+    fn: callable, required
+        The task function to be wrapped.
+    radius: :class:`int` or :class:`tuple` of :class:`int`, required
+        Number of additional elements required on either side of the extent.
+    input: hashable object, optional
+        Name of the input that requires additional elements.  If :any:`None`
+        (the default), every input is expanded.
+
+    Returns
+    -------
+    fn: :class:`Stencil`
+        Task function that requests expanded input extents from upstream
+        tasks and crops its output to the requested extent.
+    """
+    return Stencil(fn, radius, input)
+
+
+def _buffers(value):
+    # Map the identity of every object and array buffer used by a value to its size in bytes.
+    buffers = {}
+    seen = set()
+    stack = [value]
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+
+        if numpy is not None and isinstance(value, numpy.ndarray):
+            # Views of the same buffer are counted once, using the largest view.
+            root = value
+            while isinstance(root.base, numpy.ndarray):
+                root = root.base
+            buffers[id(root)] = max(buffers.get(id(root), 0), value.nbytes)
+            continue
+
+        buffers[id(value)] = sys.getsizeof(value)
+        if isinstance(value, dict):
+            stack.extend(value.keys())
+            stack.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset, collections.deque)):
+            stack.extend(value)
+        elif hasattr(value, "__dict__") and not isinstance(value, (type, types.ModuleType, types.FunctionType, types.MethodType)):
+            stack.append(value.__dict__)
+    return buffers
+
+
+def _count_partial(chunk):
+    return numpy.size(chunk)
+
+
+def _encode_name(name):
+    # JSON has no tuples, so nested names are stored as lists and converted back when loaded.
+    if isinstance(name, tuple):
+        return [_encode_name(item) for item in name]
+    if name is None or isinstance(name, (str, int, float, bool)):
+        return name
+    return repr(name)
+
+
+class _ExecutionStack(object):
+    """Per-thread stacks of executing tasks, used to measure nested task execution times."""
+    def __init__(self):
+        self._local = threading.local()
+
+    def pop(self, name):
+        """Return (inclusive, exclusive, data) for a task that stopped executing, with times in nanoseconds."""
+        end = time.perf_counter_ns()
+        stack = getattr(self._local, "stack", None)
+        # Tasks can finish without executing, e.g. when a streaming graph uses a prefetched output.
+        if not stack or stack[-1][0] != name:
+            return None
+        name, start, nested, data = stack.pop()
+        inclusive = end - start
+        if stack:
+            stack[-1][2] += inclusive
+        return inclusive, inclusive - nested, data
+
+    def push(self, name, data=None):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        stack.append([name, time.perf_counter_ns(), 0, data])
+
+    def top(self):
+        """Return the data for the task that is currently executing in this thread, if any."""
+        stack = getattr(self._local, "stack", None)
+        return stack[-1][3] if stack else None
+
+
+class _HistogramPartial(object):
+    def __init__(self, bins, range):
+        self._bins = bins
+        self._range = range
+
+    def __call__(self, chunk):
+        return numpy.histogram(chunk, bins=self._bins, range=self._range)[0]
+
+    def __eq__(self, other):
+        return type(self) is type(other) and numpy.array_equal(self._bins, other._bins) and self._range == other._range
+
+    def finalize(self, counts):
+        return counts, numpy.histogram_bin_edges([], bins=self._bins, range=self._range)
+
+
+def _index(value, extent):
+    # Sequences such as lists can't be indexed with tuples, so one-dimensional extents are unwrapped.
+    if isinstance(extent, ArrayExtent) and len(extent) == 1:
+        extent = extent[0]
+    return value[extent]
+
+
+def _mean_combine(a, b):
+    return a[0] + b[0], a[1] + b[1]
+
+
+def _mean_finalize(result):
+    return result[0] / result[1]
+
+
+def _mean_partial(chunk):
+    return numpy.sum(chunk), numpy.size(chunk)
+
+
+def _release_output(output):
+    # Shared memory blocks can only exist once graphcat.sharedmem has been imported.
+    sharedmem = sys.modules.get("graphcat.sharedmem")
+    if sharedmem is not None:
+        sharedmem.release(output)
+
+
+class _Timings(object):
+    """Bounded-memory accumulator for one task's execution times, in nanoseconds."""
+    def __init__(self, history, samples):
+        self._history = collections.deque(maxlen=history)
+        self._samples = samples
+        self._sample = []
+        self._count = 0
+        self._total = 0
+        self._max = 0
+
+    def add(self, duration, random):
+        self._history.append(duration)
+        self._count += 1
+        self._total += duration
+        self._max = max(self._max, duration)
+        # Reservoir sampling keeps a uniform random sample of every duration.
+        if len(self._sample) < self._samples:
+            self._sample.append(duration)
+        else:
+            index = random.randrange(self._count)
+            if index < self._samples:
+                self._sample[index] = duration
+
+    def statistics(self):
+        sample = sorted(self._sample)
+        def percentile(p):
+            return sample[min(len(sample) - 1, int(p * len(sample)))] * 1e-9
+        return TaskStatistics(self._count, self._total * 1e-9, self._total * 1e-9 / self._count, percentile(0.5), percentile(0.95), self._max * 1e-9)
+
+    def times(self):
+        return [duration * 1e-9 for duration in self._history]
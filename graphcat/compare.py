@@ -0,0 +1,242 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Detect performance regressions by comparing recorded runs.
+
+Record task execution times with :class:`graphcat.common.PerformanceMonitor`
+and save them with :meth:`graphcat.common.PerformanceMonitor.save`, then
+compare a baseline recording with a candidate recording from the command
+line::
+
+    $ python -m graphcat.compare baseline.json candidate.json
+
+Tasks are matched by name, and the timing distributions for each task are
+compared using the two-sided Mann-Whitney U test, which doesn't assume that
+execution times are normally distributed.  Tasks that became significantly
+slower or faster are reported, and the command exits with a nonzero status
+if any task became slower, so it can be used to fail a CI or canary
+pipeline.  Tasks need several executions in each recording for a change to
+be significant.
+"""
+
+import argparse
+import collections
+import gzip
+import json
+import math
+import statistics
+import sys
+
+
+Comparison = collections.namedtuple("Comparison", ["name", "status", "baseline", "candidate", "ratio", "p"])
+Comparison.__doc__ = """Comparison of one task between two recordings, returned by :func:`compare`.
+
+name
+    Task name.
+status
+    One of ``"slower"``, ``"faster"``, ``"unchanged"``, ``"added"`` (the task
+    only appears in the candidate), or ``"removed"`` (the task only appears
+    in the baseline).
+baseline
+    Median baseline execution time in seconds, or :any:`None`.
+candidate
+    Median candidate execution time in seconds, or :any:`None`.
+ratio
+    Candidate median divided by baseline median, or :any:`None`.
+p
+    Two-sided p-value from the Mann-Whitney U test, or :any:`None`.
+"""
+
+
+def _decode_name(name):
+    if isinstance(name, list):
+        return tuple(_decode_name(item) for item in name)
+    return name
+
+
+def compare(baseline, candidate, alpha=0.05, threshold=0.05):
+    """Compare two sets of task execution times.
+
+    Parameters
+    ----------
+    baseline: :class:`dict`, required
+        Maps task names to lists of baseline execution times, as returned by
+        :func:`load`.
+    candidate: :class:`dict`, required
+        Maps task names to lists of candidate execution times.
+    alpha: :class:`float`, optional
+        Significance level for the Mann-Whitney U test.  Defaults to 0.05.
+    threshold: :class:`float`, optional
+        Minimum relative change in median execution time that will be
+        reported, so that statistically significant but negligible changes
+        are ignored.  Defaults to 0.05 (five percent).
+
+    Returns
+    -------
+    comparisons: :class:`list` of :class:`Comparison`
+        One comparison for every task in either recording, sorted by name.
+    """
+    results = []
+    for name in sorted(set(baseline) | set(candidate), key=repr):
+        a = baseline.get(name)
+        b = candidate.get(name)
+        if not a or not b:
+            status = "removed" if a else "added"
+            results.append(Comparison(name, status, statistics.median(a) if a else None, statistics.median(b) if b else None, None, None))
+            continue
+
+        a_median = statistics.median(a)
+        b_median = statistics.median(b)
+        ratio = b_median / a_median if a_median > 0 else math.inf if b_median > 0 else 1.0
+        u, p = mann_whitney(a, b)
+        status = "unchanged"
+        if p < alpha:
+            if ratio > 1 + threshold:
+                status = "slower"
+            elif ratio < 1 - threshold:
+                status = "faster"
+        results.append(Comparison(name, status, a_median, b_median, ratio, p))
+    return results
+
+
+def load(path, exclusive=False):
+    """Load execution times saved with :meth:`graphcat.common.PerformanceMonitor.save`.
+
+    Parameters
+    ----------
+    path: :class:`str`, required
+        Path of the recording.  Files ending with ``.gz`` are decompressed.
+    exclusive: :class:`bool`, optional
+        If :any:`True`, load exclusive times instead of inclusive times.
+        Defaults to :any:`False`.
+
+    Returns
+    -------
+    times: :class:`dict` containing :class:`list` values.
+        Maps task names to lists of execution times in seconds.
+
+    Raises
+    ------
+    :class:`ValueError`
+        If `path` isn't a recording.
+    """
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as stream:
+        recording = json.load(stream)
+    if not isinstance(recording, dict) or recording.get("format") != "graphcat-performance":
+        raise ValueError(f"{path!r} isn't a graphcat performance recording.")
+    if recording.get("version") != 1:
+        raise ValueError(f"Unsupported recording version: {recording.get('version')!r}.")
+    key = "exclusive" if exclusive else "inclusive"
+    return {_decode_name(task["name"]): task[key] for task in recording["tasks"]}
+
+
+def main(args=None):
+    """Command line entry point.
+
+    Parameters
+    ----------
+    args: :class:`list` of :class:`str`, optional
+        Command line arguments.  If :any:`None` (the default),
+        :data:`sys.argv` is used.
+
+    Returns
+    -------
+    status: :class:`int`
+        1 if any task became significantly slower, otherwise 0.
+    """
+    parser = argparse.ArgumentParser(prog="python -m graphcat.compare", description="Compare task execution times between two recorded runs.")
+    parser.add_argument("baseline", help="Baseline recording.")
+    parser.add_argument("candidate", help="Candidate recording.")
+    parser.add_argument("--alpha", type=float, default=0.05, help="Significance level.  Default: %(default)s")
+    parser.add_argument("--all", action="store_true", help="Report every task, including unchanged tasks.")
+    parser.add_argument("--exclusive", action="store_true", help="Compare exclusive times instead of inclusive times.")
+    parser.add_argument("--threshold", type=float, default=0.05, help="Minimum relative change to report.  Default: %(default)s")
+    arguments = parser.parse_args(args)
+
+    results = compare(
+        load(arguments.baseline, exclusive=arguments.exclusive),
+        load(arguments.candidate, exclusive=arguments.exclusive),
+        alpha=arguments.alpha,
+        threshold=arguments.threshold,
+        )
+
+    def seconds(value):
+        return "-" if value is None else f"{value:.6f}s"
+
+    for result in results:
+        if result.status == "unchanged" and not arguments.all:
+            continue
+        ratio = "-" if result.ratio is None else f"{result.ratio:.3f}x"
+        p = "-" if result.p is None else f"{result.p:.4f}"
+        print(f"{result.status:<10} {result.name!r}: {seconds(result.baseline)} -> {seconds(result.candidate)} ({ratio}, p={p})")
+
+    slower = [result for result in results if result.status == "slower"]
+    print(f"{len(slower)} slower, {sum(result.status == 'faster' for result in results)} faster, {len(results)} tasks compared.")
+    return 1 if slower else 0
+
+
+def mann_whitney(a, b):
+    """Two-sided Mann-Whitney U test.
+
+    Uses the normal approximation with tie and continuity corrections, which
+    is accurate when each sample contains more than a handful of values.
+
+    Parameters
+    ----------
+    a: sequence of :class:`float`, required
+        First sample.
+    b: sequence of :class:`float`, required
+        Second sample.
+
+    Returns
+    -------
+    u: :class:`float`
+        The U statistic for `a`.
+    p: :class:`float`
+        Two-sided p-value for the hypothesis that the samples come from the
+        same distribution.
+    """
+    n1 = len(a)
+    n2 = len(b)
+    values = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+
+    # Assign average ranks to tied values.
+    ranks = [0.0] * len(values)
+    ties = 0
+    start = 0
+    while start < len(values):
+        end = start
+        while end + 1 < len(values) and values[end + 1][0] == values[start][0]:
+            end += 1
+        for index in range(start, end + 1):
+            ranks[index] = (start + end) / 2 + 1
+        count = end - start + 1
+        ties += count ** 3 - count
+        start = end + 1
+
+    r1 = sum(rank for rank, (value, sample) in zip(ranks, values) if sample == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))) if n > 1 else 0
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - mean) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
+
+
+if __name__ == "__main__": # pragma: no cover
+    sys.exit(main())
@@ -14,6 +14,11 @@
 
 """Functionality for drawing diagrams of computational graphs."""
 
+import collections
+import html
+
+import networkx
+
 import graphcat.optional
 import graphcat.require
 
@@ -21,8 +26,60 @@ import graphcat.require
 pygraphviz = graphcat.optional.module("pygraphviz")
 
 
+def _append_xlabel(node, label):
+    # Add an HTML label after any label that's already attached to the node,
+    # such as the times added by performance().
+    existing = node.attr.get("xlabel")
+    if existing:
+        if existing.startswith("<<") and existing.endswith(">>"):
+            existing = existing[1:-1]
+        elif not existing.startswith("<"):
+            existing = html.escape(existing)
+        label = f"{existing}<br/>{label}"
+    node.attr["xlabel"] = f"<{label}>"
+
+
 @graphcat.require.loaded_module("pygraphviz")
-def draw(graph, hide=None, rankdir="LR"):
+def critical_path(agraph, analysis):
+    """Highlight the critical path in a graph diagram.
+
+    Parameters
+    ----------
+    agraph: :class:`pygraphviz.AGraph`, required
+        Diagram originally created using :func:`draw`.
+    analysis: :class:`graphcat.analysis.CriticalPath`, required
+        Critical path analysis created using
+        :func:`graphcat.analysis.critical_path`.
+
+    Returns
+    -------
+    diagram: :class:`pygraphviz.AGraph`
+        Input diagram with the tasks and links on the critical path
+        highlighted, and each task labelled with its slack.  Slack is added
+        after existing labels, such as those added by :func:`performance`.
+    """
+    highlight = "#ff6600"
+    links = {(str(source), str(target)) for source, target in zip(analysis.path[:-1], analysis.path[1:])}
+
+    agraph = agraph.copy()
+    agraph.graph_attr["forcelabels"] = True
+    for name, slack in analysis.slack.items():
+        if not agraph.has_node(name):
+            continue
+        node = agraph.get_node(name)
+        if name in analysis.path:
+            node.attr["color"] = highlight
+            node.attr["penwidth"] = 3
+        _append_xlabel(node, f"<font color='black'>slack {slack:.4f}s</font>")
+    for edge in agraph.edges():
+        if (edge[0], edge[1]) in links:
+            edge.attr["color"] = highlight
+            edge.attr["penwidth"] = 3
+    return agraph
+
+
+@graphcat.require.loaded_module("pygraphviz")
+def draw(graph, hide=None, rankdir="LR", group=None, focus=None, radius=1):
     """Create a diagram of a computational graph.
 
     This is extremely useful for understanding and debugging computational
@@ -33,6 +90,14 @@ def draw(graph, hide=None, rankdir="LR"):
     The color of each box shows its state: white for unfinished tasks, red for
     tasks that are failed, and black for tasks that are finished.
 
+    Diagrams of graphs with thousands of tasks are slow to lay out and hard to
+    read.  Use `group` to collapse related tasks into a single node, and
+    `focus` to draw only the neighborhood around one task.  A group node is
+    labelled with the number of tasks it contains, and is red if any of its
+    tasks are failed, white if any are unfinished, or black if they're all
+    finished.  Links to and from group nodes are combined and labelled with
+    their count.
+
     Callers can customize the appearance of the graph by modifying the result
     before rendering it to an image or Jupyter notebook.
 
@@ -48,6 +113,18 @@ def draw(graph, hide=None, rankdir="LR"):
         Graphviz rankdir attribute that determines the direction of data flow
         within the diagram.  Default: ``"LR"``, which is left-to-right flow.
         Ignored if `graph` is an instance of :class:`pygraphviz.AGraph`.
+    group: Python callable, optional
+        Python callable with signature fn(name) that returns a hashable group
+        key for tasks that should be collapsed together, or :any:`None` for
+        tasks that should be displayed individually.  See :func:`prefix`.  If
+        :any:`None` (the default), every task is displayed individually.
+        Ignored if `graph` is an instance of :class:`pygraphviz.AGraph`.
+    focus: hashable object, optional
+        If specified, only tasks within `radius` links of task `focus`, in
+        either direction, are displayed.  Ignored if `graph` is an instance
+        of :class:`pygraphviz.AGraph`.
+    radius: :class:`int`, optional
+        Number of links around `focus` to display.  Defaults to 1.
 
     Returns
     -------
@@ -56,6 +133,11 @@ def draw(graph, hide=None, rankdir="LR"):
         as needed before using its layout and drawing methods to produce a
         final image.
 
+    Raises
+    ------
+    :class:`ValueError`
+        If task `focus` doesn't exist.
+
     See Also
     --------
     :func:`graphcat.notebook.display` - displays a graph in a Jupyter notebook.
@@ -67,9 +149,22 @@ def draw(graph, hide=None, rankdir="LR"):
     if hide is None:
         hide = none
 
-    nodes = [node for node in graph._graph.nodes() if not hide(graph, node)]
+    nodes = graph._graph.nodes()
+    if focus is not None:
+        graph._require_task_present(focus)
+        nodes = networkx.single_source_shortest_path_length(graph._graph.to_undirected(as_view=True), focus, cutoff=radius)
+    nodes = [node for node in nodes if not hide(graph, node)]
     subgraph = graph._graph.subgraph(nodes)
 
+    # Map each task to the diagram node that will represent it.
+    ids = {}
+    members = collections.defaultdict(list)
+    for node in subgraph.nodes():
+        key = None if group is None else group(node)
+        ids[node] = node if key is None else _group_id(key)
+        members[ids[node]].append(node)
+    keys = {ids[node]: group(node) for node in subgraph.nodes() if ids[node] != node}
+
     black = "#494744"
     red = "crimson"
     white = "white"
@@ -82,30 +177,47 @@ def draw(graph, hide=None, rankdir="LR"):
     agraph.node_attr.update(fontname="Helvetica", fontsize=8, shape="box", style="filled", margin="0.08,0.04", width="0.4", height="0")
     agraph.edge_attr.update(fontname="Helvetica", fontsize=8, color=black, arrowhead=arrowhead, style=edgestyle)
 
-    for node in subgraph.nodes():
-        if subgraph.nodes[node]["state"] == graphcat.TaskState.UNFINISHED:
-            color = black
-            fontcolor = black
-            fillcolor = white
-        if subgraph.nodes[node]["state"] == graphcat.TaskState.FAILED:
+    for id, tasks in members.items():
+        states = {subgraph.nodes[task]["state"] for task in tasks}
+        if graphcat.TaskState.FAILED in states:
             color = red
             fontcolor = white
             fillcolor = red
-        if subgraph.nodes[node]["state"] == graphcat.TaskState.FINISHED:
+        elif graphcat.TaskState.UNFINISHED in states:
+            color = black
+            fontcolor = black
+            fillcolor = white
+        else:
             color = black
             fontcolor = white
             fillcolor = black
 
-        agraph.add_node(node, color=color, fillcolor=fillcolor, fontcolor=fontcolor)
+        if id in keys:
+            agraph.add_node(id, label=f"{keys[id]} ({len(tasks)} tasks)", shape="box3d", color=color, fillcolor=fillcolor, fontcolor=fontcolor)
+        else:
+            agraph.add_node(id, color=color, fillcolor=fillcolor, fontcolor=fontcolor)
 
+    grouped = collections.Counter()
     for target, source, input in subgraph.edges(data="input"):
+        source, target = ids[source], ids[target]
+        if source in keys or target in keys:
+            if source != target:
+                grouped[(source, target)] += 1
+            continue
         if input is None:
             input = ""
         agraph.add_edge(source, target, label=f"  {input}  ") # We want edges to point from dependencies to dependents.
 
+    for (source, target), count in grouped.items():
+        agraph.add_edge(source, target, label=f"  {count} links  " if count > 1 else "  ")
+
     return agraph
 
 
+def _group_id(key):
+    return f"group:{key}"
+
+
 def leaves(graph, node):
     """Filter function that hides all leaf nodes when displaying a graph using :func:`draw`."""
     return graph._graph.out_degree(node) == 0
@@ -116,12 +228,41 @@ def none(graph, node):
     return False
 
 
+def prefix(separator="/", depth=1):
+    """Factory for grouping functions that group tasks by name prefix, for use with :func:`draw`.
+
+    String task names are split using `separator`, and grouped by their first
+    `depth` parts.  Tuple task names are grouped by their first `depth`
+    items.  Tasks with shorter names aren't grouped.
+
+    Parameters
+    ----------
+    separator: :class:`str`, optional
+        Separator between the parts of string task names.  Defaults to ``"/"``.
+    depth: :class:`int`, optional
+        Number of leading parts that identify a group.  Defaults to 1.
+
+    Returns
+    -------
+    group: Python callable
+        Grouping function with signature fn(name).
+    """
+    def implementation(name):
+        if isinstance(name, str):
+            parts = name.split(separator)
+            return separator.join(parts[:depth]) if len(parts) > depth else None
+        if isinstance(name, tuple):
+            return name[:depth] if len(name) > depth else None
+        return None
+    return implementation
+
+
 def parameters(graph, node):
     """Filter function that hides "parameter" nodes."""
-    return isinstance(graph._graph.nodes[node]["fn"], (graphcat.Array, graphcat.Constant))
+    return isinstance(graph._graph.nodes[node]["fn"], (graphcat.Array, graphcat.Constant, graphcat.MemoryMap))
 
 
-def performance(agraph, monitor):
+def performance(agraph, monitor, group=None):
     """Add performance monitor information to a graph diagram.
 
     Parameters
@@ -131,20 +272,35 @@ def performance(agraph, monitor):
     monitor: :class:`graphcat.common.PerformanceMonitor`, required
         Performance monitor object containing performance results to be
         added to `agraph`
+    group: Python callable, optional
+        The grouping function that was passed to :func:`draw`, if any.  When
+        specified, every node is labelled with its exclusive execution time,
+        so that group nodes can be labelled with the total time for their
+        tasks, without counting nested tasks twice.
 
     Returns
     -------
     diagram: :class:`pygraphviz.AGraph`
         Input diagram supplemented with performance results from `monitor`.
+        Tasks that aren't displayed in `agraph` are ignored.
     """
-    all_times = [times[-1] for times in monitor.tasks.values()]
-    min_time = min(all_times)
-    max_time = max(all_times)
+    node_times = {}
+    tasks = monitor.tasks if group is None else monitor.exclusive
+    for name, times in tasks.items():
+        key = None if group is None else group(name)
+        node = name if key is None else _group_id(key)
+        if agraph.has_node(node):
+            node_times[node] = node_times.get(node, 0) + times[-1]
 
     agraph = agraph.copy()
+    if not node_times:
+        return agraph
+
+    min_time = min(node_times.values())
+    max_time = max(node_times.values())
+
     agraph.graph_attr["forcelabels"] = True
-    for name, times in monitor.tasks.items():
-        time = times[-1]
+    for name, time in node_times.items():
         if max_time - min_time > 0:
             percent = (time - min_time) / (max_time - min_time)
             if percent > 0.66:
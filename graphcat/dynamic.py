@@ -30,9 +30,16 @@ class DynamicGraph(graphcat.graph.Graph):
     user-supplied function and stores the function return value as the task
     output.  Outputs of upstream tasks are automatically passed as inputs to
     downstream tasks.
+
+    Parameters
+    ----------
+    freeze_outputs: :class:`bool`, optional
+        If :any:`True`, task outputs are made read-only using
+        :func:`graphcat.common.freeze` as soon as they're computed.  Defaults
+        to :any:`False`.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, freeze_outputs=False):
+        super().__init__(freeze_outputs=freeze_outputs)
 
 
     def _add_node(self, name, fn):
@@ -41,6 +48,7 @@ class DynamicGraph(graphcat.graph.Graph):
 
     def _mark_unfinished(self, name):
         node = self._graph.nodes[name]
+        graphcat.common._release_output(node["output"])
         node["output"] = None
         node["state"] = graphcat.common.TaskState.UNFINISHED
 
@@ -54,12 +62,14 @@ class DynamicGraph(graphcat.graph.Graph):
         # Break cycles
         task = self._graph.nodes[name]
         if task["updating"]:
-            self._on_cycle.send(self, name=name)
+            if self._on_cycle.receivers:
+                self._on_cycle.send(self, name=name)
             return
         task["updating"] = True
 
         # Notify observers that the task will be updated.
-        self._on_update.send(self, name=name)
+        if self._on_update.receivers:
+            self._on_update.send(self, name=name)
 
         # Only execute this task if it isn't already finished.
         if task["state"] != graphcat.common.TaskState.FINISHED:
@@ -68,15 +78,20 @@ class DynamicGraph(graphcat.graph.Graph):
                 inputs = NamedInputs(self, name)
 
                 # Execute the function and store the output.
-                self._on_execute.send(self, name=name, inputs=inputs)
+                if self._on_execute.receivers:
+                    self._on_execute.send(self, name=name, inputs=inputs)
                 task["output"] = task["fn"](graph=self, name=name, inputs=inputs)
+                if self._freeze_outputs:
+                    task["output"] = graphcat.common.freeze(task["output"])
                 task["state"] = graphcat.common.TaskState.FINISHED
-                self._on_finished.send(self, name=name, output=task["output"])
+                if self._on_finished.receivers:
+                    self._on_finished.send(self, name=name, output=task["output"])
             except Exception as e:
                 # The function raised an exception, notify observers.
                 task["output"] = None
                 task["state"] = graphcat.common.TaskState.FAILED
-                self._on_failed.send(self, name=name, exception=e)
+                if self._on_failed.receivers:
+                    self._on_failed.send(self, name=name, exception=e)
                 task["updating"] = False
                 raise e
 
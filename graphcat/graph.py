@@ -20,7 +20,9 @@ import abc
 import blinker
 import networkx
 
+import graphcat.analysis
 import graphcat.common
+import graphcat.snapshot
 
 class Graph(abc.ABC):
     """Abstract base class for computational graphs.
@@ -31,8 +33,27 @@ class Graph(abc.ABC):
     user-supplied function and stores the function return value as the task
     output.  Outputs of upstream tasks are automatically passed as inputs to
     downstream tasks.
+
+    Graphs notify observers such as :class:`graphcat.common.Logger` and
+    :class:`graphcat.common.PerformanceMonitor` of changes and task execution
+    using signals like :attr:`on_execute`.  Signals are only sent when they
+    have receivers, so a graph without observers runs in an uninstrumented
+    mode where notifications cost almost nothing - :class:`graphcat.static.StaticGraph`
+    even skips cycle detection.  To return a graph to uninstrumented mode,
+    disconnect every receiver, or simply create the graph without attaching
+    any observers.  See ``benchmarks/instrumentation.py`` in the source
+    repository to measure the difference.
+
+    Parameters
+    ----------
+    freeze_outputs: :class:`bool`, optional
+        If :any:`True`, task outputs are made read-only using
+        :func:`graphcat.common.freeze` as soon as they're computed, so
+        downstream tasks can safely share them without making defensive copies.
+        Defaults to :any:`False`.
     """
-    def __init__(self):
+    def __init__(self, freeze_outputs=False):
+        self._freeze_outputs = freeze_outputs
         self._graph = networkx.MultiDiGraph()
         self._on_changed = blinker.Signal()
         self._on_cycle = blinker.Signal()
@@ -40,6 +61,7 @@ class Graph(abc.ABC):
         self._on_failed = blinker.Signal()
         self._on_finished = blinker.Signal()
         self._on_task_renamed = blinker.Signal()
+        self._on_unfinished = blinker.Signal()
         self._on_update = blinker.Signal()
 
 
@@ -57,6 +79,25 @@ class Graph(abc.ABC):
         raise NotImplementedError() # pragma: no cover
 
 
+    def _plan(self, name, timings, pending):
+        order = list(networkx.dfs_postorder_nodes(self._graph, name))
+        tasks = [task for task in order if pending(task)]
+        finished = [task for task in order if not pending(task)]
+        if timings is None:
+            return graphcat.common.Plan(tasks=tasks, finished=finished, unestimated=tasks, total=None, critical=None)
+
+        durations = graphcat.analysis._durations(timings)
+        unestimated = [task for task in tasks if task not in durations]
+        durations = {task: durations.get(task, 0.0) for task in tasks}
+
+        # Finished tasks cost nothing, and cycles are broken the same way an update breaks them.
+        finish = {}
+        for task in order:
+            finish[task] = durations.get(task, 0.0) + max((finish[dependency] for dependency in self._graph.successors(task) if dependency in finish), default=0.0)
+
+        return graphcat.common.Plan(tasks=tasks, finished=finished, unestimated=unestimated, total=sum(durations.values()), critical=finish[name])
+
+
     def _require_valid_names(self, names):
         if names is None:
             return self.tasks()
@@ -184,7 +225,14 @@ class Graph(abc.ABC):
         self.mark_unfinished(names)
         for name in names:
             self._graph.remove_node(name)
-        self._on_changed.send(self)
+        if self._on_changed.receivers:
+            self._on_changed.send(self)
+
+
+    @property
+    def freeze_outputs(self):
+        """Return :any:`True` if-and-only-if task outputs are made read-only when they're computed."""
+        return self._freeze_outputs
 
 
     @property
@@ -223,6 +271,42 @@ class Graph(abc.ABC):
         return results
 
 
+    @classmethod
+    def load(cls, path, fns=None, **options):
+        """Restore a graph from a snapshot created with :meth:`save`.
+
+        Task outputs are loaded lazily, the first time they're read, and NumPy
+        outputs are memory-mapped, so loading is fast even for very large
+        graphs.  See :func:`graphcat.snapshot.load` for details.
+
+        Parameters
+        ----------
+        path: :class:`str`, required
+            Path to the snapshot directory.
+        fns: :class:`dict`, optional
+            Maps task names to task functions, for tasks whose functions
+            couldn't be saved with the snapshot.
+        options: keyword arguments, optional
+            Passed to the graph constructor.  If `freeze_outputs` isn't
+            specified, the value used by the original graph is restored.
+
+        Returns
+        -------
+        graph: :class:`Graph`
+            The restored graph.
+
+        Raises
+        ------
+        :class:`ValueError`
+            If the snapshot doesn't contain an instance of this class, or a task
+            function wasn't saved and isn't supplied in `fns`.
+        """
+        graph = graphcat.snapshot.load(path, fns=fns, **options)
+        if not isinstance(graph, cls):
+            raise ValueError(f"Snapshot {path!r} doesn't contain a {cls.__name__}.")
+        return graph
+
+
     def mark_unfinished(self, names=None):
         """Set the unfinished state for tasks and all downstream dependents.
 
@@ -238,15 +322,22 @@ class Graph(abc.ABC):
             Task names to be marked as unfinished.  If :any:`None` (the default), the entire graph is marked unfinished.
         """
         names = self._require_valid_names(names)
+        roots = set(names)
 
         for name in list(names):
             for ancestor in networkx.ancestors(self._graph, name):
                 names.add(ancestor)
 
+        if self._on_unfinished.receivers:
+            tasks = {name for name in names if self._graph.nodes[name]["state"] != graphcat.common.TaskState.UNFINISHED}
+
         for name in names:
             self._mark_unfinished(name)
 
-        self._on_changed.send(self)
+        if self._on_unfinished.receivers:
+            self._on_unfinished.send(self, names=roots, tasks=tasks)
+        if self._on_changed.receivers:
+            self._on_changed.send(self)
 
 
     @property
@@ -339,6 +430,23 @@ class Graph(abc.ABC):
         return self._on_task_renamed
 
 
+    @property
+    def on_unfinished(self):
+        """Signal emitted when tasks are marked unfinished.
+
+        Functions invoked by this signal must have the signature fn(graph, names, tasks),
+        where `graph` is this object, `names` is the set of tasks that were
+        explicitly marked unfinished, and `tasks` is the set of tasks -
+        including downstream dependents - that became unfinished as a result,
+        excluding tasks that were already unfinished.
+
+        Returns
+        -------
+        signal: :class:`blinker.base.Signal`
+        """
+        return self._on_unfinished
+
+
     @property
     def on_update(self):
         """Signal emitted when a task is updated.
@@ -381,6 +489,38 @@ class Graph(abc.ABC):
         raise NotImplementedError() # pragma: no cover
 
 
+    def plan(self, name, *, timings=None):
+        """Describe the work required to update a task, without executing anything.
+
+        Use this to estimate the cost of an update before starting it, for
+        example to decide whether to serve a request immediately or queue it.
+
+        Parameters
+        ----------
+        name: hashable object, required
+            Name of the task to be planned.
+        timings: :class:`graphcat.common.PerformanceMonitor` or :class:`dict`, optional
+            Recorded execution times used to estimate the cost of the update.
+            See :func:`graphcat.analysis.critical_path` for details.  If
+            :any:`None` (the default), no estimates are made.
+
+        Returns
+        -------
+        plan: :class:`graphcat.common.Plan`
+            The tasks that would execute and the tasks that are already
+            finished, along with estimated times.  Dynamic graphs only execute
+            the dependencies that are actually requested by task functions, so
+            their plans are an upper bound.
+
+        Raises
+        ------
+        :class:`ValueError`
+            If the task with `name` doesn't exist.
+        """
+        self._require_task_present(name)
+        return self._plan(name, timings, lambda task: self._graph.nodes[task]["state"] != graphcat.common.TaskState.FINISHED)
+
+
     def rename_task(self, oldname, newname):
         """Change an existing task's name.
 
@@ -404,7 +544,22 @@ class Graph(abc.ABC):
         self._require_task_absent(newname)
         networkx.relabel_nodes(self._graph, mapping = {oldname: newname}, copy=False)
         self.mark_unfinished(newname)
-        self._on_task_renamed.send(self, oldname=oldname, newname=newname)
+        if self._on_task_renamed.receivers:
+            self._on_task_renamed.send(self, oldname=oldname, newname=newname)
+
+
+    def save(self, path):
+        """Save the graph structure, task functions, states and outputs to disk.
+
+        Use :meth:`load` to restore the graph later, without recomputing its
+        outputs.  See :func:`graphcat.snapshot.save` for details.
+
+        Parameters
+        ----------
+        path: :class:`str`, required
+            Path to the snapshot directory, which will be created if it doesn't exist.
+        """
+        graphcat.snapshot.save(self, path)
 
 
     def set_expression(self, name, expression, symbols=None):
@@ -0,0 +1,286 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Collect graph metrics for export to monitoring systems.
+
+:class:`MetricsCollector` counts task updates, executions, cache hits,
+failures and invalidations, and tracks execution times and invalidation
+costs as histograms.  Metrics can be rendered in the `Prometheus text
+exposition format <https://prometheus.io/docs/instrumenting/exposition_formats/>`_,
+for use with a local scrape agent such as the node exporter textfile
+collector.
+"""
+
+import bisect
+import collections
+import os
+import threading
+
+import graphcat.common
+
+
+default_buckets = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Default histogram bucket upper bounds, in seconds."""
+
+default_count_buckets = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+"""Default histogram bucket upper bounds for the number of tasks affected by an invalidation."""
+
+
+class _Histogram(object):
+    def __init__(self, buckets):
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0
+
+    def observe(self, value):
+        self._counts[bisect.bisect_left(self._buckets, value)] += 1
+        self._sum += value
+
+    def samples(self):
+        total = 0
+        for bound, count in zip(self._buckets, self._counts):
+            total += count
+            yield "_bucket", (("le", _format_value(bound)),), total
+        total += self._counts[-1]
+        yield "_bucket", (("le", "+Inf"),), total
+        yield "_sum", (), self._sum
+        yield "_count", (), total
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value):
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        return f"{value:.1f}"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class MetricsCollector(object):
+    """Collects cache, execution, and invalidation metrics for a graph.
+
+    The collector observes graph signals, counting:
+
+    * updates - the number of times each task was updated, including
+      requests for its output.
+    * executions - the number of times each task was executed.
+    * cache hits - updates that were served from the stored output of a
+      finished task, without executing it.
+    * failures - executions that raised an exception.
+    * invalidations - the number of times each task became unfinished, and
+      the execution time that was discarded as a result.
+
+    It also keeps histograms of task execution times, and of the number of
+    tasks and execution time discarded by each call to
+    :meth:`graphcat.graph.Graph.mark_unfinished` (including the implicit
+    calls made when tasks and links change).  Execution times are
+    exclusive: they don't include time spent executing nested tasks.
+
+    Parameters
+    ----------
+    graph: :class:`graphcat.graph.Graph`, required
+        Graph to be observed.
+    label: :class:`str`, optional
+        Value of the ``graph`` label attached to every metric, to distinguish
+        between multiple graphs in the same process.  Defaults to ``"graph"``.
+    prefix: :class:`str`, optional
+        Prefix for every metric name.  Defaults to ``"graphcat"``.
+    buckets: sequence of :class:`float`, optional
+        Histogram bucket upper bounds for times, in seconds.  If
+        :any:`None` (the default), :data:`default_buckets` is used.
+    """
+    def __init__(self, graph, label="graph", prefix="graphcat", buckets=None):
+        self._label = label
+        self._prefix = prefix
+        self._buckets = tuple(sorted(default_buckets if buckets is None else buckets))
+        self._lock = threading.Lock()
+        self.reset()
+        graph.on_execute.connect(self._on_execute)
+        graph.on_failed.connect(self._on_failed)
+        graph.on_finished.connect(self._on_finished)
+        graph.on_unfinished.connect(self._on_unfinished)
+        graph.on_update.connect(self._on_update)
+
+
+    def _hits(self):
+        return {name: self._cached[name] for name in self._updates}
+
+
+    def _on_execute(self, graph, name, inputs, extent=None):
+        # The update that preceded this execution wasn't a cache hit after all.
+        if getattr(self._pending, "name", None) == name:
+            self._pending.name = None
+            with self._lock:
+                self._cached[name] -= 1
+        self._stack.push(name)
+
+
+    def _on_failed(self, graph, name, exception):
+        self._stop(name, failed=True)
+
+
+    def _on_finished(self, graph, name, output):
+        self._stop(name, failed=False)
+
+
+    def _on_unfinished(self, graph, names, tasks):
+        with self._lock:
+            discarded = 0
+            for name in tasks:
+                self._invalidations[name] += 1
+                duration = self._last.pop(name, 0)
+                self._discarded[name] += duration
+                discarded += duration
+            self._graph_invalidations += 1
+            self._invalidated_tasks.observe(len(tasks))
+            self._invalidated_seconds.observe(discarded)
+
+
+    def _on_update(self, graph, name):
+        # Tasks that are already finished are cache hits, unless they execute anyway.
+        # Unfinished tasks that don't execute were skipped, e.g. because an upstream task failed.
+        finished = graph.state(name) == graphcat.common.TaskState.FINISHED
+        self._pending.name = name if finished else None
+        with self._lock:
+            self._updates[name] += 1
+            if finished:
+                self._cached[name] += 1
+
+
+    def _stop(self, name, failed):
+        times = self._stack.pop(name)
+        if times is None:
+            # Streaming graphs can finish tasks using prefetched outputs, without executing them.
+            if not failed and getattr(self._pending, "name", None) != name:
+                with self._lock:
+                    self._cached[name] += 1
+            self._pending.name = None
+            return
+        duration = times[1] * 1e-9
+        with self._lock:
+            self._executions[name] += 1
+            if failed:
+                self._failures[name] += 1
+            else:
+                self._last[name] = duration
+            if name not in self._durations:
+                self._durations[name] = _Histogram(self._buckets)
+            self._durations[name].observe(duration)
+
+
+    @property
+    def counters(self):
+        """Per-task counters collected since this object was created / reset.
+
+        Returns
+        -------
+        counters: :class:`dict` containing :class:`dict` values.
+            Maps ``"updates"``, ``"executions"``, ``"hits"``, ``"failures"``,
+            and ``"invalidations"`` to dicts that map task names to counts.
+        """
+        with self._lock:
+            return {
+                "updates": dict(self._updates),
+                "executions": dict(self._executions),
+                "hits": self._hits(),
+                "failures": dict(self._failures),
+                "invalidations": dict(self._invalidations),
+            }
+
+
+    def render(self):
+        """Render metrics in Prometheus text format.
+
+        Returns
+        -------
+        text: :class:`str`
+            Every metric, in the Prometheus text exposition format.
+        """
+        lines = []
+
+        def metric(name, kind, help, samples):
+            name = f"{self._prefix}_{name}"
+            lines.append(f"# HELP {name} {help}")
+            lines.append(f"# TYPE {name} {kind}")
+            for suffix, labels, value in samples:
+                labels = ",".join(f"{key}=\"{_escape(value)}\"" for key, value in labels)
+                lines.append(f"{name}{suffix}{{{labels}}} {_format_value(value)}")
+
+        def tasks(values):
+            for task, value in sorted(values.items(), key=lambda item: str(item[0])):
+                yield "", (("graph", self._label), ("task", task)), value
+
+        def histograms(values):
+            for task, histogram in sorted(values.items(), key=lambda item: str(item[0])):
+                for suffix, labels, value in histogram.samples():
+                    yield suffix, (("graph", self._label), ("task", task)) + labels, value
+
+        def histogram(histogram):
+            for suffix, labels, value in histogram.samples():
+                yield suffix, (("graph", self._label),) + labels, value
+
+        with self._lock:
+            metric("task_updates_total", "counter", "Number of times each task was updated.", tasks(self._updates))
+            metric("task_executions_total", "counter", "Number of times each task was executed.", tasks(self._executions))
+            metric("task_cache_hits_total", "counter", "Number of task updates served without executing the task.", tasks(self._hits()))
+            metric("task_failures_total", "counter", "Number of task executions that raised an exception.", tasks(self._failures))
+            metric("task_invalidations_total", "counter", "Number of times each task became unfinished.", tasks(self._invalidations))
+            metric("task_discarded_seconds_total", "counter", "Execution time discarded when each task became unfinished.", tasks(self._discarded))
+            metric("task_execution_seconds", "histogram", "Exclusive task execution time.", histograms(self._durations))
+            metric("invalidations_total", "counter", "Number of times tasks were marked unfinished.", [("", (("graph", self._label),), self._graph_invalidations)])
+            metric("invalidation_tasks", "histogram", "Number of tasks that became unfinished per invalidation.", histogram(self._invalidated_tasks))
+            metric("invalidation_seconds", "histogram", "Execution time discarded per invalidation.", histogram(self._invalidated_seconds))
+
+        return "\n".join(lines) + "\n"
+
+
+    def reset(self):
+        """Clear collected metrics."""
+        with self._lock:
+            self._updates = collections.Counter()
+            self._cached = collections.Counter()
+            self._executions = collections.Counter()
+            self._failures = collections.Counter()
+            self._invalidations = collections.Counter()
+            self._discarded = collections.defaultdict(float)
+            self._durations = {}
+            self._last = {}
+            self._graph_invalidations = 0
+            self._invalidated_tasks = _Histogram(default_count_buckets)
+            self._invalidated_seconds = _Histogram(self._buckets)
+        self._pending = threading.local()
+        self._stack = graphcat.common._ExecutionStack()
+
+
+    def write(self, path):
+        """Write metrics in Prometheus text format.
+
+        When `path` is a filename, the metrics are written to a temporary
+        file that then replaces `path`, so a scrape agent never reads a
+        partially-written file.
+
+        Parameters
+        ----------
+        path: :class:`str` or file-like object, required
+            Path of the file to be written, or an open text stream.
+        """
+        if hasattr(path, "write"):
+            path.write(self.render())
+        else:
+            temporary = f"{path}.{os.getpid()}.tmp"
+            with open(temporary, "w") as stream:
+                stream.write(self.render())
+            os.replace(temporary, path)
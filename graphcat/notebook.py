@@ -23,7 +23,7 @@ IPython = graphcat.optional.module("IPython.display")
 
 
 @graphcat.require.loaded_module("IPython.display")
-def display(graph, hide=None, rankdir="LR"):
+def display(graph, hide=None, rankdir="LR", group=None, focus=None, radius=1):
     """Display a computational graph inline in a Jupyter notebook.
 
     This is extremely useful for understanding and debugging graphs.  The
@@ -42,7 +42,15 @@ def display(graph, hide=None, rankdir="LR"):
         Graphviz rankdir attribute that determines the direction of data flow
         within the diagram.  Default: ``"LR"``, which is left-to-right flow.
         Ignored if `graph` is a :class:`pygraphviz.AGraph`.
+    group: Python callable, optional
+        Python callable that returns a group key for tasks that should be
+        collapsed into a single node.  See :func:`graphcat.diagram.draw`.
+    focus: hashable object, optional
+        If specified, only tasks within `radius` links of task `focus` are
+        displayed.  See :func:`graphcat.diagram.draw`.
+    radius: :class:`int`, optional
+        Number of links around `focus` to display.  Defaults to 1.
     """
 
-    agraph = graphcat.diagram.draw(graph, hide=hide, rankdir=rankdir)
+    agraph = graphcat.diagram.draw(graph, hide=hide, rankdir=rankdir, group=group, focus=focus, radius=radius)
     IPython.display.display(IPython.display.SVG(data=agraph.draw(prog="dot", format="svg")))
@@ -0,0 +1,372 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Move large NumPy task outputs between processes using shared memory.
+
+Arrays created by this module are ordinary :class:`numpy.ndarray` objects as
+far as task functions are concerned, but they live in
+:mod:`multiprocessing.shared_memory` blocks, and pickling them only transmits
+the name of the block and the array layout, instead of the array contents.
+This makes it inexpensive to pass large outputs to - and return them from -
+worker processes.
+
+Every block is owned by exactly one process, which is responsible for
+unlinking it.  A block is owned by the process that created it, until a
+worker process - any process started by :mod:`multiprocessing` - pickles it
+to return it to its parent, at which point ownership passes to the process
+that unpickles it.  The owner unlinks a block as soon as the last array that
+refers to it is garbage collected, or when a graph discards the task output
+that contains it because the task became unfinished, whichever comes first.
+Unlinking a block never invalidates arrays that already refer to it; once a
+block is unlinked, its arrays are pickled by value instead of by reference.
+
+Arrays that aren't shared can be sent to other processes without extra copies
+using :func:`dumps` and :func:`loads`, which store array contents in
+out-of-band buffers using pickle protocol 5, see :pep:`574`.
+
+Note
+----
+This module requires Python 3.8 or later.
+"""
+
+import multiprocessing
+import os
+import pickle
+import sys
+import weakref
+
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy
+
+
+default_threshold = 1024 * 1024
+"""Default minimum size in bytes of the arrays that will be moved into shared memory."""
+
+
+class _Block(object):
+    def __init__(self, size=None, name=None, owner=False):
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            owner = True
+        elif owner or sys.version_info < (3, 13):
+            self._shm = shared_memory.SharedMemory(name=name)
+        else: # pragma: no cover
+            self._shm = shared_memory.SharedMemory(name=name, track=False)
+
+        # The finalizer shares this list, so ownership can change after it is registered.
+        self._owner = [owner]
+        self._linked = True
+        self._address = numpy.frombuffer(self._shm.buf, dtype=numpy.uint8).ctypes.data
+        weakref.finalize(self, _release, self._shm, self._owner)
+        _blocks[self.name] = self
+
+    @property
+    def buf(self):
+        return self._shm.buf
+
+    def contains(self, array):
+        start = array.__array_interface__["data"][0]
+        low = start + sum((count - 1) * stride for count, stride in zip(array.shape, array.strides) if stride < 0)
+        high = start + sum((count - 1) * stride for count, stride in zip(array.shape, array.strides) if stride > 0) + array.itemsize
+        return array.size and self._address <= low and high <= self._address + self._shm.size
+
+    def disown(self):
+        self._owner[0] = False
+        # The receiving process tracks the block from now on.
+        if os.name == "posix":
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+
+    @property
+    def linked(self):
+        return self._linked
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    def offset(self, array):
+        return array.__array_interface__["data"][0] - self._address
+
+    @property
+    def owner(self):
+        return self._owner[0]
+
+    def unlink(self):
+        if self._owner[0]:
+            self._owner[0] = False
+            self._linked = False
+            try:
+                self._shm.unlink()
+            except FileNotFoundError: # pragma: no cover
+                pass
+
+
+_blocks = weakref.WeakValueDictionary()
+
+
+def _attach(name, owner):
+    block = _blocks.get(name)
+    if block is None:
+        block = _Block(name=name, owner=owner)
+    elif owner: # pragma: no cover
+        block._owner[0] = True
+    return block
+
+
+def _rebuild(name, shape, dtype, offset, strides, owner=False):
+    return _wrap(_attach(name, owner), shape, dtype, offset, strides)
+
+
+def _release(shm, owner):
+    try:
+        shm.close()
+    except BufferError: # pragma: no cover
+        pass
+    if owner[0]:
+        try:
+            shm.unlink()
+        except FileNotFoundError: # pragma: no cover
+            pass
+
+
+def _wrap(block, shape, dtype, offset=0, strides=None):
+    array = numpy.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset, strides=strides).view(SharedArray)
+    array._block = block
+    return array
+
+
+class SharedArray(numpy.ndarray):
+    """NumPy array stored in a shared memory block.
+
+    Instances behave exactly like :class:`numpy.ndarray`, except that they
+    are pickled by reference: the receiving process maps the same shared memory
+    block instead of receiving a copy of the data.  Views and slices of a
+    :class:`SharedArray` are also pickled by reference.  When a worker process
+    pickles an array in a block that it owns, ownership of the block passes
+    to the receiving process.
+
+    Use :func:`empty` or :func:`share` to create instances.
+    """
+    def __array_finalize__(self, obj):
+        self._block = getattr(obj, "_block", None)
+
+    def __reduce_ex__(self, protocol):
+        block = self._block
+        # Arrays that don't live in a linked block (e.g. ufunc results) are pickled by value.
+        if block is None or not block.linked or not block.contains(self):
+            return self.view(numpy.ndarray).__reduce_ex__(protocol)
+        # Worker processes hand their blocks to the process that receives them.
+        owner = block.owner and multiprocessing.parent_process() is not None
+        if owner:
+            block.disown()
+        return (_rebuild, (block.name, self.shape, self.dtype, block.offset(self), self.strides, owner))
+
+
+class SharedOutputs(object):
+    """Task function callable that moves the outputs of another task function into shared memory.
+
+    Parameters
+    ----------
+    fn: callable, required
+        Task function to be wrapped.
+    threshold: :class:`int`, optional
+        Minimum size in bytes of the arrays to be moved into shared memory.  If
+        :any:`None` (the default), :data:`default_threshold` is used.
+
+    See Also
+    --------
+    :func:`shared_outputs` - factory function for :class:`SharedOutputs` instances.
+    """
+    def __init__(self, fn, threshold=None):
+        self._fn = fn
+        self._threshold = threshold
+
+    def __call__(self, graph, name, inputs, extent=None):
+        if extent is None:
+            output = self._fn(graph=graph, name=name, inputs=inputs)
+        else:
+            output = self._fn(graph=graph, name=name, inputs=inputs, extent=extent)
+        return share(output, self._threshold)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self._fn == other._fn and self._threshold == other._threshold
+
+    def __getattr__(self, name):
+        # Forward optional protocol methods such as map_extent and crop to the wrapped function.
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._fn, name)
+
+
+def dumps(value):
+    """Pickle a value, storing the contents of arrays out-of-band.
+
+    The contents of contiguous arrays that aren't stored in shared memory are
+    returned as separate buffers instead of being copied into the pickled
+    data, so they can be sent to another process using a zero-copy transport.
+
+    Parameters
+    ----------
+    value: any Python object, required
+        The value to be pickled.
+
+    Returns
+    -------
+    data: :class:`bytes`
+        Pickled representation of `value`.
+    buffers: :class:`list` of :class:`pickle.PickleBuffer`
+        Out-of-band buffers that must be passed to :func:`loads` along with `data`.
+    """
+    buffers = []
+    data = pickle.dumps(value, protocol=5, buffer_callback=buffers.append)
+    return data, buffers
+
+
+def empty(shape, dtype=float):
+    """Allocate an uninitialized array in shared memory.
+
+    Task functions can use this to write their results directly into shared
+    memory, avoiding the copy made by :func:`share`.
+
+    Parameters
+    ----------
+    shape: :class:`int` or :class:`tuple` of :class:`int`, required
+        Shape of the new array.
+    dtype: :class:`numpy.dtype` convertable object, optional
+        Data type of the new array.  Defaults to :class:`float`.
+
+    Returns
+    -------
+    array: :class:`SharedArray`
+        Uninitialized array backed by a new shared memory block.
+    """
+    dtype = numpy.dtype(dtype)
+    if dtype.hasobject:
+        raise ValueError("Arrays containing Python objects can't be stored in shared memory.")
+    shape = (shape,) if numpy.ndim(shape) == 0 else tuple(shape)
+    block = _Block(size=int(numpy.prod(shape)) * dtype.itemsize)
+    return _wrap(block, shape, dtype)
+
+
+def loads(data, buffers):
+    """Unpickle a value created by :func:`dumps`.
+
+    Parameters
+    ----------
+    data: :class:`bytes`, required
+        Pickled representation returned by :func:`dumps`.
+    buffers: iterable of buffer objects, required
+        Out-of-band buffers returned by :func:`dumps`.
+
+    Returns
+    -------
+    value: any Python object
+        The unpickled value.  Arrays refer to `buffers` instead of copying them.
+    """
+    return pickle.loads(data, buffers=buffers)
+
+
+def release(value):
+    """Unlink the shared memory blocks owned by this process that are used by a value.
+
+    Graphs call this automatically when they discard a task output, so the
+    shared memory can be reclaimed as soon as the last array that uses it is
+    garbage collected, even if some other process still refers to it.  Arrays
+    that already use the blocks remain valid.  Lists, tuples, and dicts are
+    searched recursively for arrays.
+
+    Parameters
+    ----------
+    value: any Python object, required
+        The value whose shared memory should be released.
+    """
+    if isinstance(value, SharedArray):
+        if value._block is not None:
+            value._block.unlink()
+    elif isinstance(value, dict):
+        for item in value.values():
+            release(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            release(item)
+
+
+def share(value, threshold=None):
+    """Move large arrays into shared memory.
+
+    Arrays that are at least `threshold` bytes in size are copied into new
+    shared memory blocks.  Lists, tuples, and dicts are searched recursively
+    for arrays.  Everything else - including arrays that are already shared -
+    is returned unchanged.
+
+    Parameters
+    ----------
+    value: any Python object, required
+        The value to be shared.
+    threshold: :class:`int`, optional
+        Minimum size in bytes of the arrays to be moved into shared memory.  If
+        :any:`None` (the default), :data:`default_threshold` is used.
+
+    Returns
+    -------
+    shared: any Python object
+        `value`, with large arrays replaced by :class:`SharedArray` instances.
+    """
+    if threshold is None:
+        threshold = default_threshold
+
+    if isinstance(value, SharedArray) and value._block is not None:
+        return value
+    if isinstance(value, numpy.ndarray):
+        if value.dtype.hasobject or value.nbytes < threshold or value.size == 0:
+            return value
+        result = empty(value.shape, value.dtype)
+        result[...] = value
+        return result
+    if isinstance(value, dict):
+        return {key: share(item, threshold) for key, item in value.items()}
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)._make(share(item, threshold) for item in value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(share(item, threshold) for item in value)
+    return value
+
+
+def shared_outputs(fn, threshold=None):
+    """Factory for task functions that store their outputs in shared memory.
+
+    Wrap a task function with :func:`shared_outputs` so that large arrays
+    returned by the function are moved into shared memory, where they can be
+    passed to and from worker processes without copying::
+
+        graph.set_task("image", graphcat.sharedmem.shared_outputs(load_image))
+
+    Downstream tasks receive the shared arrays as their inputs, so they can
+    be sent to worker processes as inexpensively as outputs can.
+
+    Parameters
+    ----------
+    fn: callable, required
+        Task function whose outputs will be shared.
+    threshold: :class:`int`, optional
+        Minimum size in bytes of the arrays to be moved into shared memory.  If
+        :any:`None` (the default), :data:`default_threshold` is used.
+
+    Returns
+    -------
+    fn: :class:`SharedOutputs`
+        Task function that calls `fn`, then passes its output to :func:`share`.
+    """
+    return SharedOutputs(fn, threshold)
@@ -0,0 +1,190 @@
+# Copyright 2020 Timothy M. Shead
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Save and restore the complete state of a computational graph.
+
+A snapshot is a directory containing the graph structure, task functions, task
+states and task outputs.  NumPy outputs are written as ``.npy`` files that are
+memory-mapped when the snapshot is loaded, and all other outputs are written
+using the newest pickle protocol available, up to protocol 5.  Outputs are loaded lazily, the first time they're
+read, so even very large graphs can be restored quickly.
+
+Most callers will use :meth:`graphcat.graph.Graph.save` and
+:meth:`graphcat.graph.Graph.load` instead of calling this module directly.
+"""
+
+import os
+import pickle
+import types
+
+import graphcat.common
+import graphcat.optional
+
+
+numpy = graphcat.optional.module("numpy")
+
+_protocol = min(5, pickle.HIGHEST_PROTOCOL)
+
+
+class _Attributes(dict):
+    """Task attributes that load the task output on first access."""
+    def __init__(self, attributes, load):
+        super().__init__(attributes)
+        self._load = load
+
+    def __contains__(self, key):
+        return super().__contains__(key) or (key == "output" and self._load is not None)
+
+    def __missing__(self, key):
+        if key != "output" or self._load is None:
+            raise KeyError(key)
+        load, self._load = self._load, None
+        self["output"] = load()
+        return self["output"]
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def _load_array(path, mmap_mode):
+    def implementation():
+        return numpy.load(path, mmap_mode=mmap_mode)
+    return implementation
+
+
+def _load_pickle(path, freeze):
+    def implementation():
+        with open(path, "rb") as stream:
+            value = pickle.load(stream)
+        return graphcat.common.freeze(value) if freeze else value
+    return implementation
+
+
+def _thaw(value):
+    # Read-only mappings are stored as dicts, since mapping proxies can't be pickled.
+    if isinstance(value, (graphcat.common.FrozenDict, types.MappingProxyType)):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple) and hasattr(value, "_fields"):
+        return type(value)._make(_thaw(item) for item in value)
+    if isinstance(value, tuple):
+        return tuple(_thaw(item) for item in value)
+    return value
+
+
+def load(path, fns=None, **options):
+    """Restore a graph from a snapshot created with :func:`save`.
+
+    Parameters
+    ----------
+    path: :class:`str`, required
+        Path to the snapshot directory.
+    fns: :class:`dict`, optional
+        Maps task names to task functions, for tasks whose functions couldn't
+        be saved with the snapshot (for example, expression tasks), or to
+        override functions that were saved.
+    options: keyword arguments, optional
+        Passed to the graph constructor.  If `freeze_outputs` isn't
+        specified, the value used by the original graph is restored.
+
+    Returns
+    -------
+    graph: :class:`graphcat.graph.Graph`
+        Graph with the same type, structure, task states and outputs as the
+        original.  Outputs are loaded the first time they're read.  NumPy
+        outputs are memory-mapped, so `path` must not be removed while the
+        graph is in use.
+
+    Raises
+    ------
+    :class:`ValueError`
+        If a task function wasn't saved and isn't supplied in `fns`.
+    """
+    if fns is None:
+        fns = {}
+
+    with open(os.path.join(path, "graph.pickle"), "rb") as stream:
+        snapshot = pickle.load(stream)
+
+    options.setdefault("freeze_outputs", snapshot.get("freeze_outputs", False))
+    graph = snapshot["type"](**options)
+    mmap_mode = "r" if graph.freeze_outputs else "c"
+
+    for name, attributes, fn, output in snapshot["tasks"]:
+        if name in fns:
+            fn = fns[name]
+        elif fn is not None:
+            fn = pickle.loads(fn)
+        else:
+            raise ValueError(f"Task {name!r} function wasn't saved and must be supplied.")
+
+        if output is None:
+            load = None
+        elif output.endswith(".npy"):
+            load = _load_array(os.path.join(path, output), mmap_mode)
+        else:
+            load = _load_pickle(os.path.join(path, output), graph.freeze_outputs)
+
+        graph._add_node(name, fn)
+        attributes = dict(graph._graph.nodes[name], fn=fn, **attributes)
+        if load is not None:
+            del attributes["output"]
+        graph._graph._node[name] = _Attributes(attributes, load)
+
+    for target, source, input in snapshot["links"]:
+        graph._graph.add_edge(target, source, input=input)
+
+    return graph
+
+
+def save(graph, path):
+    """Save a snapshot of a graph to disk.
+
+    Task functions that can't be pickled are skipped, and must be supplied to
+    :func:`load` when the snapshot is restored.
+
+    Parameters
+    ----------
+    graph: :class:`graphcat.graph.Graph`, required
+        The graph to be saved.
+    path: :class:`str`, required
+        Path to the snapshot directory, which will be created if it doesn't
+        exist.  Existing snapshot files in the directory are overwritten.
+    """
+    os.makedirs(path, exist_ok=True)
+
+    tasks = []
+    for index, (name, node) in enumerate(graph._graph.nodes(data=True)):
+        try:
+            fn = pickle.dumps(node["fn"], protocol=_protocol)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            fn = None
+
+        output = None
+        if node["state"] == graphcat.common.TaskState.FINISHED and node["output"] is not None:
+            value = node["output"]
+            if numpy is not None and isinstance(value, numpy.ndarray) and not value.dtype.hasobject:
+                output = f"{index}.npy"
+                numpy.save(os.path.join(path, output), value)
+            else:
+                output = f"{index}.pickle"
+                with open(os.path.join(path, output), "wb") as stream:
+                    pickle.dump(_thaw(value), stream, protocol=_protocol)
+
+        attributes = {key: value for key, value in node.items() if key not in ("fn", "output", "updating")}
+        tasks.append((name, attributes, fn, output))
+
+    links = list(graph._graph.edges(data="input"))
+
+    with open(os.path.join(path, "graph.pickle"), "wb") as stream:
+        pickle.dump({"type": type(graph), "freeze_outputs": graph.freeze_outputs, "tasks": tasks, "links": links}, stream, protocol=_protocol)
@@ -30,9 +30,16 @@ class StaticGraph(graphcat.graph.Graph):
     user-supplied function and stores the function return value as the task
     output.  Outputs of upstream tasks are automatically passed as inputs to
     downstream tasks.
+
+    Parameters
+    ----------
+    freeze_outputs: :class:`bool`, optional
+        If :any:`True`, task outputs are made read-only using
+        :func:`graphcat.common.freeze` as soon as they're computed.  Defaults
+        to :any:`False`.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, freeze_outputs=False):
+        super().__init__(freeze_outputs=freeze_outputs)
 
 
     def _add_node(self, name, fn):
@@ -41,6 +48,7 @@ class StaticGraph(graphcat.graph.Graph):
 
     def _mark_unfinished(self, name):
         node = self._graph.nodes[name]
+        graphcat.common._release_output(node["output"])
         node["output"] = None
         node["state"] = graphcat.common.TaskState.UNFINISHED
 
@@ -108,19 +116,21 @@ class StaticGraph(graphcat.graph.Graph):
         failed_name = None
         exception = None
 
-        # Identify cycles
-        try:
-            cycle = networkx.find_cycle(self._graph, source=name)
-            self._on_cycle.send(self, name=cycle[0][0])
-        except networkx.NetworkXNoCycle:
-            pass
+        # Identify cycles, which is only necessary if someone is listening.
+        if self._on_cycle.receivers:
+            try:
+                cycle = networkx.find_cycle(self._graph, source=name)
+                self._on_cycle.send(self, name=cycle[0][0])
+            except networkx.NetworkXNoCycle:
+                pass
 
         # Iterate over every task to be executed, in order ...
         for name in networkx.dfs_postorder_nodes(self._graph, name):
             task = self._graph.nodes[name]
 
             # Notify observers that the task will be updated.
-            self._on_update.send(self, name=name)
+            if self._on_update.receivers:
+                self._on_update.send(self, name=name)
 
             # Only execute this task if it isn't finished and a failure hasn't already occurred.
             if exception is None and task["state"] != graphcat.common.TaskState.FINISHED:
@@ -130,15 +140,20 @@ class StaticGraph(graphcat.graph.Graph):
                     inputs = NamedInputs(self, name)
 
                     # Execute the function and store the output.
-                    self._on_execute.send(self, name=name, inputs=inputs)
+                    if self._on_execute.receivers:
+                        self._on_execute.send(self, name=name, inputs=inputs)
                     task["output"] = task["fn"](graph=self, name=name, inputs=inputs)
+                    if self._freeze_outputs:
+                        task["output"] = graphcat.common.freeze(task["output"])
                     task["state"] = graphcat.common.TaskState.FINISHED
-                    self._on_finished.send(self, name=name, output=task["output"])
+                    if self._on_finished.receivers:
+                        self._on_finished.send(self, name=name, output=task["output"])
                 except Exception as e:
                     # The function raised an exception, notify observers.
                     exception = e
                     failed_name = name
-                    self._on_failed.send(self, name=name, exception=e)
+                    if self._on_failed.receivers:
+                        self._on_failed.send(self, name=name, exception=e)
 
         # If a failure occurred, mark all tasks between the failed and updated task.
         if exception is not None:
@@ -148,7 +163,8 @@ class StaticGraph(graphcat.graph.Graph):
                 task = self._graph.nodes[name]
                 task["output"] = None
                 task["state"] = graphcat.common.TaskState.FAILED
-            self._on_changed.send(self)
+            if self._on_changed.receivers:
+                self._on_changed.send(self)
             raise exception
 
 
@@ -15,10 +15,22 @@
 """Implements computational graphs using dynamic dependency analysis and streaming.
 """
 
+import concurrent.futures
 import functools
+import pickle
+import queue
+import sys
+import threading
+
+import networkx
 
 import graphcat.common
 import graphcat.graph
+import graphcat.optional
+
+
+multiprocessing = graphcat.optional.module("multiprocessing.shared_memory")
+numpy = graphcat.optional.module("numpy")
 
 
 class StreamingGraph(graphcat.graph.Graph):
@@ -30,9 +42,95 @@ class StreamingGraph(graphcat.graph.Graph):
     user-supplied function and stores the function return value as the task
     output.  Outputs of upstream tasks are automatically passed as inputs to
     downstream tasks.
+
+    Task functions can optionally implement an extent mapping protocol, so
+    that upstream tasks only compute the region that a downstream task
+    actually needs:
+
+    * ``fn.map_extent(extent, input)`` returns the extent of named input `input`
+      required to compute `extent`.  It is used whenever the task function
+      requests an input without specifying an extent.  A convolution, for
+      example, might grow `extent` by the radius of its kernel.
+    * ``fn.crop(output, extent)`` is called after the task function returns,
+      to crop an output computed from the mapped input extents down to
+      `extent`.
+
+    Neither method is called when `extent` is :any:`None`.  See
+    :class:`graphcat.common.Stencil` for an example.
+
+    To bound the memory used by intermediate results, extents larger than a
+    maximum size can be split into tiles that are computed one after another
+    and assembled into a single preallocated :class:`numpy.ndarray`.  The
+    maximum size can be set for the entire graph using `max_extent`, or for
+    individual tasks by giving their task function a ``max_extent``
+    attribute, which takes precedence.  Only extents made of slices with
+    explicit, non-negative bounds are split; see
+    :meth:`graphcat.common.ArrayExtent.tiles`.  Observers see a single
+    :attr:`on_execute<graphcat.graph.Graph.on_execute>` signal with the
+    requested extent, no matter how many times the task function is called.
+
+    If an `executor` is supplied, the tiles are computed concurrently instead
+    of one after another.  Each tile is computed independently, evaluating the
+    task and the tasks upstream from it without reading or modifying their
+    stored states or outputs, so every tile can run on a separate thread or
+    process.  In this mode task functions must be thread-safe (or picklable,
+    for process pools), and are called with `graph` set to :any:`None`, so
+    expression tasks aren't supported.
+
+    Callers that request extents in a predictable order can have the graph
+    compute the next extent speculatively, in a background thread, so that
+    the following request is usually satisfied immediately.  Use
+    :meth:`prefetch` to provide an explicit hint, or set `prefetch` to
+    :any:`True` to have the graph detect strides in the extents passed to
+    :meth:`update` and :meth:`output` for each task.  Prefetched outputs are
+    computed the same way as concurrent tiles, with the same restrictions on
+    task functions, and are discarded if the task becomes unfinished before
+    they're used.
+
+    For sliding windows over time series and similar data, task functions can
+    declare that they're computed incrementally by setting an
+    ``incremental`` attribute to :any:`True`.  This promises that the output
+    for an extent is the concatenation, along the first axis, of the outputs
+    for any division of the extent along that axis.  When the extent
+    requested from an incremental task overlaps the extent of its previous
+    output along the first axis (and is otherwise identical), the graph
+    reuses the overlapping part of the previous output and only executes the
+    task function for the newly exposed parts, so the work per step is
+    proportional to the step size instead of the window size.
+
+    Parameters
+    ----------
+    freeze_outputs: :class:`bool`, optional
+        If :any:`True`, task outputs are made read-only using
+        :func:`graphcat.common.freeze` as soon as they're computed.  Defaults
+        to :any:`False`.
+    max_extent: :class:`int` or :class:`tuple` of :class:`int`, optional
+        Maximum size of the extents that a task will compute at once.  Larger
+        extents are split into tiles of this size.  Defaults to :any:`None`,
+        which never splits extents.
+    executor: :class:`concurrent.futures.Executor`, optional
+        If supplied, tiles created by splitting extents larger than
+        `max_extent` are computed concurrently using this executor.  Defaults
+        to :any:`None`, which computes tiles sequentially.  With a
+        :class:`concurrent.futures.ProcessPoolExecutor`, the task functions
+        are pickled and copied into each worker process once per call, so
+        functions that hold large arrays (such as :func:`graphcat.common.array`)
+        are still copied to every worker; use :mod:`graphcat.sharedmem` or
+        :func:`graphcat.common.memmap` for large sources.
+    prefetch: :class:`bool`, optional
+        If :any:`True`, detect strides in the extents requested for each task,
+        and prefetch the next extent in the background.  Defaults to
+        :any:`False`.  Call :meth:`close` to stop the background thread when
+        the graph is no longer needed.
     """
-    def __init__(self):
-        super().__init__()
+    def __init__(self, freeze_outputs=False, max_extent=None, executor=None, prefetch=False):
+        super().__init__(freeze_outputs=freeze_outputs)
+        self._max_extent = max_extent
+        self._executor = executor
+        self._prefetch = prefetch
+        self._prefetcher = None
+        self._prefetches = {}
+        self._requests = {}
 
 
     def _add_node(self, name, fn):
@@ -40,7 +138,10 @@ class StreamingGraph(graphcat.graph.Graph):
 
 
     def _mark_unfinished(self, name):
+        self._prefetches.pop(name, None)
+        self._requests.pop(name, None)
         node = self._graph.nodes[name]
+        graphcat.common._release_output(node["output"])
         node["extent"] = None
         node["output"] = None
         node["state"] = graphcat.common.TaskState.UNFINISHED
@@ -55,37 +156,143 @@ class StreamingGraph(graphcat.graph.Graph):
         # Break cycles
         task = self._graph.nodes[name]
         if task["updating"]:
-            self._on_cycle.send(self, name=name)
+            if self._on_cycle.receivers:
+                self._on_cycle.send(self, name=name)
             return
         task["updating"] = True
 
         # Notify observers that the task will be updated.
-        self._on_update.send(self, name=name)
+        if self._on_update.receivers:
+            self._on_update.send(self, name=name)
 
         # Only execute this task if it isn't already finished.
-        if (task["extent"] != extent) or (task["state"] != graphcat.common.TaskState.FINISHED):
+        # Equivalent extents must not cause the task to execute again.
+        canonical = graphcat.common.ArrayExtent.canonical(extent)
+        if (task["extent"] != canonical) or (task["state"] != graphcat.common.TaskState.FINISHED):
             try:
-                # Get the task inputs.
-                inputs = NamedInputs(self, name)
+                previous, retained = (task["extent"], task["output"]) if task["state"] == graphcat.common.TaskState.FINISHED else (None, None)
+                prefetched, future = self._prefetches.pop(name, (None, None))
+                incremental = getattr(task["fn"], "incremental", False) and numpy is not None and isinstance(retained, numpy.ndarray)
+                window = _window(previous, canonical) if incremental else None
 
-                # Execute the function and store the output.
-                self._on_execute.send(self, name=name, inputs=inputs, extent=extent)
-                task["extent"] = extent
-                task["output"] = task["fn"](graph=self, name=name, inputs=inputs, extent=extent)
+                task["extent"] = canonical
+                task["output"] = None
+                if future is not None and prefetched == canonical and future.exception() is None:
+                    # Use the output that was computed in the background.
+                    task["output"] = future.result()
+                else:
+                    # Execute the function and store the output.
+                    inputs = NamedInputs(self, name, extent) if window is None or self._on_execute.receivers else None
+                    if self._on_execute.receivers:
+                        self._on_execute.send(self, name=name, inputs=inputs, extent=extent)
+                    if window is not None:
+                        # Only compute the parts of the extent that weren't part of the previous output.
+                        overlap, prefix, suffix = window
+                        parts = [retained[overlap]]
+                        if prefix is not None:
+                            parts.insert(0, self._compute(name, _replace_first(extent, canonical, prefix)))
+                        if suffix is not None:
+                            parts.append(self._compute(name, _replace_first(extent, canonical, suffix)))
+                        task["output"] = numpy.concatenate(parts)
+                        if self._freeze_outputs:
+                            task["output"] = graphcat.common.freeze(task["output"])
+                    else:
+                        task["output"] = self._compute(name, extent, inputs)
                 task["state"] = graphcat.common.TaskState.FINISHED
-                self._on_finished.send(self, name=name, output=task["output"])
+                if self._on_finished.receivers:
+                    self._on_finished.send(self, name=name, output=task["output"])
             except Exception as e:
                 # The function raised an exception, notify observers.
                 task["extent"] = None
                 task["output"] = None
                 task["state"] = graphcat.common.TaskState.FAILED
-                self._on_failed.send(self, name=name, exception=e)
+                if self._on_failed.receivers:
+                    self._on_failed.send(self, name=name, exception=e)
                 task["updating"] = False
                 raise e
 
         task["updating"] = False
 
 
+    def _compute(self, name, extent, inputs=None):
+        task = self._graph.nodes[name]
+        max_extent = getattr(task["fn"], "max_extent", self._max_extent)
+        tiles = _split(extent, max_extent) if max_extent is not None else None
+
+        if tiles is None:
+            if inputs is None:
+                inputs = NamedInputs(self, name, extent)
+            return _execute(self, task["fn"], name, inputs, extent)
+
+        # Execute the function once for each tile, assembling the results.
+        shape, tiles = tiles
+        subgraph = None
+        if self._executor is not None:
+            subgraph = _Subgraph(self, name)
+            # Send task functions to worker processes once, instead of once per tile.
+            if multiprocessing is not None and isinstance(self._executor, concurrent.futures.ProcessPoolExecutor):
+                subgraph = _SharedSubgraph(subgraph)
+            futures = [self._executor.submit(subgraph, name, tile) for tile, local in tiles]
+            outputs = (future.result() for future in futures)
+        else:
+            outputs = (_execute(self, task["fn"], name, NamedInputs(self, name, tile), tile, freeze=False) for tile, local in tiles)
+
+        # Tiles are copied into a preallocated result until one comes back short,
+        # e.g. because the extent extends past the end of the data.
+        try:
+            result = None
+            blocks = None
+            for index, ((tile, local), output) in enumerate(zip(tiles, outputs)):
+                output = numpy.asarray(output)
+                if result is None:
+                    result = numpy.empty(shape + output.shape[len(shape):], dtype=output.dtype)
+                if blocks is None and output.shape[:len(shape)] != tuple(item.stop - item.start for item in local):
+                    blocks = [result[previous] for _, previous in tiles[:index]]
+                if blocks is None:
+                    result[local] = output
+                else:
+                    blocks.append(output)
+        finally:
+            if isinstance(subgraph, _SharedSubgraph):
+                concurrent.futures.wait(futures)
+                subgraph.close()
+
+        if blocks is not None:
+            counts = [len({local[axis].start for _, local in tiles}) for axis in range(len(shape))]
+            result = _assemble(blocks, counts)
+        if self._freeze_outputs:
+            result = graphcat.common.freeze(result)
+        return result
+
+
+    def _predict(self, name, extent):
+        previous = self._requests.get(name)
+        self._requests[name] = extent
+        prediction = _stride(previous, extent)
+        if prediction is not None:
+            self.prefetch(name, prediction)
+
+
+    def close(self):
+        """Stop the background thread used for prefetching.
+
+        Prefetches that are still running are allowed to finish, and their
+        outputs are discarded.  The graph remains usable afterwards; a new
+        background thread is started the next time an extent is prefetched.
+        """
+        prefetcher, self._prefetcher = self._prefetcher, None
+        self._prefetches.clear()
+        self._requests.clear()
+        if prefetcher is not None:
+            prefetcher.shutdown(wait=True, cancel_futures=True)
+
+
+    @property
+    def executor(self):
+        """Executor used to compute tiles concurrently, or :any:`None`."""
+        return self._executor
+
+
     @property
     def is_dynamic(self):
         """Returns :any:`True`."""
@@ -98,6 +305,151 @@ class StreamingGraph(graphcat.graph.Graph):
         return True
 
 
+    @property
+    def max_extent(self):
+        """Maximum size of the extents that tasks compute at once, or :any:`None`.
+
+        Task functions with a ``max_extent`` attribute override this value.
+        """
+        return self._max_extent
+
+
+    def iter_output(self, name, extents, pipelined=False, queue_size=2):
+        """Retrieve the output from a task, one extent at a time.
+
+        This is equivalent to calling :meth:`output` once for each extent, but
+        the outputs are computed lazily as the caller iterates over the
+        results, so only the outputs for one extent are kept in memory at a
+        time.  This makes it possible to process data that is much larger than
+        available memory::
+
+            for extent, chunk in graph.iter_output("image", graphcat.ArrayExtent.tiles(shape, (512, 512))):
+                ...
+
+        If `pipelined` is :any:`True`, every task upstream from `name` runs
+        concurrently in its own thread, as a stage in a pipeline: while one
+        task works on an extent, its upstream tasks can work on the following
+        extents.  Stages are connected by bounded queues, so fast stages block
+        instead of running arbitrarily far ahead, and throughput approaches
+        that of the slowest stage - provided that task functions release the
+        GIL, as most NumPy operations do.  In pipelined mode:
+
+        * Every task computes the same extent as `name`; task functions that
+          request an input without an extent receive that input's value for
+          the current extent, and requesting any other extent raises
+          :class:`ValueError`.
+        * Task outputs are passed directly from stage to stage, and the graph's
+          stored task states and outputs are left unchanged.
+        * Task functions must be thread-safe, and must not access the graph
+          directly (so expression tasks aren't supported).
+
+        Parameters
+        ----------
+        name: hashable object, required
+            Unique task name.
+        extents: iterable of hashable objects, required
+            Domain objects specifying the subsets of the task's output to
+            return.  See :meth:`graphcat.common.ArrayExtent.tiles` for a
+            convenient way to generate them.
+        pipelined: :class:`bool`, optional
+            If :any:`True`, execute upstream tasks concurrently as pipeline stages.
+            Defaults to :any:`False`.
+        queue_size: :class:`int`, optional
+            Maximum number of outputs that can be waiting between pipeline stages.
+            Ignored unless `pipelined` is :any:`True`.
+
+        Returns
+        -------
+        outputs: generator of (extent, output) tuples
+            The task output for each extent.
+
+        Raises
+        ------
+        :class:`ValueError`
+            If `name` doesn't exist, or `pipelined` is :any:`True` and the
+            tasks upstream from `name` contain a cycle.
+        :class:`Exception`
+            Any exception raised by a task function will be re-raised while iterating.
+        """
+        self._require_task_present(name)
+        if pipelined:
+            subgraph = self._graph.subgraph(networkx.descendants(self._graph, name) | {name})
+            if not networkx.is_directed_acyclic_graph(subgraph):
+                raise ValueError(f"Task {name!r} can't be pipelined because it depends on a cycle.")
+            return _pipeline(self, subgraph, name, extents, queue_size)
+        return ((extent, self.output(name, extent)) for extent in extents)
+
+
+    def mark_unfinished(self, names=None, extent=None):
+        """Set the unfinished state for tasks and downstream dependents.
+
+        Normally, the unfinished state is set automatically when changes are
+        made to the graph.  This method is provided for callers who need to
+        set the unfinished state in response to some outside event that the
+        graph isn't aware of, such as a change to part of an input file.
+
+        If `extent` is specified, only that region of each task in `names` is
+        considered out-of-date.  The dirty region is propagated downstream,
+        and only tasks whose stored extent intersects their dirty region
+        become unfinished, so cached outputs for unaffected extents remain
+        valid.  By default, the dirty region of a downstream task is the same
+        as the dirty region of its inputs; task functions that shift or grow
+        regions can implement ``fn.map_dirty(extent, input)``, which returns
+        the region of the task's output affected by changes to `extent` of
+        named input `input`.  See :class:`graphcat.common.Stencil` for an
+        example.  If ``map_dirty`` raises an exception, the task is treated as
+        entirely out-of-date.
+
+        Parameters
+        ----------
+        names: :any:`None`, hashable object, or list|set of hashable objects, required
+            Task names to be marked as unfinished.  If :any:`None` (the default), the entire graph is marked unfinished.
+        extent: hashable object, optional
+            The out-of-date region of the tasks in `names`.  If :any:`None`
+            (the default), the tasks and all downstream dependents are marked
+            unfinished.
+        """
+        if extent is None:
+            return super().mark_unfinished(names)
+
+        names = self._require_valid_names(names)
+        downstream = set(names)
+        for name in names:
+            downstream |= networkx.ancestors(self._graph, name)
+        subgraph = self._graph.subgraph(downstream)
+        if not networkx.is_directed_acyclic_graph(subgraph):
+            return super().mark_unfinished(names)
+
+        # Visit tasks from upstream to downstream, accumulating dirty regions.
+        # Regions that can't be mapped make the downstream task entirely dirty.
+        order = list(reversed(list(networkx.topological_sort(subgraph))))
+        dirty = {name: graphcat.common.ArrayExtent.canonical(extent) for name in names}
+        for name in order:
+            region = dirty[name]
+            for target, source, input in subgraph.in_edges(name, data="input"):
+                map_dirty = getattr(self._graph.nodes[target]["fn"], "map_dirty", None)
+                try:
+                    mapped = region if region is None or map_dirty is None else graphcat.common.ArrayExtent.canonical(map_dirty(region, input))
+                except Exception:
+                    mapped = None
+                dirty[target] = _union(dirty[target], mapped) if target in dirty else mapped
+
+        # Only modify the graph once every dirty region is known.
+        tasks = set()
+        for name in order:
+            if _intersects(self._graph.nodes[name]["extent"], dirty[name]):
+                if self._graph.nodes[name]["state"] != graphcat.common.TaskState.UNFINISHED:
+                    tasks.add(name)
+                self._mark_unfinished(name)
+            else:
+                self._prefetches.pop(name, None)
+
+        if self._on_unfinished.receivers:
+            self._on_unfinished.send(self, names=names, tasks=tasks)
+        if self._on_changed.receivers:
+            self._on_changed.send(self)
+
+
     def output(self, name, extent=None):
         """Retrieve the output from a task.
 
@@ -128,6 +480,142 @@ class StreamingGraph(graphcat.graph.Graph):
         return self._graph.nodes[name]["output"]
 
 
+    def plan(self, name, extent=None, *, timings=None):
+        """Describe the work required to update a task, without executing anything.
+
+        Use this to estimate the cost of an update before starting it, for
+        example to decide whether to serve a request immediately or queue it.
+
+        A task will execute if it isn't finished, or if its output was
+        computed for a different extent.  The extents of upstream tasks are
+        predicted using ``fn.map_extent`` where it's available.  Otherwise,
+        upstream tasks are assumed to be requested either without an extent
+        or with the same extent as their downstream task, and are planned as
+        finished only if their output was computed for one of those extents.
+
+        Parameters
+        ----------
+        name: hashable object, required
+            Name of the task to be planned.
+        extent: hashable object, optional
+            Extent of the task output that would be requested.
+        timings: :class:`graphcat.common.PerformanceMonitor` or :class:`dict`, optional
+            Recorded execution times used to estimate the cost of the update.
+            See :func:`graphcat.analysis.critical_path` for details.  If
+            :any:`None` (the default), no estimates are made.
+
+        Returns
+        -------
+        plan: :class:`graphcat.common.Plan`
+            The tasks that would execute and the tasks that are already
+            finished, along with estimated times.
+
+        Raises
+        ------
+        :class:`ValueError`
+            If the task with `name` doesn't exist.
+        """
+        self._require_task_present(name)
+
+        # Predict the extents that each task could compute, working upstream from the target.
+        # Tasks without fn.map_extent either request their inputs without an
+        # extent, or pass their own extent through explicitly.
+        canonical = graphcat.common.ArrayExtent.canonical
+        extents = {name: {canonical(extent)}}
+        for task in reversed(list(networkx.dfs_postorder_nodes(self._graph, name))):
+            if task not in extents:
+                continue
+            map_extent = getattr(self._graph.nodes[task]["fn"], "map_extent", None)
+            for target, source, input in self._graph.out_edges(task, data="input"):
+                predicted = extents.setdefault(source, set())
+                for extent in extents[task]:
+                    if extent is None:
+                        predicted.add(None)
+                    elif map_extent is not None:
+                        predicted.add(canonical(map_extent(extent, input)))
+                    else:
+                        predicted.update([None, extent])
+
+        def pending(task):
+            node = self._graph.nodes[task]
+            if node["state"] != graphcat.common.TaskState.FINISHED:
+                return True
+            return task in extents and node["extent"] not in extents[task]
+
+        return self._plan(name, timings, pending)
+
+
+    def prefetch(self, name, extent):
+        """Start computing a task output in the background.
+
+        Use this to hint that a task output will be requested soon.  The
+        output is computed in a background thread, and used by the first
+        subsequent call to :meth:`update` or :meth:`output` with the same
+        `name` and `extent`, provided the task doesn't become unfinished in
+        the meantime.  Hints for tasks that depend on a cycle are ignored.
+
+        Parameters
+        ----------
+        name: hashable object, required
+            Unique task name.
+        extent: hashable object, required
+            Domain object specifying the subset of the task's output to compute.
+
+        Raises
+        ------
+        :class:`ValueError`
+            If `name` doesn't exist.
+        """
+        self._require_task_present(name)
+
+        task = self._graph.nodes[name]
+        canonical = graphcat.common.ArrayExtent.canonical(extent)
+        if task["state"] == graphcat.common.TaskState.FINISHED and task["extent"] == canonical:
+            return
+        if name in self._prefetches and self._prefetches[name][0] == canonical:
+            return
+
+        try:
+            subgraph = _Subgraph(self, name)
+        except ValueError:
+            return
+
+        if self._prefetcher is None:
+            self._prefetcher = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="graphcat-prefetch")
+        self._prefetches[name] = (canonical, self._prefetcher.submit(subgraph, name, extent))
+
+
+    @property
+    def prefetching(self):
+        """Returns :any:`True` if the graph prefetches extents automatically."""
+        return self._prefetch
+
+
+    def rename_task(self, oldname, newname):
+        """Change an existing task's name.
+
+        This modifies an existing task's name and modifies any related links
+        as-necessary.  In addition, the task and any downstream dependents will
+        become unfinished, and any extents prefetched or predicted for the task
+        are discarded.
+
+        Parameters
+        ----------
+        oldname: hashable object, required
+            Existing original task name.
+        newname: hashable object, required
+            Unique new task name.
+
+        Raises
+        ------
+        :class:`ValueError`
+            If the task with `oldname` doesn't exist, or a task with `newname` already exists.
+        """
+        super().rename_task(oldname, newname)
+        self._prefetches.pop(oldname, None)
+        self._requests.pop(oldname, None)
+
+
     def update(self, name, extent=None):
         """Update a task and all of its transitive dependencies.
 
@@ -148,6 +636,300 @@ class StreamingGraph(graphcat.graph.Graph):
 
         self._require_task_present(name)
         self._update(name, extent)
+        if self._prefetch:
+            self._predict(name, extent)
+
+
+class _Failure(object):
+    """Pipeline message used to pass an exception downstream."""
+    def __init__(self, exception):
+        self.exception = exception
+
+
+_END = object()
+
+
+def _execute(graph, fn, name, inputs, extent, freeze=True):
+    output = fn(graph=graph, name=name, inputs=inputs, extent=extent)
+    crop = getattr(fn, "crop", None)
+    if crop is not None and extent is not None:
+        output = crop(output, extent)
+    if freeze and graph._freeze_outputs:
+        output = graphcat.common.freeze(output)
+    return output
+
+
+def _split(extent, size):
+    # Returns the shape of extent and a list of (tile, local) extents, or None if the extent doesn't need to be split.
+    slices = extent if isinstance(extent, tuple) else (extent,)
+    for index in slices:
+        if not isinstance(index, slice) or index.step not in (None, 1) or index.stop is None or index.stop < 0 or (index.start or 0) < 0:
+            return None
+
+    starts = [index.start or 0 for index in slices]
+    shape = tuple(max(0, index.stop - start) for index, start in zip(slices, starts))
+    size = (size,) * len(shape) if isinstance(size, int) else tuple(size)
+    if all(length <= count for length, count in zip(shape, size)):
+        return None
+
+    tiles = []
+    for local in graphcat.common.ArrayExtent.tiles(shape, size):
+        tile = tuple(slice(start + index.start, start + index.stop) for start, index in zip(starts, local))
+        tiles.append((type(extent)(tile) if isinstance(extent, tuple) else tile[0], local))
+    return shape, tiles
+
+
+def _union(a, b):
+    # Combine dirty regions, where None means everything.
+    ArrayExtent = graphcat.common.ArrayExtent
+    if a is None or b is None or not (isinstance(a, ArrayExtent) and isinstance(b, ArrayExtent)):
+        return None if a != b else a
+    try:
+        return a.union(b)
+    except ValueError:
+        return None
+
+
+def _replace_first(extent, canonical, index):
+    # Replace the first item in an extent, preserving the extent type.
+    if isinstance(extent, slice):
+        return index
+    return type(canonical)((index,) + tuple(canonical[1:]))
+
+
+def _stride(previous, extent):
+    # Returns the extent that follows previous and extent, or None if they aren't part of a sequence.
+    if isinstance(previous, int) and isinstance(extent, int) and not isinstance(extent, bool):
+        return extent + (extent - previous) if extent != previous else None
+
+    previous = previous if isinstance(previous, tuple) else (previous,)
+    slices = extent if isinstance(extent, tuple) else (extent,)
+    if len(previous) != len(slices):
+        return None
+
+    prediction = []
+    for old, new in zip(previous, slices):
+        if not (isinstance(old, slice) and isinstance(new, slice)) or old.step != new.step:
+            return None
+        if not all(isinstance(bound, int) for bound in (old.start, old.stop, new.start, new.stop)):
+            return None
+        delta = new.start - old.start
+        if new.stop - old.stop != delta or new.start + delta < 0:
+            return None
+        prediction.append(slice(new.start + delta, new.stop + delta, new.step))
+
+    if tuple(prediction) == slices:
+        return None
+    return type(extent)(prediction) if isinstance(extent, tuple) else prediction[0]
+
+
+def _assemble(blocks, counts, axis=0):
+    # Concatenate tiles in row-major order, where counts is the number of tiles along each axis.
+    if not counts:
+        return blocks[0]
+    step = len(blocks) // counts[0]
+    parts = [_assemble(blocks[index:index + step], counts[1:], axis + 1) for index in range(0, len(blocks), step)]
+    return numpy.concatenate(parts, axis=axis)
+
+
+def _intersects(extent, region):
+    # Conservatively decide whether a stored extent overlaps a dirty region, where None means everything.
+    # Only array extents that are provably disjoint keep their outputs.
+    ArrayExtent = graphcat.common.ArrayExtent
+    if isinstance(extent, ArrayExtent) and isinstance(region, ArrayExtent):
+        try:
+            return extent.intersection(region) is not None
+        except ValueError:
+            return True
+    return True
+
+
+def _pipeline(graph, subgraph, name, extents, queue_size):
+    stop = threading.Event()
+    links = {(target, source): queue.Queue(queue_size) for target, source in subgraph.edges()}
+    requests = {task: queue.Queue(queue_size) for task in subgraph}
+    results = queue.Queue(queue_size)
+    order = list(networkx.topological_sort(subgraph))
+
+    def get(channel):
+        while not stop.is_set():
+            try:
+                return channel.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        return _END
+
+    def put(channel, message):
+        while not stop.is_set():
+            try:
+                channel.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    def feed():
+        # Determine the extent that every stage will compute, working upstream from the target.
+        try:
+            for extent in extents:
+                stage_extents = {name: extent}
+                for task in order:
+                    map_extent = getattr(subgraph.nodes[task]["fn"], "map_extent", None)
+                    for target, source, input in subgraph.out_edges(task, data="input"):
+                        required = stage_extents[task]
+                        if map_extent is not None and required is not None:
+                            required = map_extent(required, input)
+                        if source in stage_extents and stage_extents[source] != required:
+                            raise ValueError(f"Task {source!r} can't be pipelined because it must compute more than one extent.")
+                        stage_extents[source] = required
+                for task, channel in requests.items():
+                    put(channel, stage_extents[task])
+            message = _END
+        except Exception as e:
+            message = _Failure(e)
+        for channel in requests.values():
+            put(channel, message)
+
+    def stage(task):
+        fn = subgraph.nodes[task]["fn"]
+        edges = list(subgraph.out_edges(task, data="input"))
+        upstream = list(dict.fromkeys(source for target, source, input in edges))
+        downstream = [links[(target, task)] for target in dict.fromkeys(subgraph.predecessors(task))]
+        if task == name:
+            downstream.append(results)
+
+        while True:
+            message = get(requests[task])
+            if message is not _END and not isinstance(message, _Failure):
+                extent = message
+                messages = {source: get(links[(task, source)]) for source in upstream}
+                message = next((message for message in messages.values() if message is _END or isinstance(message, _Failure)), None)
+            if message is None:
+                inputs = _PipelinedInputs(edges, messages)
+                if graph._on_update.receivers:
+                    graph._on_update.send(graph, name=task)
+                try:
+                    if graph._on_execute.receivers:
+                        graph._on_execute.send(graph, name=task, inputs=inputs, extent=extent)
+                    output = _execute(graph, fn, task, inputs, extent)
+                    if graph._on_finished.receivers:
+                        graph._on_finished.send(graph, name=task, output=output)
+                    message = (extent, output)
+                except Exception as e:
+                    if graph._on_failed.receivers:
+                        graph._on_failed.send(graph, name=task, exception=e)
+                    message = _Failure(e)
+
+            for channel in downstream:
+                put(channel, message)
+            if message is _END or isinstance(message, _Failure):
+                return
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    threads += [threading.Thread(target=stage, args=(task,), daemon=True) for task in subgraph]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            message = get(results)
+            if message is _END:
+                break
+            if isinstance(message, _Failure):
+                raise message.exception
+            yield message
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+
+class _Subgraph(object):
+    """Stateless evaluator for a task and its dependencies, used to compute tiles concurrently."""
+    def __init__(self, graph, name):
+        subgraph = graph._graph.subgraph(networkx.descendants(graph._graph, name) | {name})
+        if not networkx.is_directed_acyclic_graph(subgraph):
+            raise ValueError(f"Task {name!r} can't be computed concurrently because it depends on a cycle.")
+        self._fns = {task: fn for task, fn in subgraph.nodes(data="fn")}
+        self._links = {task: [(source, input) for target, source, input in subgraph.out_edges(task, data="input")] for task in subgraph}
+        self._freeze_outputs = graph._freeze_outputs
+
+    def __call__(self, name, extent):
+        return self._evaluate({}, name, extent)
+
+    def _evaluate(self, cache, name, extent):
+        # Extents may not be hashable, so search for cached outputs linearly.
+        for cached, output in cache.get(name, []):
+            if cached == extent:
+                return output
+
+        fn = self._fns[name]
+        output = fn(graph=None, name=name, inputs=_SubgraphInputs(self, cache, name, extent), extent=extent)
+        crop = getattr(fn, "crop", None)
+        if crop is not None and extent is not None:
+            output = crop(output, extent)
+        if self._freeze_outputs:
+            output = graphcat.common.freeze(output)
+        cache.setdefault(name, []).append((extent, output))
+        return output
+
+
+class _SharedSubgraph(object):
+    """Sends a :class:`_Subgraph` to worker processes once, using shared memory."""
+    def __init__(self, subgraph):
+        data = pickle.dumps(subgraph, protocol=pickle.HIGHEST_PROTOCOL)
+        self._shm = multiprocessing.shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+        self._shm.buf[:len(data)] = data
+        self._name = self._shm.name
+        self._size = len(data)
+
+    def __call__(self, name, extent):
+        # Worker processes only keep the most recent subgraph.
+        subgraph = _shared_subgraphs.get(self._name)
+        if subgraph is None:
+            if sys.version_info >= (3, 13): # pragma: no cover
+                shm = multiprocessing.shared_memory.SharedMemory(name=self._name, track=False)
+            else:
+                shm = multiprocessing.shared_memory.SharedMemory(name=self._name)
+            try:
+                subgraph = pickle.loads(shm.buf[:self._size])
+            finally:
+                shm.close()
+            _shared_subgraphs.clear()
+            _shared_subgraphs[self._name] = subgraph
+        return subgraph(name, extent)
+
+    def __getstate__(self):
+        return {"_name": self._name, "_size": self._size}
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+
+_shared_subgraphs = {}
+
+
+def _window(previous, extent):
+    # Returns the (overlap, prefix, suffix) that would allow extent to reuse the output from previous, or None.
+    ArrayExtent = graphcat.common.ArrayExtent
+    if not (isinstance(previous, ArrayExtent) and isinstance(extent, ArrayExtent)):
+        return None
+    if not extent or len(previous) != len(extent) or previous[1:] != extent[1:]:
+        return None
+
+    old, new = previous[0], extent[0]
+    for index in (old, new):
+        if not isinstance(index, slice) or index.step is not None or index.stop is None or index.start < 0 or index.stop < 0:
+            return None
+
+    start, stop = max(old.start, new.start), min(old.stop, new.stop)
+    if stop <= start:
+        return None
+
+    overlap = slice(start - old.start, stop - old.start)
+    prefix = slice(new.start, old.start) if new.start < old.start else None
+    suffix = slice(old.stop, new.stop) if new.stop > old.stop else None
+    return overlap, prefix, suffix
 
 
 class NamedInputs(object):
@@ -159,14 +941,25 @@ class NamedInputs(object):
         Graph containing a task.
     name: hashable object, required
         Existing task unique name.
+    extent: hashable object, optional
+        Extent that the task is computing.  If the task function implements
+        ``map_extent``, inputs requested without an extent will be computed
+        using the mapped extent.
     """
-    def __init__(self, graph, name):
+    def __init__(self, graph, name, extent=None):
         if not isinstance(graph, StreamingGraph):
             raise ValueError("Graph input must be an instance of StreamingGraph") # pragma: no cover
 
         edges = graph._graph.out_edges(name, data="input")
         self._keys = [input for target, source, input in edges]
         self._values = [functools.partial(graph._output, source) for target, source, input in edges]
+        self._extent = extent
+        self._map_extent = getattr(graph._graph.nodes[name]["fn"], "map_extent", None) if extent is not None else None
+
+    def _input_extent(self, name, extent):
+        if extent is None and self._map_extent is not None:
+            return self._map_extent(self._extent, name)
+        return extent
 
     def __contains__(self, name):
         """Return :any:`True` if `name` matches a named input for this task."""
@@ -192,6 +985,8 @@ class NamedInputs(object):
             Name of the input value to return.
         extent: hashable object, optional
             Domain object specifying the subset of the input's value to return.
+            If :any:`None` (the default), the task's ``map_extent`` method is
+            used to choose an extent, if available.
         default: any Python value, optional
             If an input matching `name` doesn't exist, this value will be
             returned instead.  Defaults to :any:`None`.
@@ -209,7 +1004,7 @@ class NamedInputs(object):
         if len(values) == 0:
             return default
         elif len(values) == 1:
-            return values[0](extent)
+            return values[0](self._input_extent(name, extent))
         else:
             raise KeyError(f"More than one input {name!r}")
 
@@ -224,6 +1019,8 @@ class NamedInputs(object):
             Name of the input value to return.
         extent: hashable object, optional
             Domain object specifying the subset of each input's value to return.
+            If :any:`None` (the default), the task's ``map_extent`` method is
+            used to choose an extent, if available.
 
         Returns
         -------
@@ -231,6 +1028,7 @@ class NamedInputs(object):
             Values from every input that matches `name`.  Returns an empty list
             if there are none.
         """
+        extent = self._input_extent(name, extent)
         return [value(extent) for key, value in zip(self._keys, self._values) if key == name]
 
     def getone(self, name, extent=None):
@@ -245,6 +1043,8 @@ class NamedInputs(object):
             Name of the input value to return.
         extent: hashable object, optional
             Domain object specifying the subset of each input's value to return.
+            If :any:`None` (the default), the task's ``map_extent`` method is
+            used to choose an extent, if available.
 
         Returns
         -------
@@ -259,7 +1059,7 @@ class NamedInputs(object):
         if len(values) == 0:
             raise KeyError(name)
         elif len(values) == 1:
-            return values[0](extent)
+            return values[0](self._input_extent(name, extent))
         else:
             raise KeyError(f"More than one input {name!r}")
 
@@ -306,3 +1106,26 @@ class NamedInputs(object):
         return self._values
 
 
+class _PipelinedInputs(NamedInputs):
+    """Named inputs for a task executing as a pipeline stage."""
+    def __init__(self, edges, messages):
+        def constant(extent, value):
+            def implementation(requested=None):
+                if requested is not None and requested != extent:
+                    raise ValueError(f"Pipelined tasks can't request input extent {requested!r} instead of {extent!r}.")
+                return value
+            return implementation
+
+        self._keys = [input for target, source, input in edges]
+        self._values = [constant(*messages[source]) for target, source, input in edges]
+        self._extent = None
+        self._map_extent = None
+
+
+class _SubgraphInputs(NamedInputs):
+    """Named inputs for a task evaluated by :class:`_Subgraph`."""
+    def __init__(self, subgraph, cache, name, extent):
+        self._keys = [input for source, input in subgraph._links[name]]
+        self._values = [functools.partial(subgraph._evaluate, cache, source) for source, input in subgraph._links[name]]
+        self._extent = extent
+        self._map_extent = getattr(subgraph._fns[name], "map_extent", None) if extent is not None else None